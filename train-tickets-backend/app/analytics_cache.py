@@ -0,0 +1,122 @@
+"""
+Кеш результатів агрегованої аналітики.
+
+Ключ — нормалізований кортеж (ендпоінт, date_from, date_to, start_station_id, end_station_id).
+Запис дійсний, доки не минув TTL і не змінилося покоління квитків: кожен запис квитків
+збільшує лічильник у таблиці data_generations у своїй транзакції, а перед читанням кешу
+ми один раз читаємо цей лічильник. Так кеш коректний і з кількома воркерами uvicorn.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app import config, models
+
+TICKETS_GENERATION = "tickets"
+
+
+def bump_generation(db: Session, name: str = TICKETS_GENERATION):
+    """
+    Позначає зміну даних. Викликати до commit(), у транзакції самого запису.
+    """
+    table = models.DataGeneration.__table__
+    stmt = insert(table).values(name=name, value=1)
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.name], set_={"value": table.c.value + 1})
+    db.execute(stmt)
+
+
+def current_generation(db: Session, name: str = TICKETS_GENERATION) -> int:
+    value = (
+        db.query(models.DataGeneration.value)
+        .filter(models.DataGeneration.name == name)
+        .scalar()
+    )
+    return value or 0
+
+
+class AnalyticsCache:
+    """
+    Обмежений LRU-кеш з TTL. Лічильники hits / misses — для моніторингу.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, generation: int, compute: Callable[[], object]):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_generation, expires_at, value = entry
+                if entry_generation == generation and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (generation, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+        }
+
+
+analytics_cache = AnalyticsCache(config.ANALYTICS_CACHE_SIZE, config.ANALYTICS_CACHE_TTL)
+
+
+def cached(endpoint: str):
+    """
+    Декоратор для функцій аналітики виду fn(db, date_from, date_to, start_station_id,
+    end_station_id, **extra). Значення extra мають бути хешованими.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(db: Session, date_from, date_to, start_station_id, end_station_id, **extra):
+            key = (
+                endpoint,
+                date_from.isoformat() if date_from else None,
+                date_to.isoformat() if date_to else None,
+                # 0 і None однаково означають "без фільтра"
+                start_station_id or None,
+                end_station_id or None,
+                *sorted(extra.items()),
+            )
+            return analytics_cache.get_or_compute(
+                key,
+                current_generation(db),
+                lambda: fn(db, date_from, date_to, start_station_id, end_station_id, **extra),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,172 @@
+"""
+Архів квитків: "холодні" квитки рейсів, що відбулися понад ARCHIVE_AFTER_DAYS днів тому,
+переносяться з tickets в окремий файл ARCHIVE_DATABASE_PATH (таблиця archive.tickets).
+
+    python -m app.archive                       # перенести за налаштуваннями з config
+    python -m app.archive --days 30 --pause 0.1
+
+Перенесення йде пачками по ARCHIVE_CHUNK_SIZE квитків: кожна пачка — окрема коротка
+транзакція (INSERT OR IGNORE в архів + DELETE з tickets), тож продаж квитків між
+пачками не чекає. Повторний запуск після збою безпечний.
+
+Продаж і перевірка місць працюють лише з гарячою таблицею tickets: у рейсів, що
+вже відбулися, місць не продають. Архів приєднується (ATTACH) до з'єднань за потреби —
+до з'єднань на читання лише в режимі read-only. Таблицю квитків в аналітиці, перебудову
+підсумків і колонковий рушій читаємо як об'єднання tickets і archive.tickets,
+а таблицю квитків аналітики — лише тоді, коли діапазон дат сягає архіву.
+"""
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Column, Index, MetaData, Table, func, select, union_all
+from sqlalchemy.orm import Session
+
+from app import config, models
+from app.analytics_cache import bump_generation
+from app.database import SessionLocal
+
+ARCHIVE_SCHEMA = "archive"
+
+# Ті самі колонки, що й у tickets (id зберігаються), без зовнішніх ключів між файлами
+archive_tickets = Table(
+    "tickets",
+    MetaData(),
+    *(
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in models.Ticket.__table__.c
+    ),
+    Index("ix_archive_tickets_created_at", "created_at"),
+    Index("ix_archive_tickets_trip_id", "trip_id"),
+    schema=ARCHIVE_SCHEMA,
+)
+
+
+def ensure_attached(db: Session) -> bool:
+    """
+    Приєднує архів до з'єднання сесії, якщо файл існує. З'єднання на читання
+    (URI-режим, як у read_engine) отримують архів лише для читання.
+    """
+    if not os.path.exists(config.ARCHIVE_DATABASE_PATH):
+        return False
+    connection = db.connection()
+    attached = {row[1] for row in connection.exec_driver_sql("PRAGMA database_list")}
+    if ARCHIVE_SCHEMA not in attached:
+        if connection.engine.url.query.get("uri") == "true":
+            target = f"file:{config.ARCHIVE_DATABASE_PATH}?mode=ro"
+        else:
+            target = config.ARCHIVE_DATABASE_PATH
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (target,))
+    return True
+
+
+def archived_until(db: Session) -> Optional[datetime]:
+    """
+    Найпізніший created_at в архіві (None — архіву немає або він порожній).
+    """
+    if not ensure_attached(db):
+        return None
+    return db.execute(select(func.max(archive_tickets.c.created_at))).scalar()
+
+
+def needs_archive(db: Session, date_from: Optional[date]) -> bool:
+    """
+    Чи може діапазон покупок, що починається з date_from, містити архівні квитки.
+    """
+    until = archived_until(db)
+    return until is not None and (date_from is None or date_from <= until.date())
+
+
+def tickets_source(db: Session, include_archive: bool = True):
+    """
+    Таблиця квитків для читання: tickets або, якщо архів є, UNION ALL з archive.tickets.
+    Колонки доступні як source.c.<назва>, так само для обох варіантів.
+    """
+    table = models.Ticket.__table__
+    if not include_archive or not ensure_attached(db):
+        return table
+    return union_all(select(*table.c), select(*archive_tickets.c)).subquery("all_tickets")
+
+
+def clear(db: Session):
+    if ensure_attached(db):
+        db.execute(archive_tickets.delete())
+
+
+def _create(db: Session):
+    """
+    Створює файл архіву і таблицю (з'єднання на запис приєднує його для читання й запису).
+    """
+    connection = db.connection()
+    attached = {row[1] for row in connection.exec_driver_sql("PRAGMA database_list")}
+    if ARCHIVE_SCHEMA not in attached:
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (config.ARCHIVE_DATABASE_PATH,))
+    connection.exec_driver_sql(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode={config.SQLITE_JOURNAL_MODE}")
+    archive_tickets.metadata.create_all(bind=connection)
+    db.commit()
+
+
+def run(days: int, chunk_size: int, pause: float = 0.0) -> int:
+    """
+    Переносить квитки рейсів, що відбулися раніше ніж days днів тому. Повертає кількість.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    moved = 0
+    db = SessionLocal()
+    try:
+        _create(db)
+        # Квиток з найбільшим id завжди лишається в tickets: без AUTOINCREMENT SQLite
+        # видає новий id як max(id) + 1 і інакше міг би повторно видати архівний id
+        max_id = db.query(func.max(models.Ticket.id)).scalar() or 0
+
+        table = models.Ticket.__table__
+        while True:
+            # після commit сесія може взяти з пулу інше з'єднання — без приєднаного архіву
+            ensure_attached(db)
+            ids = [
+                row[0]
+                for row in db.execute(
+                    select(table.c.id)
+                    .join(models.Trip.__table__, models.Trip.id == table.c.trip_id)
+                    .where(models.Trip.departure_time < cutoff, table.c.id < max_id)
+                    .limit(chunk_size)
+                )
+            ]
+            if not ids:
+                break
+
+            db.execute(
+                archive_tickets.insert()
+                .prefix_with("OR IGNORE")
+                .from_select(list(table.c.keys()), select(*table.c).where(table.c.id.in_(ids)))
+            )
+            db.execute(table.delete().where(table.c.id.in_(ids)))
+            db.commit()
+            moved += len(ids)
+            if pause:
+                time.sleep(pause)
+
+        if moved:
+            # результати аналітики не змінились, але кеші перечитають дані з урахуванням архіву
+            bump_generation(db)
+            db.commit()
+    finally:
+        db.close()
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=config.ARCHIVE_AFTER_DAYS, help="архівувати рейси, старші за N днів")
+    parser.add_argument("--chunk-size", type=int, default=config.ARCHIVE_CHUNK_SIZE)
+    parser.add_argument("--pause", type=float, default=0.0, help="пауза між пачками, с")
+    args = parser.parse_args()
+
+    moved = run(args.days, args.chunk_size, args.pause)
+    print(f"✅ До архіву перенесено квитків: {moved}.")
+
+
+if __name__ == "__main__":
+    main()
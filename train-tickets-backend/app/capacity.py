@@ -0,0 +1,126 @@
+"""
+Лічильник вільних місць рейсу (trips.seats_remaining).
+
+Місткість рейсу — місткість його поїзда (cars * seats_per_car). Продаж зменшує
+лічильник умовним UPDATE ... WHERE seats_remaining >= n AND departure_time > now
+у тій самій транзакції, що й INSERT квитків: якщо місць не вистачає або рейс уже
+відправився, рядок не змінюється і продаж відхиляється, тож рейс не можна
+перепродати навіть з кількох процесів. На рейси, що відправились, не продаємо ще й
+тому, що їхні квитки переїжджають в архів (app/archive.py), якого не бачить
+унікальний індекс tickets.
+Пошук рейсів читає готовий лічильник замість COUNT квитків по кожному рейсу.
+
+Звірити лічильники з квитками (разом з архівом):
+    python -m app.capacity          # показати розбіжності
+    python -m app.capacity --fix    # виправити їх
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app import archive, models
+from app.database import SessionLocal
+
+
+def reserve(db: Session, trip_id: int, count: int = 1, keep: int = 0) -> bool:
+    """
+    Забирає count місць рейсу, лишаючи вільними щонайменше keep (місця, утримані
+    іншими покупцями, див. app/holds.py). False — рейсу немає, він уже відправився
+    або місць не вистачає. Викликати до commit(), в одній транзакції з квитками.
+    """
+    table = models.Trip.__table__
+    result = db.execute(
+        update(table)
+        .where(
+            table.c.id == trip_id,
+            table.c.seats_remaining >= count + keep,
+            # час розкладу — місцевий, як і в пошуку поїздок (app/routers/journeys.py)
+            table.c.departure_time > datetime.now(),
+        )
+        .values(seats_remaining=table.c.seats_remaining - count)
+    )
+    return result.rowcount == 1
+
+
+def _expected_remaining(db: Session):
+    """
+    Скільки місць має бути вільно: місткість поїзда мінус оплачені квитки рейсу.
+    Корельовані підзапити йдуть індексами по trip_id, без перегляду всієї tickets.
+    """
+    trip = models.Trip.__table__
+    capacity = (
+        select(models.Train.cars * models.Train.seats_per_car)
+        .where(models.Train.id == trip.c.train_id)
+        .scalar_subquery()
+    )
+    sold = (
+        select(func.count())
+        .select_from(models.Ticket)
+        .where(models.Ticket.trip_id == trip.c.id, models.Ticket.status == "paid")
+        .scalar_subquery()
+    )
+    expected = capacity - sold
+    if archive.ensure_attached(db):
+        archived = archive.archive_tickets
+        expected = expected - (
+            select(func.count())
+            .select_from(archived)
+            .where(archived.c.trip_id == trip.c.id, archived.c.status == "paid")
+            .scalar_subquery()
+        )
+    return expected
+
+
+def mismatches(db: Session) -> list:
+    """
+    Рейси, у яких лічильник не збігається з квитками: (trip_id, збережено, має бути).
+    """
+    trip = models.Trip.__table__
+    expected = _expected_remaining(db).label("expected")
+    rows = db.execute(
+        select(trip.c.id, trip.c.seats_remaining, expected).order_by(trip.c.id)
+    )
+    return [tuple(row) for row in rows if row.seats_remaining != row.expected]
+
+
+def reconcile(db: Session) -> int:
+    """
+    Перераховує лічильники всіх рейсів одним UPDATE (атомарно щодо продажів)
+    і повертає кількість виправлених рейсів.
+    """
+    trip = models.Trip.__table__
+    expected = _expected_remaining(db)
+    result = db.execute(
+        update(trip).where(trip.c.seats_remaining != expected).values(seats_remaining=expected)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="виправити розбіжності")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.fix:
+            print(f"✅ Виправлено лічильників: {reconcile(session)}.")
+            return
+
+        problems = mismatches(session)
+        for trip_id, stored, expected in problems[:50]:
+            print(f"❌ рейс {trip_id}: seats_remaining={stored}, має бути {expected}")
+        if problems:
+            print(f"Розбіжностей: {len(problems)} (python -m app.capacity --fix)")
+            sys.exit(1)
+        print("✅ Лічильники вільних місць збігаються з квитками.")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Колонковий рушій аналітики в пам'яті процесу (ANALYTICS_ENGINE=numpy).
+
+Факти про квитки зберігаються як масиви NumPy: час покупки, ціна, маршрут,
+станції, рейс і статус. Фільтри — векторні маски, групування — bincount.
+Результати мають той самий формат, що й SQL-ендпоінти в app/routers/analytics.py,
+тож їх можна звірити між собою.
+"""
+import threading
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
+
+from app import archive, models
+
+LOAD_CHUNK_SIZE = 100_000
+SECONDS_PER_DAY = 86_400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# (назва колонки, dtype)
+COLUMNS = (
+    ("ticket_id", np.int64),
+    ("created_at", np.int64),  # секунди від епохи (created_at зберігається в UTC)
+    ("price", np.float64),
+    ("route_id", np.int32),
+    ("start_station_id", np.int32),
+    ("end_station_id", np.int32),
+    ("trip_id", np.int32),
+    ("status", np.int8),  # код статусу, див. TicketColumns.statuses
+)
+
+
+def _day_number(value: date) -> int:
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+class TicketColumns:
+    """
+    Масиви з запасом місця (ємність подвоюється), щоб дописувати квитки без копіювання
+    всієї історії. Читачі беруть знімок (масиви + кількість рядків) під замком і далі
+    рахують без нього.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._size = 0
+        self._arrays = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+        self.statuses = []
+        self.last_ticket_id = 0
+
+    def __len__(self):
+        return self._size
+
+    # ---------- завантаження ----------
+
+    def _status_codes(self, statuses) -> np.ndarray:
+        values, inverse = np.unique(np.asarray(statuses, dtype=object), return_inverse=True)
+        mapping = np.empty(len(values), dtype=np.int8)
+        for i, status in enumerate(values):
+            if status not in self.statuses:
+                self.statuses.append(status)
+            mapping[i] = self.statuses.index(status)
+        return mapping[inverse]
+
+    def extend(self, **columns):
+        """
+        Дописує рядки; кожен аргумент — масив однієї колонки (status — коди).
+        """
+        count = len(columns["ticket_id"])
+        if not count:
+            return
+        with self._lock:
+            needed = self._size + count
+            capacity = len(self._arrays["ticket_id"])
+            if needed > capacity:
+                capacity = max(needed, capacity * 2, 1024)
+                for name, array in self._arrays.items():
+                    grown = np.empty(capacity, dtype=array.dtype)
+                    grown[: self._size] = array[: self._size]
+                    self._arrays[name] = grown
+            for name, values in columns.items():
+                self._arrays[name][self._size : needed] = values
+            self._size = needed
+            self.last_ticket_id = max(self.last_ticket_id, int(columns["ticket_id"].max()))
+
+    def sync(self, db: Session):
+        """
+        Дочитує квитки, створені після останнього завантаження (id > last_ticket_id).
+        Перший виклик завантажує всю таблицю; далі це дешевий запит по первинному ключу,
+        який підхоплює й продажі з інших процесів.
+        """
+        with self._sync_lock:
+            self._sync(db)
+
+    def _sync(self, db: Session):
+        # разом з архівом: аналітика охоплює всю історію продажів
+        tickets = archive.tickets_source(db)
+        stmt = (
+            select(
+                tickets.c.id,
+                cast(func.strftime("%s", tickets.c.created_at), Integer),
+                tickets.c.price,
+                models.Trip.route_id,
+                models.Route.start_station_id,
+                models.Route.end_station_id,
+                tickets.c.trip_id,
+                tickets.c.status,
+            )
+            .select_from(tickets)
+            .join(models.Trip, models.Trip.id == tickets.c.trip_id)
+            .join(models.Route, models.Route.id == models.Trip.route_id)
+            .where(tickets.c.id > self.last_ticket_id)
+            .order_by(tickets.c.id)
+        )
+        result = db.execute(stmt)
+        while True:
+            rows = result.fetchmany(LOAD_CHUNK_SIZE)
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            arrays = {
+                name: np.asarray(values, dtype=dtype)
+                for (name, dtype), values in zip(COLUMNS[:-1], columns[:-1])
+            }
+            arrays["status"] = self._status_codes(columns[-1])
+            self.extend(**arrays)
+
+    # ---------- запити ----------
+
+    def _snapshot(self):
+        with self._lock:
+            return {name: array[: self._size] for name, array in self._arrays.items()}
+
+    def _filtered(self, filters, *names):
+        """
+        Повертає колонки names лише для рядків, що проходять фільтри
+        (date_from, date_to, start_station_id, end_station_id).
+        """
+        date_from, date_to, start_station_id, end_station_id = filters
+        columns = self._snapshot()
+
+        mask = None
+        conditions = []
+        if date_from:
+            conditions.append(columns["created_at"] >= _day_number(date_from) * SECONDS_PER_DAY)
+        if date_to:
+            conditions.append(columns["created_at"] < (_day_number(date_to) + 1) * SECONDS_PER_DAY)
+        if start_station_id:
+            conditions.append(columns["start_station_id"] == start_station_id)
+        if end_station_id:
+            conditions.append(columns["end_station_id"] == end_station_id)
+        for condition in conditions:
+            mask = condition if mask is None else mask & condition
+
+        if mask is None:
+            return [columns[name] for name in names]
+        return [columns[name][mask] for name in names]
+
+    @staticmethod
+    def _route_totals(route_id: np.ndarray, price: np.ndarray):
+        # id маршрутів невеликі й щільні — рахуємо bincount без сортування
+        tickets = np.bincount(route_id)
+        revenue = np.bincount(route_id, weights=price)
+        routes = np.flatnonzero(tickets)
+        return routes, tickets[routes], revenue[routes]
+
+    def summary(self, *filters):
+        route_id, price = self._filtered(filters, "route_id", "price")
+        total_tickets = len(price)
+        total_revenue = float(price.sum())
+        routes_sold = int(np.count_nonzero(np.bincount(route_id))) if total_tickets else 0
+        return {
+            "total_tickets": total_tickets,
+            "total_revenue": total_revenue,
+            "avg_price": total_revenue / total_tickets if total_tickets else 0.0,
+            "routes_sold": routes_sold,
+        }
+
+    def by_day(self, *filters):
+        created_at, price = self._filtered(filters, "created_at", "price")
+        if not len(created_at):
+            return []
+        days = created_at // SECONDS_PER_DAY
+        first_day = int(days.min())
+        tickets = np.bincount(days - first_day)
+        revenue = np.bincount(days - first_day, weights=price)
+        return [
+            {
+                "date": date.fromordinal(EPOCH_ORDINAL + first_day + int(offset)).isoformat(),
+                "tickets": int(tickets[offset]),
+                "revenue": float(revenue[offset]),
+            }
+            for offset in np.flatnonzero(tickets)
+        ]
+
+    def by_route(self, *filters):
+        route_id, price = self._filtered(filters, "route_id", "price")
+        if not len(route_id):
+            return []
+        routes, tickets, revenue = self._route_totals(route_id, price)
+        return [
+            {"route_id": int(route), "tickets": int(count), "revenue": float(total)}
+            for route, count, total in zip(routes, tickets, revenue)
+        ]
+
+    def by_direction(self, *filters):
+        route_id, start_id, end_id, price = self._filtered(
+            filters, "route_id", "start_station_id", "end_station_id", "price"
+        )
+        if not len(route_id):
+            return []
+        routes, tickets, revenue = self._route_totals(route_id, price)
+
+        # маршрут однозначно задає пару станцій — згортаємо підсумки маршрутів у напрямки
+        route_start = np.zeros(routes[-1] + 1, dtype=np.int64)
+        route_end = np.zeros(routes[-1] + 1, dtype=np.int64)
+        route_start[route_id] = start_id
+        route_end[route_id] = end_id
+
+        directions = {}
+        for route, count, total in zip(routes, tickets, revenue):
+            key = (int(route_start[route]), int(route_end[route]))
+            bucket = directions.setdefault(key, [0, 0.0])
+            bucket[0] += int(count)
+            bucket[1] += float(total)
+
+        return [
+            {
+                "start_station_id": start,
+                "end_station_id": end,
+                "tickets": count,
+                "revenue": total,
+            }
+            for (start, end), (count, total) in sorted(directions.items())
+        ]
+
+    def top_routes(self, *filters, limit: int = 5):
+        routes = self.by_route(*filters)
+        return sorted(routes, key=lambda item: item["tickets"], reverse=True)[:limit]
+
+
+ticket_columns = TicketColumns()
@@ -0,0 +1,63 @@
+import os
+
+# Налаштування розгортання беруться зі змінних оточення
+
+# Рушій агрегованої аналітики:
+#   "sql"   — запити до БД (підсумок daily_route_sales)
+#   "numpy" — колонки квитків у пам'яті процесу (app/columnar.py, потрібен numpy)
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "sql")
+
+# ---------- SQLite ----------
+DATABASE_PATH = os.getenv("DATABASE_PATH", "./train_tickets.db")
+
+# Профіль з'єднань (PRAGMA для кожного нового з'єднання)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# від'ємне значення — розмір у КіБ (тут 64 МіБ на з'єднання)
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Режим роботи з БД для пошуку, продажу та аналітики:
+#   "sync"  — звичайні сесії, запити виконуються в пулі потоків Starlette
+#   "async" — асинхронні сесії SQLAlchemy через aiosqlite (потрібні aiosqlite і greenlet)
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# Кеш результатів аналітики (LRU + TTL), див. app/analytics_cache.py
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+ANALYTICS_CACHE_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", "300"))
+
+# Карта зайнятих місць у пам'яті (app/seat_map.py): скільки рейсів тримати (LRU)
+SEAT_MAP_SIZE = int(os.getenv("SEAT_MAP_SIZE", "10000"))
+
+# Пошук поїздок з пересадками (app/timetable.py)
+JOURNEY_MIN_CONNECTION_MINUTES = int(os.getenv("JOURNEY_MIN_CONNECTION_MINUTES", "15"))
+JOURNEY_HORIZON_HOURS = int(os.getenv("JOURNEY_HORIZON_HOURS", "48"))
+JOURNEY_MAX_LEGS = int(os.getenv("JOURNEY_MAX_LEGS", "4"))
+
+# Журнал повільних SQL-запитів (app/slow_queries.py, GET /debug/slow-queries)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+# Токен для /debug/*: без нього ендпоінти налагодження вимкнені (404)
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", "")
+
+# Архів квитків рейсів, що давно відбулися (app/archive.py)
+ARCHIVE_DATABASE_PATH = os.getenv("ARCHIVE_DATABASE_PATH", "./train_tickets_archive.db")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "5000"))
+
+# Тимчасове утримання місць до оплати (app/holds.py, POST /trips/{trip_id}/holds)
+HOLD_TTL_SECONDS = int(os.getenv("HOLD_TTL_SECONDS", "600"))
+HOLD_MAX_SEATS = int(os.getenv("HOLD_MAX_SEATS", "10"))
+
+# Заголовок Idempotency-Key для продажу квитків (app/idempotency.py)
+IDEMPOTENCY_STORE_SIZE = int(os.getenv("IDEMPOTENCY_STORE_SIZE", "10000"))
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# Запис продажів квитків:
+#   "direct" — кожен продаж окремою транзакцією зі своїм commit
+#   "group"  — групова фіксація: продажі з черги пише один потік, commit на пачку (app/group_commit.py)
+TICKET_WRITE_MODE = os.getenv("TICKET_WRITE_MODE", "direct")
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("GROUP_COMMIT_MAX_WAIT_MS", "2"))
@@ -1,8 +1,16 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
+
+from app import config, metrics
+from app.slow_queries import SLOW_QUERY_SECONDS, slow_query_log
 
 # Шлях до нашої SQLite-бази (файл буде створений у корені проєкту)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./train_tickets.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{config.DATABASE_PATH}"
+# Той самий файл, але відкритий лише на читання
+SQLALCHEMY_READ_DATABASE_URL = f"sqlite:///file:{config.DATABASE_PATH}?mode=ro&uri=true"
 
 # Для SQLite треба додати цей параметр
 engine = create_engine(
@@ -10,8 +18,68 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
 )
 
-# Фабрика сесій для роботи з БД
+# Окремий пул з'єднань для читання (пошук, аналітика, довідники).
+# У режимі WAL читачі не блокують запис і навпаки.
+read_engine = create_engine(
+    SQLALCHEMY_READ_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+)
+
+
+def _apply_profile(cursor):
+    cursor.execute(f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size={config.SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}")
+
+
+# SQLite за замовчуванням не перевіряє зовнішні ключі — вмикаємо для кожного з'єднання,
+# щоб, наприклад, квиток на неіснуючий рейс відхиляла сама БД
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # journal_mode зберігається у файлі бази, тож встановлюємо його лише з'єднанням на запис
+    cursor.execute(f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+    _apply_profile(cursor)
+    cursor.close()
+
+
+@event.listens_for(read_engine, "connect")
+def _set_sqlite_read_pragma(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    _apply_profile(cursor)
+    cursor.close()
+
+
+# Кількість і час SQL-запитів для метрик поточного HTTP-запиту (app/metrics.py)
+# і журнал повільних запитів (app/slow_queries.py)
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # одне значення на з'єднання: запити в ньому йдуть по одному, а після запиту з
+    # помилкою (after_cursor_execute не викликається) його просто перезапише наступний
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_started")
+    metrics.record_statement(elapsed)
+    # на швидкому шляху — лише порівняння з порогом
+    if elapsed >= SLOW_QUERY_SECONDS:
+        slow_query_log.record(conn, statement, parameters, elapsed, executemany)
+
+
+def _instrument(sync_engine):
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+_instrument(engine)
+_instrument(read_engine)
+
+
+# Фабрики сесій для роботи з БД
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Базовий клас для всіх моделей
 Base = declarative_base()
@@ -24,3 +92,91 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency для GET-ендпоінтів: сесія лише на читання, не конкурує з записом
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# ---------- асинхронний режим (DB_MODE=async) ----------
+# Ті самі файли й профіль з'єднань, але через aiosqlite: поки запит чекає на БД,
+# він не займає потік із обмеженого пулу Starlette.
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+
+if config.DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{config.DATABASE_PATH}")
+    async_read_engine = create_async_engine(
+        f"sqlite+aiosqlite:///file:{config.DATABASE_PATH}?mode=ro&uri=true"
+    )
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragma)
+    event.listen(async_read_engine.sync_engine, "connect", _set_sqlite_read_pragma)
+    _instrument(async_engine.sync_engine)
+    _instrument(async_read_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+# ---------- групова фіксація продажів (TICKET_WRITE_MODE=group) ----------
+# Окреме з'єднання для потоку запису з app/group_commit.py. Транзакцію відкриваємо самі
+# (BEGIN IMMEDIATE), а не драйвер pysqlite: інакше SAVEPOINT кожного продажу
+# відкривав би транзакцію сам і RELEASE фіксував би її одразу, без групування.
+# Рушій створюється завжди, але з'єднання відкриває лише потік запису, тобто
+# тільки в цьому режимі.
+group_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+)
+
+
+@event.listens_for(group_engine, "connect")
+def _set_sqlite_group_pragma(dbapi_connection, connection_record):
+    _set_sqlite_pragma(dbapi_connection, connection_record)
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(group_engine, "begin")
+def _begin_immediate(conn):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+_instrument(group_engine)
+GroupSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=group_engine)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+# Залежності для async-ендпоінтів (пошук, продаж, аналітика): тип сесії обирає DB_MODE
+if config.DB_MODE == "async":
+    get_session, get_read_session = get_async_db, get_async_read_db
+else:
+    get_session, get_read_session = get_db, get_read_db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    Виконує fn(session, ...) — звичайний синхронний код запитів — для будь-якого режиму:
+      - AsyncSession: через run_sync, введення-виведення йде через aiosqlite
+      - Session: у пулі потоків, як це робив би звичайний def-ендпоінт
+    """
+    if hasattr(db, "run_sync"):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
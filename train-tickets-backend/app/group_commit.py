@@ -0,0 +1,145 @@
+"""
+Групова фіксація продажів квитків (TICKET_WRITE_MODE=group).
+
+У звичайному режимі кожен продаж — окрема транзакція зі своїм commit, і під
+навантаженням продажі впираються в кількість commit-ів за секунду (кожен — запис
+WAL і, з synchronous=FULL, fsync). Тут продажі з усіх запитів стають у чергу
+до одного потоку запису: він бере продаж, дочікується наступних (до
+GROUP_COMMIT_MAX_BATCH продажів або GROUP_COMMIT_MAX_WAIT_MS мілісекунд) і фіксує
+всю пачку одним commit.
+
+Кожен продаж пачки виконується у власному SAVEPOINT тими самими функціями, що й
+у звичайному режимі (app/routers/tickets.py): конфлікт місця або нестача місць
+відкочує лише цей продаж, і лише його викликач отримує помилку. Продажі пачки
+бачать один одного так само, як послідовні транзакції. Результат віддається
+викликачу тільки після commit — відповідь 200 означає, що квиток уже в БД.
+Якщо ж не вдався сам commit, його помилку отримують продажі пачки, що пройшли
+перевірки; продажі, відхилені раніше (409, 400), зберігають власну помилку.
+Будь-яка інша помилка пачки віддається її викликачам, а потік працює далі
+з новою сесією — інакше наступні продажі чекали б у черзі вічно.
+
+Потік запускається з першим продажем і зупиняється на shutdown застосунку.
+"""
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from app import config
+from app import database
+
+# (функція продажу, її аргументи, результат для викликача)
+_Job = Tuple[Callable, dict, concurrent.futures.Future]
+
+
+class GroupCommitWriter:
+    def __init__(self, max_batch: int, max_wait: float):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """
+        Дописує вже прийняті продажі і зупиняє потік.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    async def submit(self, sell: Callable, **kwargs) -> list:
+        """
+        Ставить продаж sell(db, **kwargs) у чергу і чекає, поки його пачку зафіксують.
+        Повертає результат sell або кидає його помилку (HTTPException, IntegrityError).
+        """
+        self.start()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((sell, kwargs, future))
+        return await asyncio.wrap_future(future)
+
+    def _next_batch(self) -> Optional[List[_Job]]:
+        job = self._queue.get()
+        if job is None:
+            return None
+        batch = [job]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                # зупинка: спершу фіксуємо зібране
+                self._queue.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self):
+        db = database.GroupSessionLocal()
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    break
+                try:
+                    self._commit(db, batch)
+                except Exception as exc:
+                    self._fail(batch, exc)
+                    db.close()
+                    db = database.GroupSessionLocal()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _fail(batch: List[_Job], exc: Exception):
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+    def _commit(self, db, batch: List[_Job]):
+        done = []
+        for sell, kwargs, future in batch:
+            # запит, що вже скасований (клієнт відключився), не продаємо
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with db.begin_nested():
+                    result = sell(db, **kwargs)
+            except Exception as exc:
+                done.append((future, None, exc))
+            else:
+                done.append((future, result, None))
+
+        try:
+            db.commit()
+        except Exception as exc:
+            for future, _, error in done:
+                future.set_exception(error if error is not None else exc)
+            db.rollback()
+            return
+
+        self.batches += 1
+        self.items += len(done)
+        for future, result, exc in done:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+writer = GroupCommitWriter(config.GROUP_COMMIT_MAX_BATCH, config.GROUP_COMMIT_MAX_WAIT_MS / 1000)
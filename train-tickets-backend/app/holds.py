@@ -0,0 +1,136 @@
+"""
+Тимчасове утримання місць до оплати (POST /trips/{trip_id}/holds).
+
+Утримання живе лише в пам'яті процесу: створення і закінчення терміну не пишуть
+у БД, тож покинутий кошик нічого не коштує. Терміни лежать у купі (heapq) і
+знімаються ліниво — на початку кожного звернення прибираються всі прострочені
+утримання, тож окремий таймер не потрібен.
+
+Продаж (POST /tickets/), підтвердження утримання і карта місць враховують активні
+утримання: утримане місце не продається нікому іншому, а утримані місця
+не враховуються як вільні в лічильнику рейсу.
+
+Як і seat_map, це стан одного процесу: з кількома воркерами запити одного кошика
+мають іти до того самого воркера. Остаточно зайнятість місця гарантує БД.
+"""
+import heapq
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Hold:
+    hold_id: str
+    trip_id: int
+    seat_numbers: Tuple[str, ...]
+    expires_at: datetime
+    deadline: float  # time.monotonic(), за ним і знімаємо
+
+
+class SeatsHeld(Exception):
+    def __init__(self, seat_numbers: List[str]):
+        super().__init__(", ".join(seat_numbers))
+        self.seat_numbers = seat_numbers
+
+
+class SeatHolds:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._holds: Dict[str, Hold] = {}
+        # рейс -> {місце: hold_id}
+        self._trips: Dict[int, Dict[str, str]] = {}
+        # (deadline, hold_id); підтверджені й скасовані записи лишаються в купі до свого терміну
+        self._heap: List[Tuple[float, str]] = []
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, hold_id = heapq.heappop(self._heap)
+            hold = self._holds.get(hold_id)
+            if hold is not None and hold.deadline <= now:
+                self._remove(hold)
+
+    def _remove(self, hold: Hold):
+        del self._holds[hold.hold_id]
+        seats = self._trips[hold.trip_id]
+        for seat_number in hold.seat_numbers:
+            del seats[seat_number]
+        if not seats:
+            del self._trips[hold.trip_id]
+
+    def hold(self, trip_id: int, seat_numbers: Iterable[str], ttl: float) -> Hold:
+        """
+        Утримує місця на ttl секунд. SeatsHeld — якщо частину вже утримує хтось інший.
+        """
+        seat_numbers = tuple(seat_numbers)
+        with self._lock:
+            self._expire()
+            seats = self._trips.get(trip_id, {})
+            held = [seat for seat in seat_numbers if seat in seats]
+            if held:
+                raise SeatsHeld(sorted(held))
+
+            hold = Hold(
+                hold_id=secrets.token_urlsafe(16),
+                trip_id=trip_id,
+                seat_numbers=seat_numbers,
+                expires_at=datetime.utcnow() + timedelta(seconds=ttl),
+                deadline=time.monotonic() + ttl,
+            )
+            self._holds[hold.hold_id] = hold
+            seats = self._trips.setdefault(trip_id, {})
+            for seat_number in seat_numbers:
+                seats[seat_number] = hold.hold_id
+            heapq.heappush(self._heap, (hold.deadline, hold.hold_id))
+            return hold
+
+    def get(self, hold_id: str) -> Optional[Hold]:
+        with self._lock:
+            self._expire()
+            return self._holds.get(hold_id)
+
+    def release(self, hold_id: str) -> bool:
+        with self._lock:
+            self._expire()
+            hold = self._holds.get(hold_id)
+            if hold is None:
+                return False
+            self._remove(hold)
+            return True
+
+    def is_held(self, trip_id: int, seat_number: str, hold_id: Optional[str] = None) -> bool:
+        """
+        Чи утримує місце хтось, крім утримання hold_id.
+        """
+        with self._lock:
+            self._expire()
+            return self._trips.get(trip_id, {}).get(seat_number, hold_id) != hold_id
+
+    def held(self, trip_id: int) -> List[str]:
+        with self._lock:
+            self._expire()
+            return sorted(self._trips.get(trip_id, ()))
+
+    def held_count(self, trip_id: int, hold_id: Optional[str] = None) -> int:
+        """
+        Скільки місць рейсу утримано (без утримання hold_id).
+        """
+        with self._lock:
+            self._expire()
+            count = len(self._trips.get(trip_id, ()))
+            own = self._holds.get(hold_id) if hold_id else None
+            if own is not None and own.trip_id == trip_id:
+                count -= len(own.seat_numbers)
+            return count
+
+    def held_counts(self) -> Dict[int, int]:
+        with self._lock:
+            self._expire()
+            return {trip_id: len(seats) for trip_id, seats in self._trips.items()}
+
+
+seat_holds = SeatHolds()
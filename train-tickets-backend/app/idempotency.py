@@ -0,0 +1,109 @@
+"""
+Ідемпотентний продаж квитків: заголовок Idempotency-Key.
+
+Клієнт на нестабільній мережі повторює POST з тим самим ключем. Перший запит
+виконується як звичайно, а його відповідь (і успішна, і помилка 4xx) зберігається;
+повтори отримують ту саму відповідь із заголовком Idempotent-Replayed: true, без
+повторної перевірки місць і INSERT. Якщо повтор приходить, поки перший запит ще
+виконується, він чекає на його результат — виконується лише один.
+
+Сховище в пам'яті процесу, обмежене IDEMPOTENCY_STORE_SIZE записами і
+IDEMPOTENCY_TTL_SECONDS часу життя. Непередбачена помилка (5xx) не зберігається:
+повтор виконає запит заново. Викликати лише з циклу подій (async-ендпоінти),
+тож замок не потрібен.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+
+from app import config
+from app.serialization import dumps
+
+MAX_KEY_LENGTH = 255
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    expires: float
+    # (статус, тіло відповіді) — коли перший запит завершиться
+    result: "asyncio.Future[tuple[int, bytes]]"
+
+
+def _response(status: int, body: bytes, replayed: bool) -> Response:
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return Response(content=body, status_code=status, media_type="application/json", headers=headers)
+
+
+class IdempotencyStore:
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple[str, str], _Entry]" = OrderedDict()
+        self.replays = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self):
+        # записи додаються по черзі з однаковим TTL, тож найстаріші — на початку
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires > now or not entry.result.done():
+                break
+            del self._entries[key]
+
+    def _evict(self):
+        while len(self._entries) > self.size:
+            key, entry = next(iter(self._entries.items()))
+            if not entry.result.done():
+                break
+            del self._entries[key]
+
+    async def respond(self, scope: str, key: str, payload, call: Callable[[], Awaitable]) -> Response:
+        """
+        Виконує call() один раз для (scope, key) і повертає збережену відповідь на повтори.
+        payload — тіло запиту: той самий ключ з іншим тілом відхиляється (422).
+        call() повертає дані для JSON або кидає HTTPException.
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+        fingerprint = hashlib.sha256(dumps(jsonable_encoder(payload))).hexdigest()
+        self._expire()
+
+        entry = self._entries.get((scope, key))
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key reused with a different request")
+            status, body = await asyncio.shield(entry.result)
+            self.replays += 1
+            return _response(status, body, replayed=True)
+
+        result = asyncio.get_running_loop().create_future()
+        self._entries[(scope, key)] = _Entry(fingerprint, time.monotonic() + self.ttl, result)
+        try:
+            status, body = 200, dumps(await call())
+        except HTTPException as exc:
+            status, body = exc.status_code, dumps({"detail": exc.detail})
+        except BaseException as exc:
+            # невдалий запит не запам'ятовуємо: ті, хто чекав, отримають ту саму помилку,
+            # а наступний повтор виконає запит заново
+            self._entries.pop((scope, key), None)
+            result.set_exception(exc)
+            result.exception()  # позначаємо як отриману, якщо ніхто не чекав
+            raise
+
+        result.set_result((status, body))
+        self._evict()
+        return _response(status, body, replayed=False)
+
+
+idempotency_store = IdempotencyStore(config.IDEMPOTENCY_STORE_SIZE, config.IDEMPOTENCY_TTL_SECONDS)
@@ -1,9 +1,10 @@
 from fastapi import FastAPI
-from app.routers import stations, trains, routes, trips, tickets, analytics
+from fastapi.responses import PlainTextResponse
+from app.routers import stations, trains, routes, trips, tickets, analytics, journeys, debug, holds
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import Base, engine
-from app import models
+from app.database import SessionLocal, engine
+from app import config, group_commit, metrics, migrations, rollup, route_calendar
 from app.routers import stations, trains, routes, trips, tickets
 
 
@@ -17,7 +18,25 @@ app = FastAPI(
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
+
+    db = SessionLocal()
+    try:
+        rollup.ensure_built(db)
+        route_calendar.ensure_built(db)
+        if config.ANALYTICS_ENGINE == "numpy":
+            # колонки квитків для аналітики завантажуємо одразу, а не на першому запиті
+            from app.columnar import ticket_columns
+
+            ticket_columns.sync(db)
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # дописати продажі, що ще в черзі групової фіксації
+    group_commit.writer.stop()
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,14 +46,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Затримка, статуси і кількість SQL-запитів по кожному маршруту (GET /metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Підключаємо роутери
 app.include_router(stations.router)
 app.include_router(trains.router)
 app.include_router(routes.router)
 app.include_router(trips.router)
+app.include_router(holds.router)
 app.include_router(tickets.router)
 app.include_router(analytics.router)
+app.include_router(journeys.router)
+app.include_router(debug.router)
+
+
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/health")
@@ -0,0 +1,247 @@
+"""
+Метрики процесу у текстовому форматі Prometheus (GET /metrics).
+
+  - http_requests_total{method, route, status}
+  - http_request_duration_seconds{method, route} — гістограма
+  - http_requests_in_progress
+  - sql_statements_per_request{method, route}, sql_duration_per_request_seconds{method, route}
+  - threadpool_* і db_pool_* — заповненість пулу потоків Starlette і пулів з'єднань
+  - analytics_cache_* — лічильники кешу аналітики
+  - idempotency_* — повтори продажу, на які віддано збережену відповідь
+  - group_commit_* — пачки і продажі, зафіксовані груповим commit (TICKET_WRITE_MODE=group)
+
+route — шаблон шляху (/trips/{trip_id}/seats), а не сам шлях, щоб кількість рядків
+не росла з кожним новим id. Запити до SQL рахуються хуками курсора в app/database.py
+у статистику поточного запиту (ContextVar; пул потоків отримує копію контексту,
+тож і синхронні запити з run_in_threadpool потрапляють до свого HTTP-запиту).
+
+Кожен воркер uvicorn має власні метрики — Prometheus збирає їх з кожного окремо.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from starlette.routing import Match
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SQL_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    __slots__ = ("scope", "statements", "sql_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def record_statement(seconds: float):
+    """
+    Викликається з after_cursor_execute: додає запит до статистики поточного HTTP-запиту.
+    """
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += seconds
+
+
+def current_route() -> Optional[str]:
+    """
+    Шаблон маршруту HTTP-запиту, в межах якого виконується код (None — поза запитом).
+    """
+    stats = current_request.get()
+    return _route_label(stats.scope) if stats is not None else None
+
+
+class Histogram:
+    """
+    Гістограма з фіксованими межами; значення для кожного набору міток — лічильники кошиків,
+    сума і кількість. Оновлюється лише з потоку циклу подій (у middleware), тож без замка.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.values: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        entry = self.values.get(labels)
+        if entry is None:
+            # [лічильники кошиків..., +Inf, сума]
+            entry = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def render(self, label_names: Tuple[str, ...]) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, entry in sorted(self.values.items()):
+            base = _labels(label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            cumulative += entry[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {entry[-1]}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+ROUTE_LABELS = ("method", "route")
+
+requests_total: Dict[tuple, int] = {}
+in_progress = 0
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route template.", LATENCY_BUCKETS
+)
+sql_statements = Histogram(
+    "sql_statements_per_request", "SQL statements executed per request.", STATEMENT_BUCKETS
+)
+sql_duration = Histogram(
+    "sql_duration_per_request_seconds", "Time spent in SQL per request.", SQL_TIME_BUCKETS
+)
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        # старіші Starlette не кладуть маршрут у scope — шукаємо самі
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    Чистий ASGI middleware (без BaseHTTPMiddleware), щоб не додавати зайвих задач
+    і копій тіла відповіді на кожен запит.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global in_progress
+        status = 500
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress -= 1
+            current_request.reset(token)
+
+            labels = (scope["method"], _route_label(scope))
+            key = labels + (status,)
+            requests_total[key] = requests_total.get(key, 0) + 1
+            request_duration.observe(labels, elapsed)
+            sql_statements.observe(labels, stats.statements)
+            sql_duration.observe(labels, stats.sql_seconds)
+
+
+def _gauge(lines: list, name: str, help_text: str, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+
+def _pool_samples(engines: dict):
+    for name, engine in engines.items():
+        pool = engine.pool
+        # QueuePool має розмір і переповнення; інші пули (напр. у пам'яті) — лише те, що є
+        for metric, attr in (("checked_out", "checkedout"), ("size", "size"), ("overflow", "overflow")):
+            method = getattr(pool, attr, None)
+            if method is not None:
+                yield metric, f'engine="{name}"', method()
+
+
+def render() -> str:
+    """
+    Усі метрики в текстовому форматі Prometheus. Викликати з циклу подій
+    (async-ендпоінт), бо ліміт пулу потоків anyio прив'язаний до нього.
+    """
+    from anyio import to_thread
+
+    from app import config, database
+    from app.analytics_cache import analytics_cache
+    from app.group_commit import writer
+    from app.idempotency import idempotency_store
+
+    lines = ["# HELP http_requests_total Requests by route template and status.", "# TYPE http_requests_total counter"]
+    for (method, route, status), count in sorted(requests_total.items()):
+        lines.append(f"http_requests_total{{{_labels(ROUTE_LABELS + ('status',), (method, route, status))}}} {count}")
+
+    _gauge(lines, "http_requests_in_progress", "Requests currently being handled.", [("", in_progress)])
+    lines += request_duration.render(ROUTE_LABELS)
+    lines += sql_statements.render(ROUTE_LABELS)
+    lines += sql_duration.render(ROUTE_LABELS)
+
+    limiter = to_thread.current_default_thread_limiter()
+    _gauge(lines, "threadpool_threads_in_use", "Busy threads in the Starlette/anyio threadpool.", [("", limiter.borrowed_tokens)])
+    _gauge(lines, "threadpool_threads_limit", "Threadpool size limit.", [("", limiter.total_tokens)])
+    _gauge(lines, "threadpool_waiting_tasks", "Tasks waiting for a free thread.", [("", limiter.statistics().tasks_waiting)])
+
+    engines = {"write": database.engine, "read": database.read_engine}
+    if database.async_engine is not None:
+        engines["async_write"] = database.async_engine.sync_engine
+        engines["async_read"] = database.async_read_engine.sync_engine
+    if config.TICKET_WRITE_MODE == "group":
+        engines["group_write"] = database.group_engine
+    pool_samples = list(_pool_samples(engines))
+    for metric, help_text in (
+        ("checked_out", "Connections currently checked out of the pool."),
+        ("size", "Configured pool size."),
+        ("overflow", "Connections opened beyond the pool size (negative while below size)."),
+    ):
+        _gauge(lines, f"db_pool_{metric}", help_text, [(l, v) for m, l, v in pool_samples if m == metric])
+
+    stats = analytics_cache.stats()
+    for name in ("hits", "misses"):
+        lines.append(f"# TYPE analytics_cache_{name}_total counter")
+        lines.append(f"analytics_cache_{name}_total {stats[name]}")
+    _gauge(lines, "analytics_cache_entries", "Entries in the analytics result cache.", [("", stats["size"])])
+
+    lines.append("# TYPE idempotency_replays_total counter")
+    lines.append(f"idempotency_replays_total {idempotency_store.replays}")
+    _gauge(lines, "idempotency_entries", "Entries in the Idempotency-Key response store.", [("", len(idempotency_store))])
+
+    for name in ("batches", "items"):
+        lines.append(f"# TYPE group_commit_{name}_total counter")
+        lines.append(f"group_commit_{name}_total {getattr(writer, name)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,214 @@
+"""
+Оновлення схеми існуючої бази train_tickets.db і перевірка планів запитів.
+
+    python -m app.migrations                # створити відсутні таблиці й індекси, ANALYZE
+    python -m app.migrations --check-plans  # EXPLAIN QUERY PLAN для запитів ендпоінтів
+
+create_all створює лише нові таблиці, а колонки й індекси, додані до вже існуючих
+таблиць, пропускає — тому колонки докладаємо через ALTER TABLE ... ADD COLUMN
+(нові колонки мають server_default або допускають NULL), а індекси — окремо (checkfirst).
+"""
+import argparse
+import re
+import sys
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import Base, engine as default_engine
+from app import capacity, models, route_calendar, schemas
+
+# Таблиці, повний перегляд яких вважаємо регресією
+GUARDED_TABLES = ("tickets", "trips", "route_calendar")
+FULL_SCAN = re.compile(r"^SCAN (\w+)\b(?! USING (COVERING )?INDEX)")
+
+
+def _add_missing_columns(engine: Engine) -> set:
+    """
+    Додає до існуючих таблиць колонки, яких у них ще немає. Повертає {(таблиця, колонка)}.
+    """
+    inspector = inspect(engine)
+    added = set()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                conn.execute(text(ddl))
+                added.add((table.name, column.name))
+    return added
+
+
+def upgrade(engine: Engine):
+    """
+    Створює відсутні таблиці, колонки та індекси. Безпечно запускати повторно.
+    """
+    added = _add_missing_columns(engine)
+    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    if ("trips", "seats_remaining") in added:
+        # лічильник щойно з'явився зі значенням 0 — рахуємо його з місткості і квитків
+        with Session(engine) as db:
+            capacity.reconcile(db)
+    if ("route_calendar", "seats_remaining") in added:
+        with Session(engine) as db:
+            route_calendar.rebuild(db)
+
+
+def analyze(engine: Engine):
+    # Статистика для планувальника SQLite, щоб він обирав нові індекси
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+# ---------- перевірка планів ----------
+
+def _plan_scenarios():
+    """
+    Виклики ендпоінтів із типовими фільтрами (як їх робить фронтенд).
+    Для async-ендпоінтів викликаємо їхню синхронну частину з запитами (_list_trips, _summary, ...).
+    Вивантаження "усього без фільтрів" навмисно не перевіряємо — там повний перегляд очікуваний.
+    """
+    from app.routers import analytics, tickets, trips
+
+    today = date.today()
+    week_ago = today - timedelta(days=7)
+    filters = [
+        {"date_from": week_ago, "date_to": today, "start_station_id": None, "end_station_id": None},
+        {"date_from": None, "date_to": None, "start_station_id": 1, "end_station_id": 2},
+        {"date_from": week_ago, "date_to": today, "start_station_id": 1, "end_station_id": 2},
+    ]
+
+    yield "stations list", lambda db: db.query(models.Station).all()
+    yield "trains list", lambda db: db.query(models.Train).all()
+    yield "routes list", lambda db: db.query(models.Route).all()
+
+    yield "trips by stations", lambda db: trips._list_trips(db=db, start_station_id=1, end_station_id=2, travel_date=None)
+    yield "trips by stations and date", lambda db: trips._list_trips(
+        db=db, start_station_id=1, end_station_id=2, travel_date=today
+    )
+    yield "trips by date", lambda db: trips._list_trips(db=db, start_station_id=None, end_station_id=None, travel_date=today)
+    yield "available dates", lambda db: trips._available_dates(start_station_id=1, end_station_id=2, db=db)
+    yield "route calendar", lambda db: trips._calendar(
+        start_station_id=1, end_station_id=2, first_day=today.replace(day=1), db=db
+    )
+    yield "trip seats", lambda db: trips._trip_seats(trip_id=1, db=db)
+
+    ticket = schemas.TicketCreate(trip_id=1, passenger_name="Plan Check", seat_number="1", price=100)
+    group = [
+        schemas.TicketCreate(trip_id=1, passenger_name="Plan Check", seat_number=str(seat), price=100)
+        for seat in (2, 3)
+    ]
+    yield "create ticket", lambda db: tickets._create_ticket(ticket=ticket, db=db)
+    yield "create tickets batch", lambda db: tickets._create_tickets_batch(tickets=group, db=db)
+    yield "get ticket", lambda db: tickets._get_ticket(ticket_id=1, db=db)
+
+    for f in filters:
+        label = ", ".join(f"{k}={v}" for k, v in f.items() if v is not None)
+        yield f"analytics summary [{label}]", lambda db, f=f: analytics._summary(db=db, **f)
+        yield f"analytics by-day [{label}]", lambda db, f=f: analytics._by_day(db=db, **f)
+        yield f"analytics by-route [{label}]", lambda db, f=f: analytics._by_route(db=db, **f)
+        yield f"analytics by-direction [{label}]", lambda db, f=f: analytics._by_direction(db=db, **f)
+        yield f"analytics top-routes [{label}]", lambda db, f=f: analytics._top_routes(db=db, **f)
+        yield f"analytics tickets page [{label}]", lambda db, f=f: analytics._tickets(
+            db=db, cursor=None, limit=100, format="json", **f
+        )
+        yield f"analytics dashboard [{label}]", lambda db, f=f: analytics._dashboard(
+            db=db, panels="summary,by-day,by-route,by-direction,top-routes,tickets", tickets_limit=100, **f
+        )
+
+
+def _fixture(db: Session):
+    db.add_all([models.Station(id=1, name="A", code="A"), models.Station(id=2, name="B", code="B")])
+    db.add(models.Train(id=1, number="000", name="Plan Check"))
+    db.flush()
+    db.add(models.Route(id=1, start_station_id=1, end_station_id=2))
+    db.flush()
+    # завтра: на рейси, що вже відправились, не продають
+    departure = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+    db.add(
+        models.Trip(
+            id=1,
+            route_id=1,
+            train_id=1,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=5),
+            base_price=100,
+            seats_remaining=540,
+        )
+    )
+    db.commit()
+
+
+def check_plans() -> list:
+    """
+    Виконує сценарії на порожній копії схеми в пам'яті й для кожного запиту до БД
+    знімає EXPLAIN QUERY PLAN. Повертає список (сценарій, SQL, рядок плану)
+    з повними переглядами таблиць tickets або trips.
+    """
+    plan_engine = create_engine("sqlite://")
+    upgrade(plan_engine)
+
+    current = {"scenario": None}
+    problems = []
+
+    @event.listens_for(plan_engine, "before_cursor_execute")
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not current["scenario"]:
+            return
+        if not statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+            return
+        plan_cursor = cursor.connection.cursor()
+        try:
+            plan = plan_cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        finally:
+            plan_cursor.close()
+        for row in plan:
+            match = FULL_SCAN.match(row[3])
+            if match and match.group(1) in GUARDED_TABLES:
+                problems.append((current["scenario"], statement, row[3]))
+
+    with Session(plan_engine) as db:
+        _fixture(db)
+        for name, call in _plan_scenarios():
+            current["scenario"] = name
+            call(db)
+            current["scenario"] = None
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check-plans", action="store_true", help="перевірити плани запитів ендпоінтів")
+    args = parser.parse_args()
+
+    if args.check_plans:
+        problems = check_plans()
+        for scenario, statement, detail in problems:
+            print(f"❌ {scenario}: {detail}\n   {' '.join(statement.split())}")
+        if problems:
+            sys.exit(1)
+        print("✅ Повних переглядів " + "/".join(GUARDED_TABLES) + " немає.")
+        return
+
+    upgrade(default_engine)
+    analyze(default_engine)
+    print("✅ Схему бази оновлено.")
+
+
+if __name__ == "__main__":
+    main()
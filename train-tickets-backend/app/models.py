@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Float, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -23,8 +23,16 @@ class Train(Base):
     number = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=True)
 
+    # Схема місць: вагони однакові, місця нумеруються наскрізно від 1 до capacity
+    cars = Column(Integer, nullable=False, default=10, server_default="10")
+    seats_per_car = Column(Integer, nullable=False, default=54, server_default="54")
+
     trips = relationship("Trip", back_populates="train")
 
+    @property
+    def capacity(self) -> int:
+        return self.cars * self.seats_per_car
+
 
 class Route(Base):
     __tablename__ = "routes"
@@ -41,6 +49,11 @@ class Route(Base):
 
     trips = relationship("Trip", back_populates="route")
 
+    __table_args__ = (
+        # пошук рейсів за парою станцій (list_trips, available-dates, аналітика)
+        Index("ix_routes_stations", "start_station_id", "end_station_id"),
+    )
+
 
 class Trip(Base):
     __tablename__ = "trips"
@@ -53,10 +66,20 @@ class Trip(Base):
     arrival_time = Column(DateTime, nullable=False)
     base_price = Column(Float, nullable=False)
 
+    # Вільні місця: зменшуються умовним UPDATE в одній транзакції з продажем (app/capacity.py)
+    seats_remaining = Column(Integer, nullable=False, server_default="0")
+
     route = relationship("Route", back_populates="trips")
     train = relationship("Train", back_populates="trips")
     tickets = relationship("Ticket", back_populates="trip")
 
+    __table_args__ = (
+        # рейси маршруту за датою виїзду; також покриває join Trip.route_id
+        Index("ix_trips_route_departure", "route_id", "departure_time"),
+        # фільтр лише за датою виїзду
+        Index("ix_trips_departure", "departure_time"),
+    )
+
 
 class Ticket(Base):
     __tablename__ = "tickets"
@@ -74,3 +97,68 @@ class Ticket(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     trip = relationship("Trip", back_populates="tickets")
+
+    __table_args__ = (
+        # Одне місце в рейсі може мати лише один активний (оплачений) квиток.
+        # Перевірку робить сама БД, тому два паралельні продажі не пройдуть обидва.
+        Index(
+            "uq_tickets_trip_seat_paid",
+            "trip_id",
+            "seat_number",
+            unique=True,
+            sqlite_where=text("status = 'paid'"),
+        ),
+        # перевірка місць і карта місць рейсу: trip_id + status, місце береться з самого індексу
+        Index("ix_tickets_trip_status_seat", "trip_id", "status", "seat_number"),
+        # фільтр і сортування аналітики за датою покупки
+        Index("ix_tickets_created_at", "created_at"),
+    )
+
+
+class DailyRouteSales(Base):
+    """
+    Попередньо агреговані продажі: (день покупки, маршрут) -> кількість квитків і дохід.
+    Оновлюється в тій самій транзакції, що й запис квитків (див. app/rollup.py).
+    """
+    __tablename__ = "daily_route_sales"
+
+    day = Column(Date, primary_key=True)
+    route_id = Column(Integer, ForeignKey("routes.id"), primary_key=True)
+
+    tickets = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        # фільтр за станціями: маршрути -> їхні дні продажів
+        Index("ix_daily_route_sales_route_day", "route_id", "day"),
+    )
+
+
+class RouteCalendarDay(Base):
+    """
+    Календар напрямку: (станція відправлення, станція прибуття, день виїзду) ->
+    кількість рейсів, мінімальна базова ціна, продані квитки і вільні місця.
+    Оновлюється при створенні рейсу та продажу квитків (див. app/route_calendar.py).
+    """
+    __tablename__ = "route_calendar"
+
+    start_station_id = Column(Integer, ForeignKey("stations.id"), primary_key=True)
+    end_station_id = Column(Integer, ForeignKey("stations.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    trips = Column(Integer, nullable=False, default=0)
+    min_price = Column(Float, nullable=False)
+    tickets_sold = Column(Integer, nullable=False, default=0)
+    seats_remaining = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class DataGeneration(Base):
+    """
+    Лічильник змін даних (напр. "tickets"), спільний для всіх процесів-воркерів.
+    Збільшується в тій самій транзакції, що й запис квитків; кеш аналітики
+    порівнює з ним свої записи (див. app/analytics_cache.py).
+    """
+    __tablename__ = "data_generations"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
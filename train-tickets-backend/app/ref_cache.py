@@ -0,0 +1,72 @@
+import hashlib
+import threading
+from typing import Callable, Dict, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.analytics_cache import bump_generation, current_generation
+from app.serialization import dumps
+
+REFERENCE_GENERATION = "reference"
+
+
+class ReferenceCache:
+    """
+    Кеш серіалізованих довідників (станції, поїзди, маршрути) у пам'яті процесу.
+
+    Довідники змінюються кілька разів на рік, тож відповідь будується один раз
+    і віддається готовими байтами. Кожна зміна довідника (create/delete) збільшує
+    лічильник "reference" у спільній таблиці data_generations у своїй транзакції;
+    перед відповіддю читаємо його (один запит за первинним ключем), і записи кешу
+    з попереднім значенням стають недійсними — у всіх воркерах uvicorn, а не лише
+    в тому, що змінив довідник.
+
+    ETag — хеш вмісту, тому однаковий для однакових даних у будь-якому процесі;
+    на If-None-Match з тим самим ETag відповідаємо 304 без тіла — його вартість лише
+    читання лічильника за первинним ключем, без запитів до самих довідників.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, bytes, str]] = {}
+
+    @staticmethod
+    def bump(db: Session):
+        """
+        Позначає зміну довідників. Викликати до commit(), у транзакції самої зміни.
+        """
+        bump_generation(db, REFERENCE_GENERATION)
+
+    def _get(self, db: Session, name: str, build: Callable[[], object]) -> Tuple[bytes, str]:
+        # Лічильник читаємо раніше за дані: зміна, що встигне між ними, потрапить у дані,
+        # але запис піде під старим значенням і застаріє з наступним запитом. Навпаки
+        # (дані, потім лічильник) старі дані могли б закешуватись під новим значенням.
+        generation = current_generation(db, REFERENCE_GENERATION)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == generation:
+            return entry[1], entry[2]
+
+        body = dumps(build())
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        with self._lock:
+            # паралельний запит міг уже закешувати новіші дані — їх не перезаписуємо
+            current = self._entries.get(name)
+            if current is None or current[0] <= generation:
+                self._entries[name] = (generation, body, etag)
+        return body, etag
+
+    def respond(self, request: Request, db: Session, name: str, build: Callable[[], object]) -> Response:
+        body, etag = self._get(db, name, build)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+reference_cache = ReferenceCache()
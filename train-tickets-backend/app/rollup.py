@@ -0,0 +1,88 @@
+"""
+Денний зведений підсумок продажів (таблиця daily_route_sales).
+
+Аналітика читає його замість того, щоб щоразу з'єднувати Ticket -> Trip -> Route
+і агрегувати всю історію продажів.
+
+Перебудувати з нуля:
+    python -m app.rollup
+"""
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.analytics_cache import bump_generation
+from app.database import SessionLocal
+from app import archive, models
+
+
+def _aggregate_tickets(tickets=models.Ticket.__table__):
+    return (
+        select(
+            func.date(tickets.c.created_at).label("day"),
+            models.Trip.route_id,
+            func.count(tickets.c.id).label("tickets"),
+            func.sum(tickets.c.price).label("revenue"),
+        )
+        .select_from(tickets)
+        .join(models.Trip, models.Trip.id == tickets.c.trip_id)
+        .group_by(func.date(tickets.c.created_at), models.Trip.route_id)
+    )
+
+
+def record_tickets(db: Session, ticket_ids: Iterable[int]):
+    """
+    Додає щойно створені квитки до підсумку одним запитом і збільшує покоління
+    даних аналітики (кеш у всіх процесах побачить зміну).
+    Викликати до commit(), щоб підсумок і квитки потрапили в одну транзакцію.
+    """
+    ticket_ids = list(ticket_ids)
+    if not ticket_ids:
+        return
+
+    rows = _aggregate_tickets().where(models.Ticket.id.in_(ticket_ids))
+    table = models.DailyRouteSales.__table__
+    stmt = insert(table).from_select(["day", "route_id", "tickets", "revenue"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.day, table.c.route_id],
+        set_={
+            "tickets": table.c.tickets + stmt.excluded.tickets,
+            "revenue": table.c.revenue + stmt.excluded.revenue,
+        },
+    )
+    db.execute(stmt)
+    bump_generation(db)
+
+
+def rebuild(db: Session):
+    """
+    Перераховує підсумок з усієї таблиці tickets разом з архівом.
+    """
+    table = models.DailyRouteSales.__table__
+    rows = _aggregate_tickets(archive.tickets_source(db))
+
+    db.execute(table.delete())
+    db.execute(insert(table).from_select(["day", "route_id", "tickets", "revenue"], rows))
+    bump_generation(db)
+    db.commit()
+
+
+def ensure_built(db: Session):
+    """
+    Для бази, створеної до появи підсумку: якщо він порожній, а квитки є — будуємо.
+    """
+    has_rollup = db.query(models.DailyRouteSales.day).first()
+    has_tickets = db.query(models.Ticket.id).first()
+    if has_tickets and not has_rollup:
+        rebuild(db)
+
+
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        rebuild(session)
+        print("✅ Підсумок продажів перебудовано.")
+    finally:
+        session.close()
@@ -0,0 +1,146 @@
+"""
+Календар напрямків (таблиця route_calendar).
+
+Для пари станцій і дня виїзду зберігає кількість рейсів, мінімальну базову ціну,
+кількість проданих квитків і вільних місць, щоб календар пошуку читав готові рядки за первинним
+ключем замість завантаження всіх рейсів напрямку.
+
+Перебудувати з нуля:
+    python -m app.route_calendar
+"""
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import archive, models
+
+COLUMNS = ["start_station_id", "end_station_id", "day", "trips", "min_price", "tickets_sold", "seats_remaining"]
+
+
+def _key_columns():
+    return (
+        models.Route.start_station_id,
+        models.Route.end_station_id,
+        func.date(models.Trip.departure_time),
+    )
+
+
+def _aggregate_trips(tickets):
+    # проданих квитків по рейсах — одним проходом по tickets (разом з архівом)
+    sold = (
+        select(tickets.c.trip_id, func.count().label("sold"))
+        .where(tickets.c.status == "paid")
+        .group_by(tickets.c.trip_id)
+        .subquery("sold")
+    )
+    return (
+        select(
+            *_key_columns(),
+            func.count(models.Trip.id),
+            func.min(models.Trip.base_price),
+            func.coalesce(func.sum(sold.c.sold), 0),
+            func.sum(models.Train.cars * models.Train.seats_per_car) - func.coalesce(func.sum(sold.c.sold), 0),
+        )
+        .join(models.Route, models.Route.id == models.Trip.route_id)
+        .join(models.Train, models.Train.id == models.Trip.train_id)
+        .outerjoin(sold, sold.c.trip_id == models.Trip.id)
+        .group_by(*_key_columns())
+    )
+
+
+def record_trip(db: Session, trip: models.Trip):
+    """
+    Додає створений рейс до календаря. Викликати до commit().
+    """
+    route = db.get(models.Route, trip.route_id)
+    table = models.RouteCalendarDay.__table__
+    stmt = insert(table).values(
+        start_station_id=route.start_station_id,
+        end_station_id=route.end_station_id,
+        day=trip.departure_time.date(),
+        trips=1,
+        min_price=trip.base_price,
+        tickets_sold=0,
+        seats_remaining=trip.seats_remaining,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.start_station_id, table.c.end_station_id, table.c.day],
+        set_={
+            "trips": table.c.trips + 1,
+            "min_price": func.min(table.c.min_price, stmt.excluded.min_price),
+            "seats_remaining": table.c.seats_remaining + stmt.excluded.seats_remaining,
+        },
+    )
+    db.execute(stmt)
+
+
+def record_tickets(db: Session, ticket_ids: Iterable[int]):
+    """
+    Додає щойно продані квитки до календаря одним запитом.
+    Викликати до commit(), в одній транзакції з квитками.
+    """
+    ticket_ids = list(ticket_ids)
+    if not ticket_ids:
+        return
+
+    rows = (
+        select(*_key_columns(), func.count(models.Ticket.id))
+        .select_from(models.Ticket)
+        .join(models.Trip, models.Trip.id == models.Ticket.trip_id)
+        .join(models.Route, models.Route.id == models.Trip.route_id)
+        .where(models.Ticket.id.in_(ticket_ids), models.Ticket.status == "paid")
+        .group_by(*_key_columns())
+    )
+    # рядок календаря вже існує (його створив рейс), тож лише оновлюємо лічильники
+    table = models.RouteCalendarDay.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.start_station_id == bindparam("b_start"),
+            table.c.end_station_id == bindparam("b_end"),
+            table.c.day == bindparam("b_day"),
+        )
+        .values(
+            tickets_sold=table.c.tickets_sold + bindparam("b_sold"),
+            seats_remaining=table.c.seats_remaining - bindparam("b_sold"),
+        )
+    )
+    params = [
+        {"b_start": start_id, "b_end": end_id, "b_day": date.fromisoformat(day), "b_sold": sold}
+        for start_id, end_id, day, sold in db.execute(rows)
+    ]
+    if params:
+        db.execute(stmt, params)
+
+
+def rebuild(db: Session):
+    """
+    Перераховує календар з усіх рейсів і проданих квитків, враховуючи архів.
+    """
+    table = models.RouteCalendarDay.__table__
+    db.execute(table.delete())
+    db.execute(insert(table).from_select(COLUMNS, _aggregate_trips(archive.tickets_source(db))))
+    db.commit()
+
+
+def ensure_built(db: Session):
+    """
+    Для бази, створеної до появи календаря: якщо він порожній, а рейси є — будуємо.
+    """
+    has_calendar = db.query(models.RouteCalendarDay.day).first()
+    has_trips = db.query(models.Trip.id).first()
+    if has_trips and not has_calendar:
+        rebuild(db)
+
+
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        rebuild(session)
+        print("✅ Календар напрямків перебудовано.")
+    finally:
+        session.close()
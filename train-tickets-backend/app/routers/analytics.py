@@ -1,12 +1,19 @@
+import base64
+import csv
+import io
+from collections import defaultdict
 from datetime import date, datetime, time
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 
-from app.database import get_db
-from app import models
+from app.analytics_cache import analytics_cache, cached
+from app.database import ReadSessionLocal, get_read_session, run_db
+from app.serialization import FastJSONResponse, dumps
+from app import archive, config, models
 
 router = APIRouter(
     prefix="/analytics",
@@ -20,12 +27,12 @@ def _build_datetime_range(date_from: Optional[date], date_to: Optional[date]):
     return dt_from, dt_to
 
 
-def _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id):
-    # вже є join з Trip і Route у всіх запитах
+def _apply_filters(query, tickets, dt_from, dt_to, start_station_id, end_station_id):
+    # вже є join з Trip і Route у всіх запитах; tickets — таблиця або об'єднання з архівом
     if dt_from:
-        query = query.filter(models.Ticket.created_at >= dt_from)
+        query = query.filter(tickets.c.created_at >= dt_from)
     if dt_to:
-        query = query.filter(models.Ticket.created_at <= dt_to)
+        query = query.filter(tickets.c.created_at <= dt_to)
     if start_station_id:
         query = query.filter(models.Route.start_station_id == start_station_id)
     if end_station_id:
@@ -33,10 +40,45 @@ def _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id):
     return query
 
 
+def _rollup_query(db: Session, *columns):
+    # Агрегати читаємо з денного підсумку daily_route_sales, а не з усієї таблиці tickets
+    return (
+        db.query(*columns)
+        .select_from(models.DailyRouteSales)
+        .join(models.Route, models.Route.id == models.DailyRouteSales.route_id)
+    )
+
+
+def _apply_rollup_filters(query, date_from, date_to, start_station_id, end_station_id):
+    # Підсумок денний, а фільтр за датою покупки теж охоплює дні цілком,
+    # тож результат збігається з фільтрацією по Ticket.created_at
+    if date_from:
+        query = query.filter(models.DailyRouteSales.day >= date_from)
+    if date_to:
+        query = query.filter(models.DailyRouteSales.day <= date_to)
+    if start_station_id:
+        query = query.filter(models.Route.start_station_id == start_station_id)
+    if end_station_id:
+        query = query.filter(models.Route.end_station_id == end_station_id)
+    return query
+
+
+def _use_columnar() -> bool:
+    return config.ANALYTICS_ENGINE == "numpy"
+
+
+def _columnar(db: Session):
+    # numpy потрібен лише для колонкового рушія, тому імпорт тут
+    from app.columnar import ticket_columns
+
+    ticket_columns.sync(db)
+    return ticket_columns
+
+
 # ----------- SUMMARY -----------
 @router.get("/summary")
-def analytics_summary(
-    db: Session = Depends(get_db),
+async def analytics_summary(
+    db: Session = Depends(get_read_session),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     start_station_id: Optional[int] = None,
@@ -50,27 +92,37 @@ def analytics_summary(
       - routes_sold: кількість маршрутів з продажами
     З урахуванням фільтрів за датою покупки та станціями.
     """
-    dt_from, dt_to = _build_datetime_range(date_from, date_to)
-
-    base_query = (
-        db.query(models.Ticket)
-        .join(models.Trip, models.Trip.id == models.Ticket.trip_id)
-        .join(models.Route, models.Route.id == models.Trip.route_id)
+    return await run_db(
+        db,
+        _summary,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
     )
 
-    filtered = _apply_filters(base_query, dt_from, dt_to, start_station_id, end_station_id)
 
-    total_tickets = filtered.count()
-    total_revenue = filtered.with_entities(func.sum(models.Ticket.price)).scalar() or 0
-    avg_price = filtered.with_entities(func.avg(models.Ticket.price)).scalar() or 0
-
-    routes_sold = (
-        db.query(models.Route.id)
-        .join(models.Trip, models.Trip.route_id == models.Route.id)
-        .join(models.Ticket, models.Ticket.trip_id == models.Trip.id)
+@cached("summary")
+def _summary(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+):
+    if _use_columnar():
+        return _columnar(db).summary(date_from, date_to, start_station_id, end_station_id)
+
+    # Усі показники одним агрегатним запитом (один прохід по підсумку)
+    totals = _rollup_query(
+        db,
+        func.coalesce(func.sum(models.DailyRouteSales.tickets), 0).label("total_tickets"),
+        func.coalesce(func.sum(models.DailyRouteSales.revenue), 0).label("total_revenue"),
+        func.count(func.distinct(models.DailyRouteSales.route_id)).label("routes_sold"),
     )
-    routes_sold = _apply_filters(routes_sold, dt_from, dt_to, start_station_id, end_station_id)
-    routes_sold = routes_sold.distinct().count()
+    totals = _apply_rollup_filters(totals, date_from, date_to, start_station_id, end_station_id)
+    total_tickets, total_revenue, routes_sold = totals.one()
+    avg_price = total_revenue / total_tickets if total_tickets else 0
 
     return {
         "total_tickets": total_tickets,
@@ -82,8 +134,8 @@ def analytics_summary(
 
 # ----------- BY DAY -----------
 @router.get("/by-day")
-def analytics_by_day(
-    db: Session = Depends(get_db),
+async def analytics_by_day(
+    db: Session = Depends(get_read_session),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     start_station_id: Optional[int] = None,
@@ -96,25 +148,38 @@ def analytics_by_day(
       - revenue
     З урахуванням фільтрів.
     """
-    dt_from, dt_to = _build_datetime_range(date_from, date_to)
-
-    query = (
-        db.query(
-            func.date(models.Ticket.created_at).label("day"),
-            func.count(models.Ticket.id).label("tickets"),
-            func.sum(models.Ticket.price).label("revenue"),
-        )
-        .join(models.Trip, models.Trip.id == models.Ticket.trip_id)
-        .join(models.Route, models.Route.id == models.Trip.route_id)
+    return await run_db(
+        db,
+        _by_day,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
     )
 
-    query = _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id)
 
-    query = (
-        query.group_by(func.date(models.Ticket.created_at))
-        .order_by(func.date(models.Ticket.created_at))
+@cached("by-day")
+def _by_day(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+):
+    if _use_columnar():
+        return _columnar(db).by_day(date_from, date_to, start_station_id, end_station_id)
+
+    query = _rollup_query(
+        db,
+        models.DailyRouteSales.day.label("day"),
+        func.sum(models.DailyRouteSales.tickets).label("tickets"),
+        func.sum(models.DailyRouteSales.revenue).label("revenue"),
     )
 
+    query = _apply_rollup_filters(query, date_from, date_to, start_station_id, end_station_id)
+
+    query = query.group_by(models.DailyRouteSales.day).order_by(models.DailyRouteSales.day)
+
     result = query.all()
 
     return [
@@ -129,8 +194,8 @@ def analytics_by_day(
 
 # ----------- BY ROUTE (route_id) -----------
 @router.get("/by-route")
-def analytics_by_route(
-    db: Session = Depends(get_db),
+async def analytics_by_route(
+    db: Session = Depends(get_read_session),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     start_station_id: Optional[int] = None,
@@ -143,21 +208,37 @@ def analytics_by_route(
       - revenue
     З урахуванням фільтрів.
     """
-    dt_from, dt_to = _build_datetime_range(date_from, date_to)
+    return await run_db(
+        db,
+        _by_route,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+    )
 
-    query = (
-        db.query(
-            models.Route.id.label("route_id"),
-            func.count(models.Ticket.id).label("tickets"),
-            func.sum(models.Ticket.price).label("revenue"),
-        )
-        .join(models.Trip, models.Trip.route_id == models.Route.id)
-        .join(models.Ticket, models.Ticket.trip_id == models.Trip.id)
+
+@cached("by-route")
+def _by_route(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+):
+    if _use_columnar():
+        return _columnar(db).by_route(date_from, date_to, start_station_id, end_station_id)
+
+    query = _rollup_query(
+        db,
+        models.DailyRouteSales.route_id.label("route_id"),
+        func.sum(models.DailyRouteSales.tickets).label("tickets"),
+        func.sum(models.DailyRouteSales.revenue).label("revenue"),
     )
 
-    query = _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id)
+    query = _apply_rollup_filters(query, date_from, date_to, start_station_id, end_station_id)
 
-    query = query.group_by(models.Route.id).order_by(models.Route.id)
+    query = query.group_by(models.DailyRouteSales.route_id).order_by(models.DailyRouteSales.route_id)
 
     result = query.all()
 
@@ -173,8 +254,8 @@ def analytics_by_route(
 
 # ----------- BY DIRECTION (start→end) -----------
 @router.get("/by-direction")
-def analytics_by_direction(
-    db: Session = Depends(get_db),
+async def analytics_by_direction(
+    db: Session = Depends(get_read_session),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     start_station_id: Optional[int] = None,
@@ -188,20 +269,36 @@ def analytics_by_direction(
       - revenue
     Використовується для кругових діаграм (pie chart).
     """
-    dt_from, dt_to = _build_datetime_range(date_from, date_to)
+    return await run_db(
+        db,
+        _by_direction,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+    )
 
-    query = (
-        db.query(
-            models.Route.start_station_id.label("start_station_id"),
-            models.Route.end_station_id.label("end_station_id"),
-            func.count(models.Ticket.id).label("tickets"),
-            func.sum(models.Ticket.price).label("revenue"),
-        )
-        .join(models.Trip, models.Trip.route_id == models.Route.id)
-        .join(models.Ticket, models.Ticket.trip_id == models.Trip.id)
+
+@cached("by-direction")
+def _by_direction(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+):
+    if _use_columnar():
+        return _columnar(db).by_direction(date_from, date_to, start_station_id, end_station_id)
+
+    query = _rollup_query(
+        db,
+        models.Route.start_station_id.label("start_station_id"),
+        models.Route.end_station_id.label("end_station_id"),
+        func.sum(models.DailyRouteSales.tickets).label("tickets"),
+        func.sum(models.DailyRouteSales.revenue).label("revenue"),
     )
 
-    query = _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id)
+    query = _apply_rollup_filters(query, date_from, date_to, start_station_id, end_station_id)
 
     query = (
         query.group_by(models.Route.start_station_id, models.Route.end_station_id)
@@ -222,55 +319,211 @@ def analytics_by_direction(
 
 
 # ----------- TICKETS TABLE -----------
+TICKET_COLUMNS = (
+    "ticket_id",
+    "created_at",
+    "price",
+    "status",
+    "passenger_name",
+    "trip_id",
+    "route_id",
+    "start_station_id",
+    "end_station_id",
+)
+
+STREAM_CHUNK_SIZE = 1000
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _encode_cursor(created_at: datetime, ticket_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{ticket_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, ticket_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(ticket_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _tickets_query(db: Session, date_from, date_to, start_station_id, end_station_id, after=None):
+    """
+    Квитки з фільтрами, від найновіших. Вибираємо лише потрібні колонки, без ORM-об'єктів.
+    after — ключ (created_at, id) останнього рядка попередньої сторінки.
+    Архів квитків додається лише тоді, коли діапазон дат його зачіпає.
+    """
+    dt_from, dt_to = _build_datetime_range(date_from, date_to)
+    tickets = archive.tickets_source(db, include_archive=archive.needs_archive(db, date_from))
+
+    query = (
+        db.query(
+            tickets.c.id.label("ticket_id"),
+            tickets.c.created_at,
+            tickets.c.price,
+            tickets.c.status,
+            tickets.c.passenger_name,
+            tickets.c.trip_id,
+            models.Trip.route_id,
+            models.Route.start_station_id,
+            models.Route.end_station_id,
+        )
+        .select_from(tickets)
+        .join(models.Trip, models.Trip.id == tickets.c.trip_id)
+        .join(models.Route, models.Route.id == models.Trip.route_id)
+    )
+
+    query = _apply_filters(query, tickets, dt_from, dt_to, start_station_id, end_station_id)
+
+    if after is not None:
+        query = query.filter(tuple_(tickets.c.created_at, tickets.c.id) < tuple_(*after))
+
+    return query.order_by(tickets.c.created_at.desc(), tickets.c.id.desc())
+
+
+def _ticket_row(row) -> dict:
+    return {
+        "ticket_id": row.ticket_id,
+        "created_at": row.created_at.isoformat(),
+        "price": float(row.price),
+        "status": row.status,
+        "passenger_name": row.passenger_name,
+        "trip_id": row.trip_id,
+        "route_id": row.route_id,
+        "start_station_id": row.start_station_id,
+        "end_station_id": row.end_station_id,
+    }
+
+
+def _stream_tickets(fmt, date_from, date_to, start_station_id, end_station_id, after, limit):
+    # Окрема сесія: залежність get_read_session закривається ще до того, як почнеться передача відповіді
+    db = ReadSessionLocal()
+    try:
+        query = _tickets_query(db, date_from, date_to, start_station_id, end_station_id, after)
+        if limit:
+            query = query.limit(limit)
+        rows = query.yield_per(STREAM_CHUNK_SIZE)
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(TICKET_COLUMNS)
+            for i, row in enumerate(rows, start=1):
+                writer.writerow(_ticket_row(row).values())
+                if i % STREAM_CHUNK_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            chunk = []
+            for row in rows:
+                chunk.append(dumps(row._asdict()))
+                if len(chunk) == STREAM_CHUNK_SIZE:
+                    yield b"\n".join(chunk) + b"\n"
+                    chunk = []
+            if chunk:
+                yield b"\n".join(chunk) + b"\n"
+    finally:
+        db.close()
+
+
 @router.get("/tickets")
-def analytics_tickets(
-    db: Session = Depends(get_db),
+async def analytics_tickets(
+    db: Session = Depends(get_read_session),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     start_station_id: Optional[int] = None,
     end_station_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    format: str = "json",
 ):
     """
     Таблиця з усіма квитками з фільтрами:
       - дата покупки (created_at)
       - станція відправлення
       - станція прибуття
-    """
-    dt_from, dt_to = _build_datetime_range(date_from, date_to)
 
-    query = (
-        db.query(models.Ticket, models.Trip, models.Route)
-        .join(models.Trip, models.Trip.id == models.Ticket.trip_id)
-        .join(models.Route, models.Route.id == models.Trip.route_id)
+    Посторінково (keyset за (created_at, id), від найновіших):
+      - limit — розмір сторінки, cursor — значення next_cursor з попередньої сторінки
+      - відповідь: {"items": [...], "next_cursor": "..." або null}
+    Без limit і cursor повертається звичайний список усіх квитків, як раніше.
+
+    format=ndjson або format=csv — потокова відповідь з постійним використанням пам'яті
+    (cursor і limit теж працюють).
+    """
+    result = await run_db(
+        db,
+        _tickets,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+        cursor=cursor,
+        limit=limit,
+        format=format,
     )
+    if isinstance(result, Response):
+        return result
+    # рядки з БД уже готові до JSON — без jsonable_encoder для кожного рядка
+    return FastJSONResponse(result)
+
+
+def _tickets(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+    cursor: Optional[str],
+    limit: Optional[int],
+    format: str,
+):
+    if format not in ("json", *STREAM_MEDIA_TYPES):
+        raise HTTPException(status_code=400, detail="Unknown format")
 
-    query = _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id)
-
-    rows = query.order_by(models.Ticket.created_at.desc()).all()
-
-    tickets = []
-    for ticket, trip, route in rows:
-        tickets.append(
-            {
-                "ticket_id": ticket.id,
-                "created_at": ticket.created_at.isoformat(),
-                "price": float(ticket.price),
-                "status": ticket.status,
-                "passenger_name": ticket.passenger_name,
-                "trip_id": trip.id,
-                "route_id": route.id,
-                "start_station_id": route.start_station_id,
-                "end_station_id": route.end_station_id,
-            }
+    after = _decode_cursor(cursor) if cursor else None
+
+    if format in STREAM_MEDIA_TYPES:
+        return StreamingResponse(
+            _stream_tickets(format, date_from, date_to, start_station_id, end_station_id, after, limit),
+            media_type=STREAM_MEDIA_TYPES[format],
         )
 
-    return tickets
+    if limit is None and after is None:
+        return _tickets_table(db, date_from, date_to, start_station_id, end_station_id)
+
+    return _tickets_page(db, date_from, date_to, start_station_id, end_station_id, after, limit or 100)
+
+
+def _tickets_page(db: Session, date_from, date_to, start_station_id, end_station_id, after, limit: int):
+    query = _tickets_query(db, date_from, date_to, start_station_id, end_station_id, after)
+    # беремо на один рядок більше, щоб знати, чи є наступна сторінка
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].ticket_id)
+
+    return {
+        "items": [_ticket_row(row) for row in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def _tickets_table(db: Session, date_from, date_to, start_station_id, end_station_id):
+    # ті самі поля, що й _ticket_row; created_at перетворює на ISO сам серіалізатор
+    query = _tickets_query(db, date_from, date_to, start_station_id, end_station_id)
+    return [row._asdict() for row in query]
 
 
 # ----------- TOP ROUTES -----------
 @router.get("/top-routes")
-def analytics_top_routes(
-    db: Session = Depends(get_db),
+async def analytics_top_routes(
+    db: Session = Depends(get_read_session),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     start_station_id: Optional[int] = None,
@@ -279,23 +532,40 @@ def analytics_top_routes(
     """
     Топ-5 маршрутів за кількістю проданих квитків (з урахуванням фільтрів).
     """
-    dt_from, dt_to = _build_datetime_range(date_from, date_to)
+    return await run_db(
+        db,
+        _top_routes,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+    )
 
-    query = (
-        db.query(
-            models.Route.id.label("route_id"),
-            func.count(models.Ticket.id).label("tickets"),
-            func.sum(models.Ticket.price).label("revenue"),
-        )
-        .join(models.Trip, models.Trip.route_id == models.Route.id)
-        .join(models.Ticket, models.Ticket.trip_id == models.Trip.id)
+
+@cached("top-routes")
+def _top_routes(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+):
+    if _use_columnar():
+        return _columnar(db).top_routes(date_from, date_to, start_station_id, end_station_id)
+
+    tickets = func.sum(models.DailyRouteSales.tickets).label("tickets")
+    query = _rollup_query(
+        db,
+        models.DailyRouteSales.route_id.label("route_id"),
+        tickets,
+        func.sum(models.DailyRouteSales.revenue).label("revenue"),
     )
 
-    query = _apply_filters(query, dt_from, dt_to, start_station_id, end_station_id)
+    query = _apply_rollup_filters(query, date_from, date_to, start_station_id, end_station_id)
 
     query = (
-        query.group_by(models.Route.id)
-        .order_by(func.count(models.Ticket.id).desc())
+        query.group_by(models.DailyRouteSales.route_id)
+        .order_by(tickets.desc(), models.DailyRouteSales.route_id)
         .limit(5)
     )
 
@@ -309,3 +579,178 @@ def analytics_top_routes(
         }
         for row in result
     ]
+
+
+# ----------- DASHBOARD (усі панелі одним запитом) -----------
+DASHBOARD_PANELS = ("summary", "by-day", "by-route", "by-direction", "top-routes", "tickets")
+DASHBOARD_TICKETS_LIMIT = 100
+
+
+@router.get("/dashboard")
+async def analytics_dashboard(
+    db: Session = Depends(get_read_session),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    start_station_id: Optional[int] = None,
+    end_station_id: Optional[int] = None,
+    panels: Optional[str] = None,
+    tickets_limit: int = Query(DASHBOARD_TICKETS_LIMIT, ge=1, le=1000),
+):
+    """
+    Усі панелі сторінки аналітики в одній відповіді:
+    {"summary": {...}, "by-day": [...], "by-route": [...], "by-direction": [...],
+     "top-routes": [...], "tickets": {"items": [...], "next_cursor": ...}}
+    Формат кожної панелі такий самий, як у відповідного окремого ендпоінта;
+    tickets — перша сторінка GET /analytics/tickets?limit=tickets_limit, наступні
+    сторінки — GET /analytics/tickets з cursor=next_cursor.
+
+    panels — необов'язковий список через кому (напр. panels=summary,by-day),
+    щоб отримати лише частину панелей.
+
+    Агреговані панелі рахуються з одного проходу по підсумку daily_route_sales
+    і кешуються; сторінка квитків — окремим запитом на кожен виклик, поза кешем.
+    """
+    result = await run_db(
+        db,
+        _dashboard,
+        date_from=date_from,
+        date_to=date_to,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+        panels=panels,
+        tickets_limit=tickets_limit,
+    )
+    return FastJSONResponse(result)
+
+
+def _dashboard(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+    panels: Optional[str],
+    tickets_limit: int,
+):
+    if panels:
+        selected = [p.strip() for p in panels.split(",") if p.strip()]
+    else:
+        selected = list(DASHBOARD_PANELS)
+
+    unknown = [p for p in selected if p not in DASHBOARD_PANELS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown panels: {', '.join(unknown)}")
+
+    result = {}
+    # Порядок і повтори панелей на результат не впливають — нормалізуємо для ключа кешу
+    aggregates = tuple(sorted(set(selected) - {"tickets"}))
+    if aggregates:
+        # копія: словник із кешу спільний для всіх запитів
+        result.update(_dashboard_panels(db, date_from, date_to, start_station_id, end_station_id, selected=aggregates))
+    if "tickets" in selected:
+        # квитки не кешуємо: сторінка дешева (keyset), а кеш тримав би цілі списки квитків
+        result["tickets"] = _tickets_page(
+            db, date_from, date_to, start_station_id, end_station_id, None, tickets_limit
+        )
+    return result
+
+
+@cached("dashboard")
+def _dashboard_panels(
+    db: Session,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+    selected: tuple,
+):
+    result = {}
+
+    if _use_columnar():
+        engine = _columnar(db)
+        filters = (date_from, date_to, start_station_id, end_station_id)
+        for panel, method in (
+            ("summary", engine.summary),
+            ("by-day", engine.by_day),
+            ("by-route", engine.by_route),
+            ("by-direction", engine.by_direction),
+            ("top-routes", engine.top_routes),
+        ):
+            if panel in selected:
+                result[panel] = method(*filters)
+    else:
+        query = _rollup_query(
+            db,
+            models.DailyRouteSales.day,
+            models.DailyRouteSales.route_id,
+            models.Route.start_station_id,
+            models.Route.end_station_id,
+            func.sum(models.DailyRouteSales.tickets).label("tickets"),
+            func.sum(models.DailyRouteSales.revenue).label("revenue"),
+        )
+        query = _apply_rollup_filters(query, date_from, date_to, start_station_id, end_station_id)
+        query = query.group_by(
+            models.DailyRouteSales.day,
+            models.DailyRouteSales.route_id,
+            models.Route.start_station_id,
+            models.Route.end_station_id,
+        )
+        rows = query.all()
+
+        by_day = defaultdict(lambda: [0, 0.0])
+        by_route = defaultdict(lambda: [0, 0.0])
+        by_direction = defaultdict(lambda: [0, 0.0])
+        for row in rows:
+            revenue = float(row.revenue or 0)
+            for key, bucket in (
+                (str(row.day), by_day),
+                (row.route_id, by_route),
+                ((row.start_station_id, row.end_station_id), by_direction),
+            ):
+                bucket[key][0] += row.tickets
+                bucket[key][1] += revenue
+
+        route_items = [
+            {"route_id": route_id, "tickets": tickets, "revenue": revenue}
+            for route_id, (tickets, revenue) in sorted(by_route.items())
+        ]
+
+        if "summary" in selected:
+            total_tickets = sum(item["tickets"] for item in route_items)
+            total_revenue = sum(item["revenue"] for item in route_items)
+            result["summary"] = {
+                "total_tickets": total_tickets,
+                "total_revenue": total_revenue,
+                "avg_price": total_revenue / total_tickets if total_tickets else 0.0,
+                "routes_sold": len(route_items),
+            }
+        if "by-day" in selected:
+            result["by-day"] = [
+                {"date": day, "tickets": tickets, "revenue": revenue}
+                for day, (tickets, revenue) in sorted(by_day.items())
+            ]
+        if "by-route" in selected:
+            result["by-route"] = route_items
+        if "by-direction" in selected:
+            result["by-direction"] = [
+                {
+                    "start_station_id": start_id,
+                    "end_station_id": end_id,
+                    "tickets": tickets,
+                    "revenue": revenue,
+                }
+                for (start_id, end_id), (tickets, revenue) in sorted(by_direction.items())
+            ]
+        if "top-routes" in selected:
+            result["top-routes"] = sorted(route_items, key=lambda item: item["tickets"], reverse=True)[:5]
+
+    return result
+
+
+# ----------- CACHE STATS -----------
+@router.get("/cache-stats")
+def analytics_cache_stats():
+    """
+    Лічильники кешу результатів аналітики цього процесу (hits, misses, size).
+    """
+    return analytics_cache.stats()
@@ -0,0 +1,44 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app import config
+from app.slow_queries import slow_query_log
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    include_in_schema=False,
+)
+
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)):
+    """
+    Доступ лише із заголовком X-Debug-Token, що збігається з DEBUG_TOKEN.
+    Якщо DEBUG_TOKEN не задано, ендпоінтів налагодження "немає" (404).
+    """
+    if not config.DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_debug_token or not secrets.compare_digest(x_debug_token, config.DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+@router.get("/slow-queries", dependencies=[Depends(require_debug_token)])
+def get_slow_queries(limit: int = 100):
+    """
+    Останні повільні SQL-запити цього процесу (найновіші першими):
+    тривалість, маршрут, текст, параметри і EXPLAIN QUERY PLAN.
+    """
+    return {
+        "threshold_ms": config.SLOW_QUERY_THRESHOLD_MS,
+        "sample_rate": config.SLOW_QUERY_SAMPLE_RATE,
+        "captured_total": slow_query_log.captured,
+        "queries": slow_query_log.entries()[:limit],
+    }
+
+
+@router.delete("/slow-queries", dependencies=[Depends(require_debug_token)])
+def clear_slow_queries():
+    slow_query_log.clear()
+    return {"detail": "Slow query log cleared"}
@@ -0,0 +1,146 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database import get_read_session, get_session, run_db
+from app import config, models
+from app import schemas
+from app.holds import Hold, SeatsHeld, seat_holds
+from app.idempotency import idempotency_store
+from app.routers.tickets import _create_tickets_batch, _ticket_content
+from app.seat_map import seat_map
+
+router = APIRouter(
+    prefix="/trips",
+    tags=["holds"],
+)
+
+
+def _hold_response(hold: Hold) -> dict:
+    return {
+        "hold_id": hold.hold_id,
+        "trip_id": hold.trip_id,
+        "seat_numbers": list(hold.seat_numbers),
+        "expires_at": hold.expires_at,
+    }
+
+
+def _get_hold(trip_id: int, hold_id: str) -> Hold:
+    hold = seat_holds.get(hold_id)
+    if hold is None or hold.trip_id != trip_id:
+        raise HTTPException(status_code=404, detail="Hold not found or expired")
+    return hold
+
+
+@router.post("/{trip_id}/holds", response_model=schemas.Hold)
+async def create_hold(trip_id: int, hold: schemas.HoldCreate, db: Session = Depends(get_read_session)):
+    """
+    Утримати місця рейсу на HOLD_TTL_SECONDS до оплати.
+    Утримання зберігається лише в пам'яті (без запису в БД); поки воно діє,
+    ці місця нікому іншому не продаються. Оплата — POST /trips/{trip_id}/holds/{hold_id}/confirm.
+    """
+    return await run_db(db, _create_hold, trip_id=trip_id, hold=hold)
+
+
+def _create_hold(db: Session, trip_id: int, hold: schemas.HoldCreate):
+    seats = hold.seat_numbers
+    if not seats:
+        raise HTTPException(status_code=400, detail="No seats to hold")
+    if len(seats) > config.HOLD_MAX_SEATS:
+        raise HTTPException(status_code=400, detail=f"At most {config.HOLD_MAX_SEATS} seats per hold")
+    if len(set(seats)) != len(seats):
+        raise HTTPException(status_code=400, detail="Duplicate seats in request")
+
+    trip = (
+        db.query(models.Trip.seats_remaining, models.Trip.departure_time)
+        .filter(models.Trip.id == trip_id)
+        .first()
+    )
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    if trip.departure_time <= datetime.now():
+        raise HTTPException(status_code=409, detail=f"Trip {trip_id} has already departed")
+
+    invalid = seat_map.invalid_seats(db, trip_id, seats)
+    if invalid:
+        raise HTTPException(status_code=422, detail=f"No such seats on the train: {', '.join(invalid)}")
+    taken = [seat for seat in seats if seat_map.is_taken(db, trip_id, seat)]
+    if taken:
+        raise HTTPException(status_code=409, detail=f"Seats already booked: {', '.join(sorted(taken))}")
+    # попередня перевірка; остаточно місця забирає умовний UPDATE під час підтвердження
+    if trip.seats_remaining - seat_holds.held_count(trip_id) < len(seats):
+        raise HTTPException(status_code=409, detail=f"Not enough seats left on trip {trip_id}")
+
+    try:
+        created = seat_holds.hold(trip_id, seats, config.HOLD_TTL_SECONDS)
+    except SeatsHeld as exc:
+        raise HTTPException(status_code=409, detail=f"Seats are held: {', '.join(exc.seat_numbers)}")
+    return _hold_response(created)
+
+
+@router.get("/{trip_id}/holds/{hold_id}", response_model=schemas.Hold)
+def get_hold(trip_id: int, hold_id: str):
+    """
+    Утримання за id (404, якщо його термін уже сплив).
+    """
+    return _hold_response(_get_hold(trip_id, hold_id))
+
+
+@router.delete("/{trip_id}/holds/{hold_id}")
+def release_hold(trip_id: int, hold_id: str):
+    """
+    Скасувати утримання: місця одразу знову доступні.
+    """
+    _get_hold(trip_id, hold_id)
+    seat_holds.release(hold_id)
+    return {"detail": "Hold released"}
+
+
+@router.post("/{trip_id}/holds/{hold_id}/confirm", response_model=List[schemas.Ticket])
+async def confirm_hold(
+    trip_id: int,
+    hold_id: str,
+    tickets: List[schemas.HoldTicket],
+    db: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None),
+):
+    """
+    Оплатити утримання: створює квитки на всі утримані місця (по одному на місце)
+    так само, як POST /tickets/batch — все або нічого. Після успіху утримання знімається.
+    Підтримує заголовок Idempotency-Key: повтор після успіху поверне ті самі квитки,
+    а не 404 для вже знятого утримання.
+    """
+    if idempotency_key is None:
+        return await run_db(db, _confirm_hold, trip_id=trip_id, hold_id=hold_id, tickets=tickets)
+
+    async def confirm():
+        created = await run_db(db, _confirm_hold, trip_id=trip_id, hold_id=hold_id, tickets=tickets)
+        return [_ticket_content(row) for row in created]
+
+    return await idempotency_store.respond(
+        f"POST /trips/{trip_id}/holds/{hold_id}/confirm", idempotency_key, tickets, confirm
+    )
+
+
+def _confirm_hold(db: Session, trip_id: int, hold_id: str, tickets: List[schemas.HoldTicket]):
+    hold = _get_hold(trip_id, hold_id)
+    if sorted(t.seat_number for t in tickets) != sorted(hold.seat_numbers):
+        raise HTTPException(status_code=400, detail="Tickets must match held seats")
+
+    created = _create_tickets_batch(
+        db,
+        tickets=[
+            schemas.TicketCreate(
+                trip_id=trip_id,
+                passenger_name=t.passenger_name,
+                seat_number=t.seat_number,
+                price=t.price,
+            )
+            for t in tickets
+        ],
+        hold_id=hold_id,
+    )
+    seat_holds.release(hold_id)
+    return created
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_read_session, run_db
+from app import config
+from app.timetable import timetable
+
+router = APIRouter(
+    prefix="/journeys",
+    tags=["journeys"],
+)
+
+JOURNEY_OPTIMIZE = ("earliest", "transfers")
+
+
+@router.get("/")
+async def search_journeys(
+    start_station_id: int = Query(...),
+    end_station_id: int = Query(...),
+    departure_after: Optional[datetime] = None,
+    optimize: str = "earliest",
+    min_connection_minutes: int = Query(config.JOURNEY_MIN_CONNECTION_MINUTES, ge=0),
+    db: Session = Depends(get_read_session),
+):
+    """
+    Пошук поїздки між станціями, у тому числі з пересадками (напр. Львів -> Київ -> Одеса).
+      - departure_after: не раніше цього часу (за замовчуванням — зараз)
+      - optimize: "earliest" — найраніше прибуття, "transfers" — найменше пересадок
+      - min_connection_minutes: мінімальний час на пересадку
+    Шукаємо серед рейсів у межах JOURNEY_HORIZON_HOURS від часу виїзду.
+    """
+    if optimize not in JOURNEY_OPTIMIZE:
+        raise HTTPException(status_code=400, detail=f"optimize must be one of: {', '.join(JOURNEY_OPTIMIZE)}")
+    if start_station_id == end_station_id:
+        raise HTTPException(status_code=400, detail="Start and end stations must differ")
+
+    return await run_db(
+        db,
+        _search_journeys,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+        departure_after=departure_after or datetime.now(),
+        optimize=optimize,
+        min_connection=timedelta(minutes=min_connection_minutes),
+    )
+
+
+def _search_journeys(
+    db: Session,
+    start_station_id: int,
+    end_station_id: int,
+    departure_after: datetime,
+    optimize: str,
+    min_connection: timedelta,
+):
+    # дешевий запит по первинному ключу: підхоплює рейси, створені іншими процесами
+    timetable.sync(db)
+
+    horizon = config.JOURNEY_HORIZON_HOURS * 3600
+    if optimize == "transfers":
+        legs = timetable.min_transfers(
+            start_station_id,
+            end_station_id,
+            departure_after,
+            int(min_connection.total_seconds()),
+            horizon,
+            config.JOURNEY_MAX_LEGS,
+        )
+    else:
+        legs = timetable.earliest_arrival(
+            start_station_id,
+            end_station_id,
+            departure_after,
+            int(min_connection.total_seconds()),
+            horizon,
+        )
+
+    if not legs:
+        raise HTTPException(status_code=404, detail="No journey found")
+
+    return {
+        "departure_time": legs[0]["departure_time"],
+        "arrival_time": legs[-1]["arrival_time"],
+        "transfers": len(legs) - 1,
+        "total_price": sum(leg["base_price"] for leg in legs),
+        "legs": legs,
+    }
@@ -1,11 +1,12 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app import models
 from app import schemas
+from app.ref_cache import reference_cache
 
 router = APIRouter(
     prefix="/routes",
@@ -35,15 +36,21 @@ def create_route(route: schemas.RouteCreate, db: Session = Depends(get_db)):
         end_station_id=route.end_station_id,
     )
     db.add(db_route)
+    reference_cache.bump(db)
     db.commit()
     db.refresh(db_route)
     return db_route
 
 
 @router.get("/", response_model=List[schemas.Route])
-def list_routes(db: Session = Depends(get_db)):
+def list_routes(request: Request, db: Session = Depends(get_read_db)):
     """
     Отримати список усіх маршрутів.
+    Відповідь кешується в пам'яті; підтримується ETag / If-None-Match (304).
     """
-    routes = db.query(models.Route).all()
-    return routes
+    return reference_cache.respond(
+        request,
+        db,
+        "routes",
+        lambda: [dict(row._mapping) for row in db.query(*models.Route.__table__.c)],
+    )
@@ -1,11 +1,13 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app import models
 from app import schemas
+from app.ref_cache import reference_cache
 
 router = APIRouter(
     prefix="/stations",
@@ -33,22 +35,28 @@ def create_station(station: schemas.StationCreate, db: Session = Depends(get_db)
         code=station.code,
     )
     db.add(db_station)
+    reference_cache.bump(db)
     db.commit()
     db.refresh(db_station)
     return db_station
 
 
 @router.get("/", response_model=List[schemas.Station])
-def list_stations(db: Session = Depends(get_db)):
+def list_stations(request: Request, db: Session = Depends(get_read_db)):
     """
     Отримати список усіх станцій.
+    Відповідь кешується в пам'яті; підтримується ETag / If-None-Match (304).
     """
-    stations = db.query(models.Station).all()
-    return stations
+    return reference_cache.respond(
+        request,
+        db,
+        "stations",
+        lambda: [dict(row._mapping) for row in db.query(*models.Station.__table__.c)],
+    )
 
 
 @router.get("/{station_id}", response_model=schemas.Station)
-def get_station(station_id: int, db: Session = Depends(get_db)):
+def get_station(station_id: int, db: Session = Depends(get_read_db)):
     """
     Отримати одну станцію по id.
     """
@@ -68,5 +76,11 @@ def delete_station(station_id: int, db: Session = Depends(get_db)):
     if not station:
         raise HTTPException(status_code=404, detail="Station not found")
     db.delete(station)
-    db.commit()
+    reference_cache.bump(db)
+    try:
+        db.commit()
+    except IntegrityError:
+        # зовнішні ключі увімкнені — станцію, що використовується в маршрутах, не видаляємо
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Station is used by routes")
     return {"detail": "Station deleted"}
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections import Counter
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_session, get_session, run_db
 from app import models
+from app import archive, capacity, config, group_commit, rollup, route_calendar
 from app import schemas
+from app.holds import seat_holds
+from app.idempotency import idempotency_store
+from app.seat_map import seat_map
 
 router = APIRouter(
     prefix="/tickets",
@@ -11,50 +22,280 @@ router = APIRouter(
 )
 
 
+def _integrity_error_to_http(exc: IntegrityError) -> HTTPException:
+    """
+    Перетворює помилку обмеження БД на відповідь API:
+      - зовнішній ключ trip_id -> рейсу не існує (400)
+      - унікальний індекс (trip_id, seat_number) -> місце вже зайняте (409)
+    """
+    if _is_missing_trip(exc):
+        return HTTPException(status_code=400, detail="Trip does not exist")
+    return HTTPException(status_code=409, detail="Seat already booked for this trip")
+
+
+def _is_missing_trip(exc: IntegrityError) -> bool:
+    return "FOREIGN KEY" in str(exc.orig)
+
+
+def _reserve_seats(db: Session, trip_ids: List[int], hold_id: Optional[str] = None):
+    """
+    Зменшує лічильники вільних місць рейсів (умовний UPDATE, див. app/capacity.py),
+    не зачіпаючи місць, утриманих іншими покупцями.
+    Якщо якогось рейсу немає, він уже відправився або місць не вистачає — HTTPException
+    (транзакцію відкочує викликач).
+    """
+    for trip_id, count in sorted(Counter(trip_ids).items()):
+        keep = seat_holds.held_count(trip_id, hold_id)
+        if not capacity.reserve(db, trip_id, count, keep):
+            trip = db.query(models.Trip.departure_time).filter(models.Trip.id == trip_id).first()
+            if not trip:
+                raise HTTPException(status_code=400, detail="Trip does not exist")
+            if trip.departure_time <= datetime.now():
+                raise HTTPException(status_code=409, detail=f"Trip {trip_id} has already departed")
+            raise HTTPException(status_code=409, detail=f"Not enough seats left on trip {trip_id}")
+
+
+def _sale_conflict(exc: IntegrityError, requested: List[Tuple[int, str]]) -> HTTPException:
+    if _is_missing_trip(exc):
+        for trip_id in {trip_id for trip_id, _ in requested}:
+            seat_map.forget(trip_id)
+    elif len(requested) == 1:
+        # місце продав інший процес — запам'ятовуємо, щоб наступного разу не йти в БД
+        trip_id, seat_number = requested[0]
+        seat_map.mark_taken(trip_id, [seat_number])
+    return _integrity_error_to_http(exc)
+
+
+def _mark_sold(rows):
+    for row in rows:
+        seat_map.mark_taken(row.trip_id, [row.seat_number])
+
+
+def _commit_sale(db: Session, sell: Callable, requested: List[Tuple[int, str]], **kwargs) -> list:
+    """
+    Звичайний режим: продаж sell(db, ...) і commit окремою транзакцією.
+    """
+    try:
+        rows = sell(db, **kwargs)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise _sale_conflict(exc, requested)
+    except HTTPException:
+        db.rollback()
+        raise
+    _mark_sold(rows)
+    return rows
+
+
+async def _sell(db: Session, sell: Callable, requested: List[Tuple[int, str]], **kwargs) -> list:
+    """
+    Виконує продаж у режимі TICKET_WRITE_MODE: окремою транзакцією в пулі потоків
+    або через чергу групової фіксації (app/group_commit.py) — з тими самими перевірками,
+    помилками і гарантіями збереження.
+    """
+    if config.TICKET_WRITE_MODE != "group":
+        return await run_db(db, _commit_sale, sell, requested, **kwargs)
+    try:
+        rows = await group_commit.writer.submit(sell, **kwargs)
+    except IntegrityError as exc:
+        raise _sale_conflict(exc, requested)
+    except SQLAlchemyError:
+        # пачку не зафіксовано, а кеш місць міг завантажитись з її транзакції
+        for trip_id in {trip_id for trip_id, _ in requested}:
+            seat_map.forget(trip_id)
+        raise
+    _mark_sold(rows)
+    return rows
+
+
+def _ticket_content(row) -> dict:
+    # та сама форма, що й після response_model=schemas.Ticket (для збереженої відповіді)
+    return jsonable_encoder(schemas.Ticket(**row._asdict()))
+
+
+def _ticket_values(ticket: schemas.TicketCreate, created_at: datetime) -> dict:
+    return {
+        "trip_id": ticket.trip_id,
+        "passenger_name": ticket.passenger_name,
+        "seat_number": ticket.seat_number,
+        "price": ticket.price,
+        "status": "paid",
+        "created_at": created_at,
+    }
+
+
 @router.post("/", response_model=schemas.Ticket)
-def create_ticket(ticket: schemas.TicketCreate, db: Session = Depends(get_db)):
+async def create_ticket(
+    ticket: schemas.TicketCreate,
+    db: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None),
+):
     """
     Створити квиток.
-    Перевіряємо:
-      - чи існує рейс
-      - чи не зайняте вже місце у цьому рейсі
+    Усе перевіряє сама БД в одній транзакції:
+      - чи існує рейс, чи він ще не відправився і чи є в ньому вільні місця
+        (умовний UPDATE trips.seats_remaining)
+      - чи не зайняте вже місце у цьому рейсі (унікальний індекс для оплачених квитків)
+    Тому два одночасні продажі одного місця (чи останнього місця) не можуть пройти обидва.
+    Перед цим місце перевіряється за картою зайнятості в пам'яті (seat_map),
+    щоб явно продане місце відхилити без звернення до БД.
+
+    З заголовком Idempotency-Key повтор запиту повертає первісну відповідь
+    без повторного продажу (див. app/idempotency.py).
+    """
+    requested = [(ticket.trip_id, ticket.seat_number)]
+    if idempotency_key is None:
+        return (await _sell(db, _sell_ticket, requested, ticket=ticket))[0]
+
+    async def create():
+        return _ticket_content((await _sell(db, _sell_ticket, requested, ticket=ticket))[0])
+
+    return await idempotency_store.respond("POST /tickets/", idempotency_key, ticket, create)
+
+
+def _create_ticket(db: Session, ticket: schemas.TicketCreate):
+    return _commit_sale(db, _sell_ticket, [(ticket.trip_id, ticket.seat_number)], ticket=ticket)[0]
+
+
+def _sell_ticket(db: Session, ticket: schemas.TicketCreate) -> list:
+    """
+    Перевірки й записи продажу одного квитка, без commit.
+    """
+    if seat_map.is_known_taken(ticket.trip_id, ticket.seat_number):
+        raise HTTPException(status_code=409, detail="Seat already booked for this trip")
+    # Умовний UPDATE лічильника — до завантаження карти місць: він відсіює рейси, що вже
+    # відправились (їхні квитки могли переїхати в архів, якого не бачить унікальний індекс)
+    _reserve_seats(db, [ticket.trip_id])
+    if seat_map.invalid_seats(db, ticket.trip_id, [ticket.seat_number]):
+        raise HTTPException(status_code=422, detail=f"No seat {ticket.seat_number} on this train")
+    if seat_map.is_taken(db, ticket.trip_id, ticket.seat_number):
+        raise HTTPException(status_code=409, detail="Seat already booked for this trip")
+    if seat_holds.is_held(ticket.trip_id, ticket.seat_number):
+        raise HTTPException(status_code=409, detail="Seat is held by another customer")
+
+    stmt = (
+        insert(models.Ticket)
+        .values(_ticket_values(ticket, datetime.utcnow()))
+        .returning(*models.Ticket.__table__.c)
+    )
+    # RETURNING повертає створений рядок одразу, без окремого refresh
+    db_ticket = db.execute(stmt).one()
+    rollup.record_tickets(db, [db_ticket.id])
+    route_calendar.record_tickets(db, [db_ticket.id])
+    return [db_ticket]
+
+
+@router.post("/batch", response_model=List[schemas.Ticket])
+async def create_tickets_batch(
+    tickets: List[schemas.TicketCreate],
+    db: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None),
+):
+    """
+    Купівля кількох квитків одразу (групи, сім'ї).
+    Принцип "все або нічого":
+      - усі місця перевіряються одним запитом
+      - усі квитки вставляються одним INSERT в одній транзакції
+    Якщо хоча б одне місце зайняте або в рейсі не вистачає вільних місць —
+    не створюється жоден квиток.
+    Підтримує заголовок Idempotency-Key, як і POST /tickets/.
+    """
+    requested = [(t.trip_id, t.seat_number) for t in tickets]
+    if idempotency_key is None:
+        return await _sell(db, _sell_tickets_batch, requested, tickets=tickets)
+
+    async def create():
+        return [_ticket_content(row) for row in await _sell(db, _sell_tickets_batch, requested, tickets=tickets)]
+
+    return await idempotency_store.respond("POST /tickets/batch", idempotency_key, tickets, create)
+
+
+def _create_tickets_batch(db: Session, tickets: List[schemas.TicketCreate], hold_id: Optional[str] = None):
+    """
+    hold_id — утримання, яке підтверджується цими квитками: його місця вважаються вільними.
+    """
+    requested = [(t.trip_id, t.seat_number) for t in tickets]
+    return _commit_sale(db, _sell_tickets_batch, requested, tickets=tickets, hold_id=hold_id)
+
+
+def _sell_tickets_batch(db: Session, tickets: List[schemas.TicketCreate], hold_id: Optional[str] = None) -> list:
     """
-    trip = db.query(models.Trip).filter(models.Trip.id == ticket.trip_id).first()
-    if not trip:
-        raise HTTPException(status_code=400, detail="Trip does not exist")
+    Перевірки й записи продажу групи квитків, без commit.
+    """
+    if not tickets:
+        raise HTTPException(status_code=400, detail="No tickets to create")
+
+    requested = [(t.trip_id, t.seat_number) for t in tickets]
+    if len(set(requested)) != len(requested):
+        raise HTTPException(status_code=400, detail="Duplicate seats in request")
 
-    # Перевіряємо, чи місце вже не зайняте
-    existing = (
-        db.query(models.Ticket)
+    # як і для одного квитка, рейси, що вже відправились, відсіюються до перевірок місць
+    _reserve_seats(db, [trip_id for trip_id, _ in requested], hold_id)
+
+    invalid = [
+        (trip_id, seat) for trip_id, seat in requested if seat_map.invalid_seats(db, trip_id, [seat])
+    ]
+    if invalid:
+        seats = ", ".join(f"{trip_id}/{seat}" for trip_id, seat in sorted(invalid))
+        raise HTTPException(status_code=422, detail=f"No such seats on the train: {seats}")
+
+    taken = [(trip_id, seat) for trip_id, seat in requested if seat_map.is_taken(db, trip_id, seat)]
+    if taken:
+        seats = ", ".join(f"{trip_id}/{seat}" for trip_id, seat in sorted(taken))
+        raise HTTPException(status_code=409, detail=f"Seats already booked: {seats}")
+
+    # місця, утримані іншими покупцями (місця утримання hold_id — наші)
+    held = [(trip_id, seat) for trip_id, seat in requested if seat_holds.is_held(trip_id, seat, hold_id)]
+    if held:
+        seats = ", ".join(f"{trip_id}/{seat}" for trip_id, seat in sorted(held))
+        raise HTTPException(status_code=409, detail=f"Seats are held: {seats}")
+
+    # Одним запитом шукаємо вже оплачені місця серед запитаних
+    taken = (
+        db.query(models.Ticket.trip_id, models.Ticket.seat_number)
         .filter(
-            models.Ticket.trip_id == ticket.trip_id,
-            models.Ticket.seat_number == ticket.seat_number,
+            models.Ticket.trip_id.in_({trip_id for trip_id, _ in requested}),
+            models.Ticket.seat_number.in_({seat for _, seat in requested}),
             models.Ticket.status == "paid",
         )
-        .first()
+        .all()
     )
-    if existing:
-        raise HTTPException(status_code=400, detail="Seat already booked for this trip")
-
-    db_ticket = models.Ticket(
-        trip_id=ticket.trip_id,
-        passenger_name=ticket.passenger_name,
-        seat_number=ticket.seat_number,
-        price=ticket.price,
-        status="paid",
+    taken = set(requested) & {(row.trip_id, row.seat_number) for row in taken}
+    if taken:
+        seats = ", ".join(f"{trip_id}/{seat}" for trip_id, seat in sorted(taken))
+        raise HTTPException(status_code=409, detail=f"Seats already booked: {seats}")
+
+    created_at = datetime.utcnow()
+    stmt = (
+        insert(models.Ticket)
+        .values([_ticket_values(t, created_at) for t in tickets])
+        .returning(*models.Ticket.__table__.c)
     )
-    db.add(db_ticket)
-    db.commit()
-    db.refresh(db_ticket)
-    return db_ticket
+    # унікальний індекс все одно страхує від паралельного продажу між перевіркою і вставкою
+    db_tickets = db.execute(stmt).all()
+    ticket_ids = [t.id for t in db_tickets]
+    rollup.record_tickets(db, ticket_ids)
+    route_calendar.record_tickets(db, ticket_ids)
+    return sorted(db_tickets, key=lambda t: t.id)
 
 
 @router.get("/{ticket_id}", response_model=schemas.Ticket)
-def get_ticket(ticket_id: int, db: Session = Depends(get_db)):
+async def get_ticket(ticket_id: int, db: Session = Depends(get_read_session)):
     """
     Отримати квиток по id.
     """
+    return await run_db(db, _get_ticket, ticket_id=ticket_id)
+
+
+def _get_ticket(db: Session, ticket_id: int):
     ticket = db.query(models.Ticket).filter(models.Ticket.id == ticket_id).first()
+    if not ticket and archive.ensure_attached(db):
+        # квитки давно минулих рейсів перенесено в архів (app/archive.py)
+        row = db.execute(
+            select(archive.archive_tickets).where(archive.archive_tickets.c.id == ticket_id)
+        ).first()
+        ticket = row._asdict() if row else None
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     return ticket
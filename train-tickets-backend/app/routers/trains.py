@@ -1,12 +1,13 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app import models
 from app import schemas
+from app.ref_cache import reference_cache
 
 router = APIRouter(
     prefix="/trains",
@@ -21,8 +22,11 @@ def create_train(train: schemas.TrainCreate, db: Session = Depends(get_db)):
     Приклад:
     {
       "number": "091К",
-      "name": "Київ — Львів"
+      "name": "Київ — Львів",
+      "cars": 12,
+      "seats_per_car": 54
     }
+    Місця рейсів цього поїзда нумеруються від 1 до cars * seats_per_car.
     """
     existing = db.query(models.Train).filter(models.Train.number == train.number).first()
     if existing:
@@ -31,17 +35,28 @@ def create_train(train: schemas.TrainCreate, db: Session = Depends(get_db)):
     db_train = models.Train(
         number=train.number,
         name=train.name,
+        cars=train.cars,
+        seats_per_car=train.seats_per_car,
     )
     db.add(db_train)
+    reference_cache.bump(db)
     db.commit()
     db.refresh(db_train)
     return db_train
 
 
 @router.get("/", response_model=List[schemas.Train])
-def list_trains(db: Session = Depends(get_db)):
+def list_trains(request: Request, db: Session = Depends(get_read_db)):
     """
     Отримати список усіх поїздів.
+    Відповідь кешується в пам'яті; підтримується ETag / If-None-Match (304).
     """
-    trains = db.query(models.Train).all()
-    return trains
+    return reference_cache.respond(
+        request,
+        db,
+        "trains",
+        lambda: [
+            {**row._mapping, "capacity": row.cars * row.seats_per_car}
+            for row in db.query(*models.Train.__table__.c)
+        ],
+    )
@@ -4,9 +4,13 @@ from datetime import date, datetime, time, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app import models
+from app.database import get_db, get_read_session, run_db
+from app import models, route_calendar
 from app import schemas
+from app.holds import seat_holds
+from app.seat_map import seat_map
+from app.serialization import FastJSONResponse
+from app.timetable import timetable
 
 router = APIRouter(
     prefix="/trips",
@@ -34,16 +38,22 @@ def create_trip(trip: schemas.TripCreate, db: Session = Depends(get_db)):
         departure_time=trip.departure_time,
         arrival_time=trip.arrival_time,
         base_price=trip.base_price,
+        seats_remaining=train.capacity,
     )
     db.add(db_trip)
+    db.flush()
+    route_calendar.record_trip(db, db_trip)
     db.commit()
     db.refresh(db_trip)
+    if timetable.loaded:
+        # новий рейс одразу доступний для пошуку з пересадками
+        timetable.sync(db)
     return db_trip
 
 
 @router.get("/", response_model=List[schemas.Trip])
-def list_trips(
-    db: Session = Depends(get_db),
+async def list_trips(
+    db: Session = Depends(get_read_session),
     start_station_id: Optional[int] = None,
     end_station_id: Optional[int] = None,
     travel_date: Optional[date] = None,
@@ -54,12 +64,32 @@ def list_trips(
       - за станцією відправлення
       - за станцією прибуття
       - за датою виїзду (travel_date, без часу)
+    Кожен рейс містить seats_remaining — кількість вільних місць (готовий лічильник
+    мінус місця, утримані до оплати).
     """
-    query = db.query(models.Trip)
+    trips = await run_db(
+        db,
+        _list_trips,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+        travel_date=travel_date,
+    )
+    # рядки вже у форматі schemas.Trip — віддаємо без повторної валідації
+    return FastJSONResponse(trips)
+
+
+def _list_trips(
+    db: Session,
+    start_station_id: Optional[int],
+    end_station_id: Optional[int],
+    travel_date: Optional[date],
+):
+    # Лише колонки рейсу, без ORM-об'єктів
+    query = db.query(*models.Trip.__table__.c)
 
     # Приєднуємо Route для фільтрації за станціями
     if start_station_id is not None or end_station_id is not None:
-        query = query.join(models.Route)
+        query = query.join(models.Route, models.Route.id == models.Trip.route_id)
 
         if start_station_id is not None:
             query = query.filter(models.Route.start_station_id == start_station_id)
@@ -73,36 +103,129 @@ def list_trips(
         query = query.filter(models.Trip.departure_time >= start_dt,
                              models.Trip.departure_time < end_dt)
 
-    trips = query.all()
+    trips = [row._asdict() for row in query]
+    # утримані до оплати місця (app/holds.py) іншим покупцям не доступні
+    held = seat_holds.held_counts()
+    if held:
+        for trip in trips:
+            trip["seats_remaining"] -= held.get(trip["id"], 0)
     return trips
 
 @router.get("/available-dates")
-def get_available_dates(
+async def get_available_dates(
     start_station_id: int = Query(...),
     end_station_id: int = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_session),
 ):
     """
     Повертає список дат (YYYY-MM-DD), для яких існують рейси
     між двома станціями.
     """
-    # Перевіряємо, що маршрут існує хоча б в одному рейсі
-    query = (
-        db.query(models.Trip)
-        .join(models.Route, models.Trip.route_id == models.Route.id)
+    return await run_db(
+        db,
+        _available_dates,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+    )
+
+
+def _available_dates(db: Session, start_station_id: int, end_station_id: int):
+    # Дні беруться з календаря напрямку (читання за первинним ключем)
+    days = (
+        db.query(models.RouteCalendarDay.day)
         .filter(
-            models.Route.start_station_id == start_station_id,
-            models.Route.end_station_id == end_station_id,
+            models.RouteCalendarDay.start_station_id == start_station_id,
+            models.RouteCalendarDay.end_station_id == end_station_id,
         )
+        .order_by(models.RouteCalendarDay.day)
     )
+    return {"dates": [day.isoformat() for (day,) in days]}
+
 
-    trips = query.all()
+@router.get("/calendar")
+async def get_calendar(
+    start_station_id: int = Query(...),
+    end_station_id: int = Query(...),
+    month: Optional[str] = Query(None, description="YYYY-MM, за замовчуванням поточний місяць"),
+    db: Session = Depends(get_read_session),
+):
+    """
+    Календар напрямку на місяць: для кожного дня з рейсами —
+    кількість рейсів, мінімальна базова ціна, кількість проданих квитків і вільних місць.
+    """
+    if month is None:
+        first_day = date.today().replace(day=1)
+    else:
+        try:
+            first_day = datetime.strptime(month, "%Y-%m").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid month, expected YYYY-MM")
+
+    return await run_db(
+        db,
+        _calendar,
+        start_station_id=start_station_id,
+        end_station_id=end_station_id,
+        first_day=first_day,
+    )
 
-    if not trips:
-        return {"dates": []}
 
-    unique_dates = sorted(
-        {t.departure_time.date().isoformat() for t in trips}
+def _calendar(db: Session, start_station_id: int, end_station_id: int, first_day: date):
+    next_month = (first_day + timedelta(days=31)).replace(day=1)
+    rows = (
+        db.query(models.RouteCalendarDay)
+        .filter(
+            models.RouteCalendarDay.start_station_id == start_station_id,
+            models.RouteCalendarDay.end_station_id == end_station_id,
+            models.RouteCalendarDay.day >= first_day,
+            models.RouteCalendarDay.day < next_month,
+        )
+        .order_by(models.RouteCalendarDay.day)
     )
+    return {
+        "month": first_day.strftime("%Y-%m"),
+        "days": [
+            {
+                "date": row.day.isoformat(),
+                "trips": row.trips,
+                "min_price": row.min_price,
+                "tickets_sold": row.tickets_sold,
+                "seats_remaining": row.seats_remaining,
+            }
+            for row in rows
+        ],
+    }
+
+
+@router.get("/{trip_id}/seats")
+async def get_trip_seats(trip_id: int, db: Session = Depends(get_read_session)):
+    """
+    Карта місць рейсу: схема вагонів, список зайнятих (оплачених) і утриманих до оплати
+    місць та кількість вільних.
+    Береться з карти зайнятості в пам'яті, без запиту до tickets після першого звернення.
+    """
+    return await run_db(db, _trip_seats, trip_id=trip_id)
 
-    return {"dates": unique_dates}
+
+def _trip_seats(db: Session, trip_id: int):
+    trip = (
+        db.query(models.Trip.seats_remaining, models.Train.cars, models.Train.seats_per_car)
+        .join(models.Train, models.Train.id == models.Trip.train_id)
+        .filter(models.Trip.id == trip_id)
+        .first()
+    )
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    occupied = seat_map.occupied(db, trip_id)
+    held = seat_holds.held(trip_id)
+    return {
+        "trip_id": trip_id,
+        "cars": trip.cars,
+        "seats_per_car": trip.seats_per_car,
+        "capacity": trip.cars * trip.seats_per_car,
+        "seats_remaining": trip.seats_remaining - len(held),
+        "occupied": occupied,
+        "occupied_count": len(occupied),
+        "held": held,
+    }
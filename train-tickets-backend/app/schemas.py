@@ -1,6 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 
 # ---------- STATIONS ----------
@@ -26,6 +26,8 @@ class Station(StationBase):
 class TrainBase(BaseModel):
     number: str
     name: Optional[str] = None
+    cars: int = Field(10, gt=0)
+    seats_per_car: int = Field(54, gt=0)
 
 
 class TrainCreate(TrainBase):
@@ -34,6 +36,7 @@ class TrainCreate(TrainBase):
 
 class Train(TrainBase):
     id: int
+    capacity: int
 
     class Config:
         orm_mode = True
@@ -73,6 +76,7 @@ class TripCreate(TripBase):
 
 class Trip(TripBase):
     id: int
+    seats_remaining: int
 
     class Config:
         orm_mode = True
@@ -97,4 +101,23 @@ class Ticket(TicketBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+# ---------- HOLDS ----------
+
+class HoldCreate(BaseModel):
+    seat_numbers: List[str]
+
+
+class Hold(BaseModel):
+    hold_id: str
+    trip_id: int
+    seat_numbers: List[str]
+    expires_at: datetime
+
+
+class HoldTicket(BaseModel):
+    passenger_name: str
+    seat_number: str
+    price: float
@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import archive, config, models
+
+
+def _seat_index(seat_number: str) -> Optional[int]:
+    # Місця зазвичай числові ("1", "42") — їх тримаємо в бітовій мапі,
+    # решту (напр. "12A" чи "007") у звичайній множині, щоб не втратити запис
+    if seat_number.isdecimal() and str(int(seat_number)) == seat_number:
+        return int(seat_number)
+    return None
+
+
+class TripSeats:
+    """
+    Зайнятість місць одного рейсу: один біт на місце.
+    capacity — кількість місць поїзда рейсу (місця 1..capacity).
+    """
+
+    __slots__ = ("bits", "other", "capacity")
+
+    def __init__(self, capacity: int = 0):
+        self.bits = bytearray()
+        self.other: Set[str] = set()
+        self.capacity = capacity
+
+    def add(self, seat_number: str):
+        index = _seat_index(seat_number)
+        if index is None:
+            self.other.add(seat_number)
+            return
+        byte = index >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        self.bits[byte] |= 1 << (index & 7)
+
+    def __contains__(self, seat_number: str) -> bool:
+        index = _seat_index(seat_number)
+        if index is None:
+            return seat_number in self.other
+        byte = index >> 3
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << (index & 7)))
+
+    def seats(self) -> List[str]:
+        numbered = [
+            str(byte * 8 + bit)
+            for byte, value in enumerate(self.bits) if value
+            for bit in range(8) if value & (1 << bit)
+        ]
+        return numbered + sorted(self.other)
+
+
+class SeatMap:
+    """
+    Кеш зайнятих місць по рейсах у пам'яті процесу.
+    Рейс підвантажується з tickets при першому зверненні, далі оновлюється
+    після кожного успішного продажу. Це лише швидкий попередній фільтр:
+    остаточно зайнятість місця гарантує унікальний індекс у БД.
+
+    Тримаємо не більше maxsize рейсів (LRU). Рейси, що вже відправились, не кешуємо
+    зовсім: продажів на них немає, а перегляд їхньої карти витісняв би живі рейси.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._trips: "OrderedDict[int, TripSeats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, db: Session, trip_id: int) -> TripSeats:
+        with self._lock:
+            trip_seats = self._trips.get(trip_id)
+            if trip_seats is not None:
+                self._trips.move_to_end(trip_id)
+                return trip_seats
+
+        trip = (
+            db.query(models.Trip.departure_time, (models.Train.cars * models.Train.seats_per_car).label("capacity"))
+            .join(models.Train, models.Train.id == models.Trip.train_id)
+            .filter(models.Trip.id == trip_id)
+            .first()
+        )
+        # квитки рейсу, що вже відправився, могли переїхати в архів (app/archive.py)
+        departed = trip is not None and trip.departure_time <= datetime.now()
+        tickets = archive.tickets_source(db, include_archive=departed)
+
+        loaded = TripSeats(trip.capacity if trip is not None else 0)
+        rows = db.execute(
+            select(tickets.c.seat_number).where(tickets.c.trip_id == trip_id, tickets.c.status == "paid")
+        )
+        for row in rows:
+            loaded.add(row.seat_number)
+
+        if departed:
+            return loaded
+        with self._lock:
+            trip_seats = self._trips.setdefault(trip_id, loaded)
+            while len(self._trips) > self.maxsize:
+                self._trips.popitem(last=False)
+            return trip_seats
+
+    def is_taken(self, db: Session, trip_id: int, seat_number: str) -> bool:
+        return seat_number in self._get(db, trip_id)
+
+    def is_known_taken(self, trip_id: int, seat_number: str) -> bool:
+        """
+        Як is_taken, але лише за вже завантаженими рейсами, без звернення до БД.
+        """
+        trip_seats = self._trips.get(trip_id)
+        return trip_seats is not None and seat_number in trip_seats
+
+    def invalid_seats(self, db: Session, trip_id: int, seat_numbers: Iterable[str]) -> List[str]:
+        """
+        Місця, яких у поїзді рейсу немає: не число від 1 до місткості поїзда
+        (або число не в канонічному записі, як "007" — інакше це друге ім'я місця 7).
+        """
+        capacity = self._get(db, trip_id).capacity
+        return [
+            seat_number for seat_number in seat_numbers
+            if not 1 <= (_seat_index(seat_number) or 0) <= capacity
+        ]
+
+    def occupied(self, db: Session, trip_id: int) -> List[str]:
+        return self._get(db, trip_id).seats()
+
+    def mark_taken(self, trip_id: int, seat_numbers: Iterable[str]):
+        with self._lock:
+            trip_seats = self._trips.get(trip_id)
+            if trip_seats is None:
+                # рейс ще не завантажений — підтягнеться з БД при першому зверненні
+                return
+            for seat_number in seat_numbers:
+                trip_seats.add(seat_number)
+
+    def forget(self, trip_id: int):
+        with self._lock:
+            self._trips.pop(trip_id, None)
+
+
+seat_map = SeatMap(config.SEAT_MAP_SIZE)
@@ -1,7 +1,37 @@
+"""
+Тестові дані.
+
+    python -m app.seed_data                       # невеликий демонстраційний набір (seed)
+    python -m app.seed_data --scale 10 --seed 42  # синтетичні дані для навантажувальних тестів
+    python -m app.seed_data --scale 10 --append   # дописати до наявної бази, не очищаючи
+
+Масштаб 1 — 10 станцій, 10 поїздів, 30 маршрутів, 90 днів розкладу, у середньому
+20 квитків на рейс (~54 тис. квитків); кількість станцій, поїздів і маршрутів росте
+пропорційно масштабу. З тим самим --seed, --start-date і тією самою початковою базою
+дані однакові. Розклад за замовчуванням починається з DEFAULT_START_DATE; щоб мати
+і майбутні рейси, задайте --start-date відносно сьогодні.
+"""
+import argparse
+import random
 from datetime import datetime, timedelta, time as dtime, date
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
-from app.database import SessionLocal
-from app import models
+from sqlalchemy import func, insert
+
+from app.database import SessionLocal, engine
+from app import archive, capacity, migrations, models, rollup, route_calendar
+from app.ref_cache import reference_cache
+
+# Рядків в одному executemany (і в одній транзакції)
+INSERT_CHUNK_SIZE = 50_000
+# Квитки продаються не раніше ніж за стільки днів до відправлення
+MAX_SALES_LEAD_DAYS = 60
+# Перший день розкладу, якщо не задано інший: фіксований, щоб запуски відтворювались
+DEFAULT_START_DATE = date(2025, 1, 1)
+# Схема місць згенерованих поїздів: місця рейсу — від 1 до GENERATED_CARS * GENERATED_SEATS_PER_CAR
+GENERATED_CARS = 10
+GENERATED_SEATS_PER_CAR = 54
 
 
 def reset_data(db):
@@ -9,11 +39,14 @@ def reset_data(db):
     Очищаємо всі таблиці, щоб не було дублювань.
     Порядок важливий через зовнішні ключі.
     """
+    db.query(models.DailyRouteSales).delete()
+    db.query(models.RouteCalendarDay).delete()
     db.query(models.Ticket).delete()
     db.query(models.Trip).delete()
     db.query(models.Route).delete()
     db.query(models.Train).delete()
     db.query(models.Station).delete()
+    archive.clear(db)
     db.commit()
 
 
@@ -238,11 +271,283 @@ def seed():
                 ticket_id_counter += 1
 
         db.commit()
+
+        # Майбутні рейси без квитків — на рейси, що вже відправились, квитки не продаються
+        for route, train_number, dep, arr, base_price in (
+            (routes_list[0], "091К", make_dt(1, 22, 30), make_dt(2, 6, 30), 800.0),
+            (routes_list[2], "105К", make_dt(2, 8, 0), make_dt(2, 15, 0), 950.0),
+            (routes_list[3], "706Х", make_dt(3, 6, 0), make_dt(3, 11, 0), 700.0),
+        ):
+            db.add(
+                models.Trip(
+                    route_id=route.id,
+                    train_id=trains_by_number[train_number].id,
+                    departure_time=dep,
+                    arrival_time=arr,
+                    base_price=base_price,
+                )
+            )
+        db.commit()
+
+        # рейси й квитки додавались напряму, тож підсумок для аналітики, календар
+        # і лічильники вільних місць рахуємо окремо
+        rollup.rebuild(db)
+        route_calendar.rebuild(db)
+        capacity.reconcile(db)
+        # довідники змінились повз ендпоінти — кешовані відповіді в усіх воркерах застаріли
+        reference_cache.bump(db)
+        db.commit()
         print("✅ База успішно наповнена тестовими даними.")
 
     finally:
         db.close()
 
 
+
+# ---------- синтетичні дані ----------
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_insert(db, model, rows: Iterable[dict]) -> int:
+    """
+    Вставляє рядки пачками через Core executemany, по транзакції на пачку.
+    """
+    count = 0
+    for chunk in _chunks(rows, INSERT_CHUNK_SIZE):
+        db.execute(insert(model.__table__), chunk)
+        db.commit()
+        count += len(chunk)
+    return count
+
+
+def _next_id(db, model) -> int:
+    return (db.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def generate(
+    scale: float = 1,
+    seed_value: int = 42,
+    append: bool = False,
+    stations: Optional[int] = None,
+    trains: Optional[int] = None,
+    routes: Optional[int] = None,
+    days: int = 90,
+    trips_per_day: int = 1,
+    tickets_per_trip: int = 20,
+    sales_lead_days: float = 7,
+    cancelled_share: float = 0.03,
+    start_date: Optional[date] = None,
+):
+    """
+    Генерує станції, поїзди, маршрути, рейси (trips_per_day на маршрут щодня протягом days)
+    і квитки (у середньому tickets_per_trip на рейс, рівномірно від 0 до 2x, але не більше
+    за місткість поїзда).
+
+    Кожен маршрут — окремий напрямок (пара станцій); якщо станцій на всі маршрути
+    не вистачає, їх стає більше (або ValueError, якщо кількість станцій задано явно).
+    З append напрямки можуть збігатися з уже наявними маршрутами.
+
+    Дата покупки — за експоненційним розподілом до відправлення із середнім
+    sales_lead_days днів (не більше MAX_SALES_LEAD_DAYS), але не пізніше за поточний
+    момент: квитки на майбутні рейси вже куплені. Частка cancelled_share квитків
+    має статус "cancelled".
+
+    Ідентифікатори призначаються наперед (після максимального наявного id), тож квитки
+    посилаються на рейси без зчитування згенерованих рядків назад.
+    """
+    rng = random.Random(seed_value)
+    trains = trains or max(1, round(10 * scale))
+    routes = routes or max(1, round(30 * scale))
+    # n станцій дають n * (n - 1) напрямків
+    min_stations = 2
+    while min_stations * (min_stations - 1) < routes:
+        min_stations += 1
+    if stations is None:
+        stations = max(min_stations, round(10 * scale))
+    elif stations < min_stations:
+        raise ValueError(f"{routes} routes need at least {min_stations} stations")
+    train_capacity = GENERATED_CARS * GENERATED_SEATS_PER_CAR
+    start_date = start_date or DEFAULT_START_DATE
+
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    try:
+        if not append:
+            reset_data(db)
+
+        station_base = _next_id(db, models.Station)
+        train_base = _next_id(db, models.Train)
+        route_base = _next_id(db, models.Route)
+        trip_base = _next_id(db, models.Trip)
+        ticket_base = _next_id(db, models.Ticket)
+
+        station_ids = list(range(station_base, station_base + stations))
+        _bulk_insert(
+            db,
+            models.Station,
+            ({"id": i, "name": f"Станція {i}", "code": f"ST{i:06d}"} for i in station_ids),
+        )
+        train_ids = list(range(train_base, train_base + trains))
+        _bulk_insert(
+            db,
+            models.Train,
+            (
+                {
+                    "id": i,
+                    "number": f"{i:05d}G",
+                    "name": f"Поїзд {i}",
+                    "cars": GENERATED_CARS,
+                    "seats_per_car": GENERATED_SEATS_PER_CAR,
+                }
+                for i in train_ids
+            ),
+        )
+
+        # маршрут: (id, станція від, станція до, поїзд, базова ціна, тривалість у хвилинах)
+        route_specs = []
+        pairs = set()
+        for route_id in range(route_base, route_base + routes):
+            start_id, end_id = rng.sample(station_ids, 2)
+            while (start_id, end_id) in pairs:
+                start_id, end_id = rng.sample(station_ids, 2)
+            pairs.add((start_id, end_id))
+            route_specs.append(
+                (
+                    route_id,
+                    start_id,
+                    end_id,
+                    rng.choice(train_ids),
+                    float(rng.randrange(200, 1500, 10)),
+                    rng.randrange(60, 14 * 60, 5),
+                )
+            )
+        _bulk_insert(
+            db,
+            models.Route,
+            ({"id": r[0], "start_station_id": r[1], "end_station_id": r[2]} for r in route_specs),
+        )
+
+        # рейси: (id, ціна, час відправлення) потрібні для квитків
+        trip_specs = []
+
+        def trip_rows():
+            trip_id = trip_base
+            for day in range(days):
+                day_start = datetime.combine(start_date + timedelta(days=day), dtime.min)
+                for route_id, _, _, train_id, base_price, duration in route_specs:
+                    for _ in range(trips_per_day):
+                        departure = day_start + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+                        price = round(base_price * rng.uniform(0.9, 1.2), 2)
+                        trip_specs.append((trip_id, price, departure))
+                        yield {
+                            "id": trip_id,
+                            "route_id": route_id,
+                            "train_id": train_id,
+                            "departure_time": departure,
+                            "arrival_time": departure + timedelta(minutes=duration),
+                            "base_price": price,
+                        }
+                        trip_id += 1
+
+        trip_count = _bulk_insert(db, models.Trip, trip_rows())
+
+        passenger_names = [
+            "Іван Петренко",
+            "Олена Коваль",
+            "Марія Іванченко",
+            "Андрій Шевченко",
+            "Світлана Бондар",
+            "Тарас Каюк",
+            "Оксана Литвин",
+            "Михайло Гринюк",
+        ]
+        max_lead = MAX_SALES_LEAD_DAYS * 86_400
+        now = datetime.utcnow().replace(microsecond=0)
+
+        def ticket_rows():
+            ticket_id = ticket_base
+            for trip_id, base_price, departure in trip_specs:
+                for seat in range(1, min(rng.randint(0, 2 * tickets_per_trip), train_capacity) + 1):
+                    lead = min(rng.expovariate(1 / (sales_lead_days * 86_400)), max_lead)
+                    yield {
+                        "id": ticket_id,
+                        "trip_id": trip_id,
+                        "passenger_name": rng.choice(passenger_names),
+                        "seat_number": str(seat),
+                        "price": round(base_price * rng.uniform(1.0, 1.3), 2),
+                        "status": "cancelled" if rng.random() < cancelled_share else "paid",
+                        "created_at": min(departure - timedelta(seconds=int(lead)), now),
+                    }
+                    ticket_id += 1
+
+        ticket_count = _bulk_insert(db, models.Ticket, ticket_rows())
+
+        # квитки вставлялись напряму, тож підсумки і лічильники місць рахуємо з нуля
+        # (і для наявних даних теж)
+        rollup.rebuild(db)
+        route_calendar.rebuild(db)
+        capacity.reconcile(db)
+        reference_cache.bump(db)
+        db.commit()
+    finally:
+        db.close()
+
+    migrations.analyze(engine)
+    print(
+        f"✅ Згенеровано: станцій {stations}, поїздів {trains}, маршрутів {routes}, "
+        f"рейсів {trip_count}, квитків {ticket_count}."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, help="масштаб синтетичних даних (без нього — демонстраційний набір)")
+    parser.add_argument("--seed", type=int, default=42, help="зерно генератора випадкових чисел")
+    parser.add_argument("--append", action="store_true", help="не очищати базу перед генерацією")
+    parser.add_argument("--stations", type=int)
+    parser.add_argument("--trains", type=int)
+    parser.add_argument("--routes", type=int)
+    parser.add_argument("--days", type=int, default=90, help="днів розкладу")
+    parser.add_argument("--trips-per-day", type=int, default=1, help="рейсів на маршрут щодня")
+    parser.add_argument("--tickets-per-trip", type=int, default=20, help="у середньому квитків на рейс")
+    parser.add_argument("--sales-lead-days", type=float, default=7, help="середня кількість днів від покупки до відправлення")
+    parser.add_argument("--cancelled-share", type=float, default=0.03)
+    parser.add_argument(
+        "--start-date",
+        type=date.fromisoformat,
+        help=f"перший день розкладу (YYYY-MM-DD), за замовчуванням {DEFAULT_START_DATE}",
+    )
+    args = parser.parse_args()
+
+    if args.scale is None:
+        seed()
+        return
+
+    try:
+        generate(
+            scale=args.scale,
+            seed_value=args.seed,
+            append=args.append,
+            stations=args.stations,
+            trains=args.trains,
+            routes=args.routes,
+            days=args.days,
+            trips_per_day=args.trips_per_day,
+            tickets_per_trip=args.tickets_per_trip,
+            sales_lead_days=args.sales_lead_days,
+            cancelled_share=args.cancelled_share,
+            start_date=args.start_date,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
 if __name__ == "__main__":
-    seed()
+    main()
@@ -0,0 +1,41 @@
+"""
+Швидка серіалізація JSON-відповідей для великих списків.
+
+Типовий шлях FastAPI — валідація кожного рядка через response_model, потім
+jsonable_encoder і json.dumps — для десятків тисяч рядків коштує більше за сам запит.
+Рядки з БД ми формуємо самі (лише потрібні колонки, звичайні dict), тож повторна
+валідація не потрібна: повертаємо FastJSONResponse, і FastAPI відправляє її як є.
+response_model в декораторі ендпоінта лишається — схема OpenAPI не змінюється.
+
+orjson використовується, якщо встановлений (pip install orjson); інакше — json зі
+стандартної бібліотеки з тим самим результатом (дати в ISO 8601, без пробілів).
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # необов'язкова залежність
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
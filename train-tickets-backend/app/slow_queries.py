@@ -0,0 +1,102 @@
+"""
+Журнал повільних SQL-запитів.
+
+Хук after_cursor_execute (app/database.py) для кожного запиту лише порівнює тривалість
+з порогом SLOW_QUERY_THRESHOLD_MS. Повільний запит із ймовірністю SLOW_QUERY_SAMPLE_RATE
+потрапляє до кільцевого буфера разом з параметрами, маршрутом HTTP-запиту і
+EXPLAIN QUERY PLAN, знятим на тому ж з'єднанні.
+"""
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+from app import config, metrics
+
+PLANNED_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_PARAMETERS = 50
+MAX_PARAMETER_LENGTH = 200
+
+
+def _parameter(value):
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + "…"
+
+
+def _parameters(parameters) -> list:
+    if isinstance(parameters, dict):
+        parameters = list(parameters.values())
+    values = [_parameter(v) for v in list(parameters or ())[:MAX_PARAMETERS]]
+    if parameters and len(parameters) > MAX_PARAMETERS:
+        values.append(f"… ще {len(parameters) - MAX_PARAMETERS}")
+    return values
+
+
+def _explain(conn, statement: str, parameters) -> Optional[List[str]]:
+    if not statement.lstrip().upper().startswith(PLANNED_STATEMENTS):
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            return [row[3] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as exc:  # журнал не повинен ламати сам запит
+        return [f"EXPLAIN failed: {exc}"]
+
+
+class SlowQueryLog:
+    def __init__(self, size: int):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=size)
+        self.captured = 0
+
+    def record(self, conn, statement: str, parameters, seconds: float, executemany: bool):
+        if random.random() >= config.SLOW_QUERY_SAMPLE_RATE:
+            return
+        try:
+            entry = self._entry(conn, statement, parameters, seconds, executemany)
+        except Exception:  # журнал не повинен ламати сам запит
+            return
+        with self._lock:
+            self._entries.append(entry)
+            self.captured += 1
+
+    @staticmethod
+    def _entry(conn, statement: str, parameters, seconds: float, executemany: bool) -> dict:
+        rows = None
+        # справжній executemany — послідовність наборів параметрів; "insertmanyvalues"
+        # SQLAlchemy теж позначений executemany, але параметри в нього вже плоскі
+        if executemany and parameters and isinstance(parameters[0], (list, tuple, dict)):
+            # показуємо перший набір параметрів, план не знімаємо
+            rows = len(parameters)
+            parameters, plan = parameters[0], None
+        else:
+            plan = _explain(conn, statement, parameters)
+
+        return {
+            "captured_at": datetime.utcnow().isoformat(timespec="milliseconds"),
+            "duration_ms": round(seconds * 1000, 3),
+            "route": metrics.current_route(),
+            "statement": " ".join(statement.split()),
+            "parameters": _parameters(parameters),
+            "executemany_rows": rows,
+            "plan": plan,
+        }
+
+    def entries(self) -> list:
+        # найновіші першими
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog(config.SLOW_QUERY_BUFFER_SIZE)
+SLOW_QUERY_SECONDS = config.SLOW_QUERY_THRESHOLD_MS / 1000
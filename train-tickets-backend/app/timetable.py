@@ -0,0 +1,212 @@
+"""
+Розклад рейсів у пам'яті процесу для пошуку поїздок з пересадками (connection scan).
+
+Кожен рейс — одне "з'єднання" (відправлення, прибуття, станція від, станція до),
+усі з'єднання відсортовані за часом відправлення. Пошук проходить їх один раз
+від моменту виїзду до горизонту пошуку:
+  - earliest_arrival — найраніше прибуття;
+  - min_transfers — найменше пересадок (серед них — найраніше прибуття),
+    по одному проходу на кожну кількість пересадок.
+Між рейсами на пересадці має бути щонайменше min_connection секунд.
+"""
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+EPOCH = datetime(1970, 1, 1)
+INFINITY = float("inf")
+
+
+def _seconds(value: datetime) -> int:
+    return int((value - EPOCH).total_seconds())
+
+
+class Timetable:
+    """
+    Індекс замінюється цілком (копія при запису), тож пошук працює зі знімком
+    без замка, а дочитування нових рейсів не заважає паралельним запитам.
+    """
+
+    def __init__(self):
+        self._sync_lock = threading.Lock()
+        # (відправлення, прибуття, станція від, станція до, рейс) + окремо відправлення для bisect
+        self._index = ([], [])
+        self._trips: Dict[int, dict] = {}
+        self.last_trip_id = 0
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._index[1])
+
+    # ---------- завантаження ----------
+
+    def add(self, rows: Iterable):
+        """
+        Додає рейси; рядок — (id, route_id, train_id, start_station_id, end_station_id,
+        departure_time, arrival_time, base_price).
+        """
+        new = []
+        for trip_id, route_id, train_id, start_id, end_id, departure, arrival, price in rows:
+            self._trips[trip_id] = {
+                "trip_id": trip_id,
+                "route_id": route_id,
+                "train_id": train_id,
+                "start_station_id": start_id,
+                "end_station_id": end_id,
+                "departure_time": departure,
+                "arrival_time": arrival,
+                "base_price": price,
+            }
+            new.append((_seconds(departure), _seconds(arrival), start_id, end_id, trip_id))
+            self.last_trip_id = max(self.last_trip_id, trip_id)
+        if not new:
+            return
+
+        new.sort()
+        connections = list(heapq.merge(self._index[1], new))
+        self._index = ([c[0] for c in connections], connections)
+
+    def sync(self, db: Session):
+        """
+        Дочитує рейси, створені після останнього завантаження (id > last_trip_id),
+        у тому числі створені іншими процесами.
+        """
+        with self._sync_lock:
+            stmt = (
+                select(
+                    models.Trip.id,
+                    models.Trip.route_id,
+                    models.Trip.train_id,
+                    models.Route.start_station_id,
+                    models.Route.end_station_id,
+                    models.Trip.departure_time,
+                    models.Trip.arrival_time,
+                    models.Trip.base_price,
+                )
+                .join(models.Route, models.Route.id == models.Trip.route_id)
+                .where(models.Trip.id > self.last_trip_id)
+            )
+            self.add(db.execute(stmt))
+            self.loaded = True
+
+    # ---------- пошук ----------
+
+    def _window(self, departure_after: datetime, horizon: int):
+        departures, connections = self._index
+        start_at = _seconds(departure_after)
+        first = bisect_left(departures, start_at)
+        last = bisect_right(departures, start_at + horizon)
+        return start_at, connections, first, last
+
+    def _legs(self, connections: List[tuple]) -> List[dict]:
+        return [self._trips[c[4]] for c in connections]
+
+    def earliest_arrival(
+        self,
+        origin: int,
+        target: int,
+        departure_after: datetime,
+        min_connection: int,
+        horizon: int,
+    ) -> Optional[List[dict]]:
+        start_at, connections, first, last = self._window(departure_after, horizon)
+
+        ready = {origin: start_at}  # коли найраніше можна сісти на рейс зі станції
+        arrival: Dict[int, int] = {}
+        parent: Dict[int, tuple] = {}
+        best = INFINITY
+
+        for i in range(first, last):
+            connection = connections[i]
+            departure, arrive, from_id, to_id, _ = connection
+            if departure >= best:
+                break
+            if ready.get(from_id, INFINITY) > departure or to_id == origin:
+                continue
+            if arrive < arrival.get(to_id, INFINITY):
+                arrival[to_id] = arrive
+                parent[to_id] = connection
+                ready[to_id] = arrive + min_connection
+                if to_id == target:
+                    best = arrive
+
+        if target not in parent:
+            return None
+
+        path = []
+        station = target
+        while station != origin:
+            connection = parent[station]
+            path.append(connection)
+            station = connection[2]
+        return self._legs(path[::-1])
+
+    def min_transfers(
+        self,
+        origin: int,
+        target: int,
+        departure_after: datetime,
+        min_connection: int,
+        horizon: int,
+        max_legs: int,
+    ) -> Optional[List[dict]]:
+        start_at, connections, first, last = self._window(departure_after, horizon)
+
+        ready = {origin: start_at}
+        # parents[k][станція] — з'єднання, яким станцію досягнуто за k + 1 рейсів
+        parents: List[Dict[int, tuple]] = []
+
+        for _ in range(max_legs):
+            arrival: Dict[int, int] = {}
+            parent: Dict[int, tuple] = {}
+            best = INFINITY
+
+            for i in range(first, last):
+                connection = connections[i]
+                departure, arrive, from_id, to_id, _ = connection
+                if departure >= best:
+                    break
+                if ready.get(from_id, INFINITY) > departure or to_id == origin:
+                    continue
+                if arrive < arrival.get(to_id, INFINITY):
+                    arrival[to_id] = arrive
+                    parent[to_id] = connection
+                    if to_id == target:
+                        best = arrive
+
+            parents.append(parent)
+            if target in parent:
+                return self._legs(self._trace(parents, origin, target, min_connection))
+            if not parent:
+                return None
+
+            ready = dict(ready)
+            for station, arrive in arrival.items():
+                ready[station] = min(ready.get(station, INFINITY), arrive + min_connection)
+
+        return None
+
+    @staticmethod
+    def _trace(parents: List[Dict[int, tuple]], origin: int, target: int, min_connection: int) -> List[tuple]:
+        connection = parents[-1][target]
+        path = [connection]
+        while connection[2] != origin:
+            station, departure = connection[2], connection[0]
+            # попередній рейс — з найменшою кількістю рейсів, що встигає на пересадку
+            connection = next(
+                round_parents[station]
+                for round_parents in parents
+                if station in round_parents and round_parents[station][1] + min_connection <= departure
+            )
+            path.append(connection)
+        return path[::-1]
+
+
+timetable = Timetable()
@@ -0,0 +1,350 @@
+"""
+Навантажувальний тест HTTP API з перцентилями затримки і порівнянням з базовою лінією.
+
+База з синтетичними даними заданого масштабу (app/seed_data.py --scale) створюється
+в тимчасовому каталозі. Застосунок запускається в тому ж процесі (httpx + ASGI)
+або окремим uvicorn. Сценарії:
+  - search           — пошук рейсів за парою станцій і датою;
+  - available-dates  — доступні дати напрямку;
+  - booking-storm    — багато одночасних продажів на кілька рейсів (409 — нормальна відповідь);
+  - dashboard        — запити сторінки аналітики так, як їх робить фронтенд (AnalyticsPage.jsx):
+                       /stations/, /analytics/dashboard з усіма панелями сторінки
+                       і ще одна сторінка /analytics/tickets; фільтр — останні 30 днів.
+Для кожного ендпоінта — пропускна здатність, p50/p95/p99 і кількість помилок (5xx, збої з'єднання).
+
+Запуск (з каталогу train-tickets-backend, потрібні httpx і, для --target uvicorn, uvicorn):
+    python -m benchmarks.api --scale 1 --output results.json
+    python -m benchmarks.api --scale 1 --baseline results.json --threshold 0.2
+    python -m benchmarks.api --target uvicorn --scenarios search dashboard --clients 100
+
+З --baseline кожен ендпоінт порівнюється з попереднім результатом: регресія — якщо p95
+зріс або пропускна здатність впала більш ніж на threshold. Тоді код виходу 1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from benchmarks.db_mode import _free_port, _wait_ready
+
+SCENARIOS = ("search", "available-dates", "booking-storm", "dashboard")
+# Ті самі панелі, що запитує AnalyticsPage.jsx, і розмір сторінки квитків ("Показати ще")
+DASHBOARD_PANELS = "summary,by-day,by-route,by-direction,tickets"
+DASHBOARD_TICKETS_LIMIT = 100
+# На скільки рейсів одночасно "штурмують" продаж і скільки перших місць кожного
+# (менше за місткість будь-якого поїзда демонстраційного набору)
+STORM_TRIPS = 5
+STORM_SEATS = 200
+
+
+# ---------- дані ----------
+
+def _seed(workdir: str, scale: float, seed: int):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    # 90 днів розкладу навколо сьогодні: половина рейсів уже відбулась, на решту продаємо
+    start_date = (date.today() - timedelta(days=45)).isoformat()
+    subprocess.run(
+        [
+            sys.executable, "-m", "app.seed_data",
+            "--scale", str(scale), "--seed", str(seed), "--start-date", start_date,
+        ],
+        cwd=workdir,
+        env=env,
+        check=True,
+    )
+
+
+async def _fixtures(client: httpx.AsyncClient, rng: random.Random) -> dict:
+    """
+    Пари станцій з датами рейсів і рейси для штурму продажів — із самого API.
+    """
+    routes = (await client.get("/routes/")).json()
+    pairs = {(r["start_station_id"], r["end_station_id"]) for r in routes}
+    pairs = sorted(pairs)
+    rng.shuffle(pairs)
+
+    searches = []
+    for start_id, end_id in pairs[:50]:
+        params = {"start_station_id": start_id, "end_station_id": end_id}
+        dates = (await client.get("/trips/available-dates", params=params)).json()["dates"]
+        if dates:
+            searches.append((start_id, end_id, dates))
+
+    today = date.today().isoformat()
+    upcoming = []
+    for start_id, end_id, dates in searches:
+        future = [d for d in dates if d >= today]
+        if future:
+            params = {"start_station_id": start_id, "end_station_id": end_id, "travel_date": future[0]}
+            upcoming.extend(t["id"] for t in (await client.get("/trips/", params=params)).json())
+        if len(upcoming) >= STORM_TRIPS:
+            break
+
+    return {"searches": searches, "storm_trips": upcoming[:STORM_TRIPS]}
+
+
+# ---------- сценарії ----------
+
+def _scenario_requests(name: str, fixtures: dict, rng: random.Random):
+    """
+    Один "крок" користувача: список (мітка ендпоінта, метод, шлях, параметри, тіло).
+    """
+    if name == "search":
+        start_id, end_id, dates = rng.choice(fixtures["searches"])
+        params = {"start_station_id": start_id, "end_station_id": end_id, "travel_date": rng.choice(dates)}
+        return [("GET /trips/", "GET", "/trips/", params, None)]
+
+    if name == "available-dates":
+        start_id, end_id, _ = rng.choice(fixtures["searches"])
+        params = {"start_station_id": start_id, "end_station_id": end_id}
+        return [("GET /trips/available-dates", "GET", "/trips/available-dates", params, None)]
+
+    if name == "booking-storm":
+        body = {
+            "trip_id": rng.choice(fixtures["storm_trips"]),
+            "passenger_name": "Benchmark",
+            "seat_number": str(rng.randint(1, STORM_SEATS)),
+            "price": 100,
+        }
+        return [("POST /tickets/", "POST", "/tickets/", None, body)]
+
+    if name == "dashboard":
+        filters = {"date_from": (date.today() - timedelta(days=30)).isoformat(), "date_to": date.today().isoformat()}
+        return [
+            ("GET /stations/", "GET", "/stations/", None, None),
+            ("GET /analytics/dashboard", "GET", "/analytics/dashboard", dict(filters, panels=DASHBOARD_PANELS), None),
+            (
+                "GET /analytics/tickets",
+                "GET",
+                "/analytics/tickets",
+                dict(filters, limit=DASHBOARD_TICKETS_LIMIT),
+                None,
+            ),
+        ]
+
+    raise ValueError(f"unknown scenario: {name}")
+
+
+async def _run_scenario(client, name: str, fixtures: dict, clients: int, duration: float, seed: int):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    statuses = defaultdict(lambda: defaultdict(int))
+    stop_at = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed * 100_003 + worker_id)
+        while time.perf_counter() < stop_at:
+            for label, method, path, params, body in _scenario_requests(name, fixtures, rng):
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, params=params, json=body)
+                    ok = response.status_code < 500
+                    statuses[label][response.status_code] += 1
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[label].append(time.perf_counter() - started)
+                else:
+                    errors[label] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        label: _summarize(latencies[label], errors[label], elapsed, statuses[label])
+        for label in sorted(set(latencies) | set(errors))
+    }
+
+
+def _percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else 0.0
+
+
+def _summarize(latencies, errors: int, elapsed: float, statuses) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def _run_all(client, scenarios, clients: int, duration: float, seed: int) -> dict:
+    fixtures = await _fixtures(client, random.Random(seed))
+    if not fixtures["searches"]:
+        raise RuntimeError("database has no trips to search")
+
+    endpoints = {}
+    for name in scenarios:
+        if name == "booking-storm" and not fixtures["storm_trips"]:
+            print("⚠ booking-storm пропущено: немає майбутніх рейсів")
+            continue
+        endpoints.update(await _run_scenario(client, name, fixtures, clients, duration, seed))
+    return endpoints
+
+
+# ---------- цілі ----------
+
+def _run_in_process(workdir: str, scenarios, clients: int, duration: float, seed: int) -> dict:
+    # шлях до бази читається під час імпорту app.config, тому імпортуємо застосунок лише тут
+    os.environ["DATABASE_PATH"] = os.path.join(workdir, "train_tickets.db")
+    from app.main import app, on_startup
+
+    on_startup()
+
+    async def run():
+        limits = httpx.Limits(max_connections=clients)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=60) as client:
+            return await _run_all(client, scenarios, clients, duration, seed)
+
+    return asyncio.run(run())
+
+
+def _run_uvicorn(workdir: str, scenarios, clients: int, duration: float, seed: int, workers: int) -> dict:
+    port = _free_port()
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=workdir,
+        env=env,
+    )
+
+    async def run():
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await _wait_ready(client)
+            return await _run_all(client, scenarios, clients, duration, seed)
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.terminate()
+        server.wait()
+
+
+# ---------- звіт ----------
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Повертає список (ендпоінт, метрика, базове значення, поточне значення) для регресій.
+    """
+    regressions = []
+    for label, result in current["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(label)
+        if not base:
+            continue
+        if base["p95_ms"] and result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append((label, "p95_ms", base["p95_ms"], result["p95_ms"]))
+        if base["rps"] and result["rps"] < base["rps"] * (1 - threshold):
+            regressions.append((label, "rps", base["rps"], result["rps"]))
+    return regressions
+
+
+def _print_table(result: dict, baseline: dict = None):
+    print(f"{'ендпоінт':<32}{'запитів/с':>11}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}{'помилок':>9}{'Δ p95':>9}")
+    for label, r in result["endpoints"].items():
+        delta = ""
+        base = (baseline or {}).get("endpoints", {}).get(label)
+        if base and base["p95_ms"]:
+            delta = f"{(r['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{label:<32}{r['rps']:>11.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['p99_ms']:>10.1f}{r['errors']:>9}{delta:>9}"
+        )
+
+
+def run(args) -> int:
+    workdir = tempfile.mkdtemp()
+    try:
+        if args.db:
+            shutil.copy(args.db, os.path.join(workdir, "train_tickets.db"))
+        else:
+            _seed(workdir, args.scale, args.seed)
+
+        if args.target == "uvicorn":
+            endpoints = _run_uvicorn(workdir, args.scenarios, args.clients, args.duration, args.seed, args.workers)
+        else:
+            endpoints = _run_in_process(workdir, args.scenarios, args.clients, args.duration, args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "target": args.target,
+            "workers": args.workers if args.target == "uvicorn" else 1,
+            "scale": None if args.db else args.scale,
+            "db": args.db,
+            "seed": args.seed,
+            "clients": args.clients,
+            "duration": args.duration,
+            "scenarios": list(args.scenarios),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "endpoints": endpoints,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    _print_table(result, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"Результати збережено в {args.output}")
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(result, baseline, args.threshold)
+    for label, metric, before, after in regressions:
+        print(f"❌ {label}: {metric} {before:.1f} -> {after:.1f}")
+    if regressions:
+        return 1
+    print(f"✅ Регресій понад {args.threshold:.0%} немає.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="воркерів uvicorn (для --target uvicorn)")
+    parser.add_argument("--scale", type=float, default=1, help="масштаб даних app.seed_data")
+    parser.add_argument("--db", help="використати копію наявної бази замість генерації")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--clients", type=int, default=20, help="одночасних клієнтів")
+    parser.add_argument("--duration", type=float, default=10, help="секунд на сценарій")
+    parser.add_argument("--output", help="файл для результатів у JSON")
+    parser.add_argument("--baseline", help="JSON з попереднього запуску для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустиме погіршення (0.2 = 20%%)")
+    args = parser.parse_args()
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
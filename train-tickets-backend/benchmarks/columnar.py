@@ -0,0 +1,74 @@
+"""
+Затримка колонкового рушія аналітики (app/columnar.py) на синтетичних даних.
+
+Запуск (з каталогу train-tickets-backend):
+    python -m benchmarks.columnar
+    python -m benchmarks.columnar --sizes 1000000 10000000 --repeat 5
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.columnar import SECONDS_PER_DAY, TicketColumns, _day_number
+
+STATIONS = 50
+ROUTES = 400
+DAYS = 365
+TRIPS = 20_000
+
+
+def build_columns(size: int, seed: int = 42) -> TicketColumns:
+    rng = np.random.default_rng(seed)
+    route_start = rng.integers(1, STATIONS + 1, ROUTES + 1)
+    route_end = rng.integers(1, STATIONS + 1, ROUTES + 1)
+    first_day = _day_number(date.today() - timedelta(days=DAYS))
+
+    route_id = rng.integers(1, ROUTES + 1, size).astype(np.int32)
+    columns = TicketColumns()
+    columns.extend(
+        ticket_id=np.arange(1, size + 1, dtype=np.int64),
+        created_at=(first_day * SECONDS_PER_DAY + rng.integers(0, DAYS * SECONDS_PER_DAY, size)).astype(np.int64),
+        price=rng.uniform(300, 1500, size).round(2),
+        route_id=route_id,
+        start_station_id=route_start[route_id].astype(np.int32),
+        end_station_id=route_end[route_id].astype(np.int32),
+        trip_id=rng.integers(1, TRIPS + 1, size).astype(np.int32),
+        status=np.zeros(size, dtype=np.int8),
+    )
+    return columns
+
+
+def run(sizes, repeat: int):
+    today = date.today()
+    scenarios = {
+        "no filters": (None, None, None, None),
+        "last 7 days": (today - timedelta(days=7), today, None, None),
+        "station + 30 days": (today - timedelta(days=30), today, 1, None),
+    }
+    methods = ("summary", "by_day", "by_route", "by_direction", "top_routes")
+
+    for size in sizes:
+        started = time.perf_counter()
+        columns = build_columns(size)
+        print(f"\n{size:,} квитків (генерація {time.perf_counter() - started:.1f} с)")
+        print(f"{'сценарій':<20}" + "".join(f"{m:>14}" for m in methods))
+        for name, filters in scenarios.items():
+            timings = []
+            for method in methods:
+                best = float("inf")
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    getattr(columns, method)(*filters)
+                    best = min(best, time.perf_counter() - started)
+                timings.append(best * 1000)
+            print(f"{name:<20}" + "".join(f"{ms:>11.1f} ms" for ms in timings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
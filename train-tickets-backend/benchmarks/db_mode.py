@@ -0,0 +1,170 @@
+"""
+Порівняння DB_MODE=sync і DB_MODE=async під великою кількістю одночасних клієнтів.
+
+Для кожного режиму піднімається uvicorn (один воркер) на тимчасовій копії бази
+з тестовими даними, і N клієнтів одночасно виконують пошук рейсів, аналітику
+та продаж квитків. Потрібні httpx і uvicorn.
+
+Запуск (з каталогу train-tickets-backend):
+    python -m benchmarks.db_mode
+    python -m benchmarks.db_mode --clients 500 --duration 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+READ_PATHS = (
+    "/trips/?start_station_id={start}&end_station_id={end}",
+    "/trips/available-dates?start_station_id={start}&end_station_id={end}",
+    "/analytics/summary",
+    "/analytics/dashboard?panels=summary,by-day,by-route",
+)
+WRITE_SHARE = 0.1
+# На скількох рейсах продаються місця (кожне вільне місце — один раз)
+LOAD_TRIPS = 200
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(mode: str, workdir: str, port: int):
+    env = dict(os.environ, DB_MODE=mode, PYTHONPATH=os.getcwd())
+    subprocess.run(
+        [sys.executable, "-c", "from app.main import on_startup; on_startup(); from app.seed_data import seed; seed()"],
+        cwd=workdir,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient):
+    for _ in range(100):
+        try:
+            await client.get("/health")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def _free_seats(client: httpx.AsyncClient, trip_ids) -> list:
+    """
+    Вільні місця (trip_id, місце) до LOAD_TRIPS випадкових рейсів у випадковому порядку.
+    """
+    async def free(trip_id):
+        seats = (await client.get(f"/trips/{trip_id}/seats")).json()
+        occupied = set(seats["occupied"])
+        return [(trip_id, str(n)) for n in range(1, seats["capacity"] + 1) if str(n) not in occupied]
+
+    trip_ids = random.sample(trip_ids, min(len(trip_ids), LOAD_TRIPS))
+    seats = [seat for trip in await asyncio.gather(*(free(t) for t in trip_ids)) for seat in trip]
+    random.shuffle(seats)
+    return seats
+
+
+async def _run_load(base_url: str, clients: int, duration: float):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await _wait_ready(client)
+        routes = (await client.get("/routes/")).json()
+        # на рейси, що вже відправились, квитки не продаються
+        now = datetime.now().isoformat()
+        trips = [t["id"] for t in (await client.get("/trips/")).json() if t["departure_time"] > now]
+        free_seats = await _free_seats(client, trips)
+
+        latencies = []
+        errors = 0
+        stop_at = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < stop_at:
+                route = random.choice(routes)
+                started = time.perf_counter()
+                try:
+                    if free_seats and random.random() < WRITE_SHARE:
+                        trip_id, seat_number = free_seats.pop()
+                        response = await client.post(
+                            "/tickets/",
+                            json={
+                                "trip_id": trip_id,
+                                "passenger_name": "Benchmark",
+                                "seat_number": seat_number,
+                                "price": 100,
+                            },
+                        )
+                    else:
+                        path = random.choice(READ_PATHS).format(
+                            start=route["start_station_id"], end=route["end_station_id"]
+                        )
+                        response = await client.get(path)
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+    }
+
+
+def run(modes, clients: int, duration: float):
+    print(f"{clients} одночасних клієнтів, {duration:.0f} с на режим, {WRITE_SHARE:.0%} запитів — продаж")
+    print(f"{'режим':<8}{'запитів/с':>12}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}{'помилок':>10}")
+    for mode in modes:
+        workdir = tempfile.mkdtemp()
+        port = _free_port()
+        server = _start_server(mode, workdir, port)
+        try:
+            result = asyncio.run(_run_load(f"http://127.0.0.1:{port}", clients, duration))
+        finally:
+            server.terminate()
+            server.wait()
+            shutil.rmtree(workdir, ignore_errors=True)
+        print(
+            f"{mode:<8}{result['rps']:>12.0f}{result['p50']:>10.0f}{result['p95']:>10.0f}"
+            f"{result['p99']:>10.0f}{result['errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+    run(args.modes, args.clients, args.duration)
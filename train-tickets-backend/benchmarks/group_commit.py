@@ -0,0 +1,159 @@
+"""
+Продажі за секунду: TICKET_WRITE_MODE=direct (commit на кожен продаж)
+проти TICKET_WRITE_MODE=group (групова фіксація, app/group_commit.py).
+
+Для кожного режиму піднімається uvicorn (один воркер) на тимчасовій базі
+з синтетичними рейсами, і N клієнтів одночасно купують квитки (POST /tickets/).
+Частка --conflict-share запитів купує вже продане місце і має отримати 409 —
+так видно, що конфлікти в обох режимах однакові. Після прогону кількість
+квитків у БД звіряється з кількістю успішних відповідей. Потрібні httpx і uvicorn.
+
+З SQLITE_SYNCHRONOUS=FULL кожен commit чекає fsync, і різниця між режимами
+найбільша; з NORMAL (за замовчуванням у WAL) commit дешевший.
+
+Запуск (з каталогу train-tickets-backend):
+    python -m benchmarks.group_commit
+    python -m benchmarks.group_commit --clients 200 --synchronous FULL
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from benchmarks.db_mode import _free_port, _free_seats, _wait_ready
+
+
+def _start_server(mode: str, synchronous: str, workdir: str, port: int):
+    env = dict(os.environ, TICKET_WRITE_MODE=mode, SQLITE_SYNCHRONOUS=synchronous, PYTHONPATH=os.getcwd())
+    # 30 днів розкладу навколо сьогодні
+    start_date = (date.today() - timedelta(days=15)).isoformat()
+    subprocess.run(
+        [
+            sys.executable, "-m", "app.seed_data",
+            "--scale", "0.1", "--days", "30", "--tickets-per-trip", "2", "--start-date", start_date,
+        ],
+        cwd=workdir,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+    )
+
+
+async def _run_load(base_url: str, clients: int, duration: float, conflict_share: float):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await _wait_ready(client)
+        # на рейси, що вже відправились, квитки не продаються
+        now = datetime.now().isoformat()
+        trips = [t["id"] for t in (await client.get("/trips/")).json() if t["departure_time"] > now]
+        free_seats = await _free_seats(client, trips)
+        sold = []
+
+        latencies = []
+        statuses = {"sold": 0, "conflicts": 0, "errors": 0}
+        stop_at = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < stop_at:
+                if sold and random.random() < conflict_share:
+                    trip_id, seat_number = random.choice(sold)
+                elif free_seats:
+                    trip_id, seat_number = free_seats.pop()
+                else:
+                    break  # вільні місця вибраних рейсів скінчились
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        "/tickets/",
+                        json={
+                            "trip_id": trip_id,
+                            "passenger_name": "Benchmark",
+                            "seat_number": seat_number,
+                            "price": 100,
+                        },
+                    )
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = None
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+                    sold.append((trip_id, seat_number))
+                    statuses["sold"] += 1
+                elif status == 409:
+                    statuses["conflicts"] += 1
+                else:
+                    statuses["errors"] += 1
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return dict(
+        statuses,
+        sales=statuses["sold"] / duration,
+        p50=percentile(0.50),
+        p95=percentile(0.95),
+        p99=percentile(0.99),
+    )
+
+
+def _benchmark_tickets(workdir: str) -> int:
+    with sqlite3.connect(os.path.join(workdir, "train_tickets.db")) as connection:
+        return connection.execute("SELECT COUNT(*) FROM tickets WHERE passenger_name = 'Benchmark'").fetchone()[0]
+
+
+def run(modes, clients: int, duration: float, conflict_share: float, synchronous: str):
+    print(
+        f"{clients} одночасних клієнтів, {duration:.0f} с на режим, "
+        f"{conflict_share:.0%} запитів — на вже продане місце, synchronous={synchronous}"
+    )
+    print(
+        f"{'режим':<8}{'продажів/с':>12}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}"
+        f"{'409':>8}{'помилок':>10}{'у БД':>8}"
+    )
+    for mode in modes:
+        workdir = tempfile.mkdtemp()
+        port = _free_port()
+        server = _start_server(mode, synchronous, workdir, port)
+        try:
+            result = asyncio.run(_run_load(f"http://127.0.0.1:{port}", clients, duration, conflict_share))
+        finally:
+            server.terminate()
+            server.wait()
+        try:
+            stored = _benchmark_tickets(workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        mismatch = "" if stored == result["sold"] else "  ❌ не збігається з успішними продажами"
+        print(
+            f"{mode:<8}{result['sales']:>12.0f}{result['p50']:>10.0f}{result['p95']:>10.0f}"
+            f"{result['p99']:>10.0f}{result['conflicts']:>8}{result['errors']:>10}{stored:>8}{mismatch}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["direct", "group"])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--conflict-share", type=float, default=0.05)
+    parser.add_argument("--synchronous", default=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"))
+    args = parser.parse_args()
+    run(args.modes, args.clients, args.duration, args.conflict_share, args.synchronous)
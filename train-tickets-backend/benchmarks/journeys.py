@@ -0,0 +1,80 @@
+"""
+Швидкодія пошуку поїздок з пересадками (app/timetable.py) на синтетичному розкладі.
+
+Генерується N рейсів між випадковими станціями, рівномірно за вказану кількість днів,
+і вимірюється час відповіді earliest_arrival та min_transfers для випадкових пар станцій.
+База не потрібна — розклад наповнюється напряму.
+
+Запуск (з каталогу train-tickets-backend):
+    python -m benchmarks.journeys
+    python -m benchmarks.journeys --trips 100000 --stations 200 --days 30
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app import config
+from app.timetable import Timetable
+
+
+def _synthetic_trips(count: int, stations: int, days: int, rng: random.Random):
+    start = datetime(2025, 1, 1)
+    span = days * 24 * 60
+    for trip_id in range(1, count + 1):
+        from_id, to_id = rng.sample(range(1, stations + 1), 2)
+        departure = start + timedelta(minutes=rng.randrange(span))
+        arrival = departure + timedelta(minutes=rng.randrange(60, 12 * 60))
+        yield (trip_id, trip_id, 1, from_id, to_id, departure, arrival, float(rng.randrange(200, 1500)))
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def run(trips: int, stations: int, days: int, queries: int, seed: int):
+    rng = random.Random(seed)
+    timetable = Timetable()
+
+    started = time.perf_counter()
+    timetable.add(_synthetic_trips(trips, stations, days, rng))
+    print(f"{len(timetable)} рейсів, {stations} станцій, {days} днів; завантаження {time.perf_counter() - started:.2f} с")
+
+    min_connection = config.JOURNEY_MIN_CONNECTION_MINUTES * 60
+    horizon = config.JOURNEY_HORIZON_HOURS * 3600
+    searches = {
+        "earliest": lambda *q: timetable.earliest_arrival(*q, min_connection, horizon),
+        "transfers": lambda *q: timetable.min_transfers(*q, min_connection, horizon, config.JOURNEY_MAX_LEGS),
+    }
+
+    # однакові запити для обох видів пошуку
+    requests = [
+        (*rng.sample(range(1, stations + 1), 2), datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(days * 24 * 60)))
+        for _ in range(queries)
+    ]
+
+    print(f"{'пошук':<12}{'знайдено':>10}{'p50, мс':>10}{'p95, мс':>10}{'max, мс':>10}")
+    for name, search in searches.items():
+        timings = []
+        found = 0
+        for origin, target, departure_after in requests:
+            started = time.perf_counter()
+            legs = search(origin, target, departure_after)
+            timings.append(time.perf_counter() - started)
+            found += legs is not None
+        print(
+            f"{name:<12}{found:>10}{_percentile(timings, 0.5):>10.2f}"
+            f"{_percentile(timings, 0.95):>10.2f}{max(timings) * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, default=100_000)
+    parser.add_argument("--stations", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.trips, args.stations, args.days, args.queries, args.seed)
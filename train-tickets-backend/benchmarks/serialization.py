@@ -0,0 +1,104 @@
+"""
+Мікробенчмарк серіалізації великих списків (app/serialization.py).
+
+У базі в пам'яті створюється N рейсів, і той самий список віддається кількома способами
+через окремий FastAPI-застосунок (повний шлях запиту, без мережі):
+  - orm+response_model — ORM-об'єкти, валідація List[schemas.Trip], стандартний JSON;
+  - dicts+default      — колонки як dict, але через jsonable_encoder і json.dumps;
+  - dicts+fast         — колонки як dict і FastJSONResponse (так працює GET /trips/).
+
+Запуск (з каталогу train-tickets-backend):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 100000 --repeat 5
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models, schemas, serialization
+from app.database import Base
+from app.serialization import FastJSONResponse
+
+
+def _database(rows: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2025, 1, 1, 6, 0)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Station.__table__), [{"id": 1, "name": "A", "code": "A"}, {"id": 2, "name": "B", "code": "B"}])
+        conn.execute(insert(models.Train.__table__), [{"id": 1, "number": "001", "name": "Bench"}])
+        conn.execute(insert(models.Route.__table__), [{"id": 1, "start_station_id": 1, "end_station_id": 2}])
+        conn.execute(
+            insert(models.Trip.__table__),
+            [
+                {
+                    "id": i,
+                    "route_id": 1,
+                    "train_id": 1,
+                    "departure_time": start + timedelta(minutes=i),
+                    "arrival_time": start + timedelta(minutes=i + 300),
+                    "base_price": 500.0 + i % 100,
+                }
+                for i in range(1, rows + 1)
+            ],
+        )
+    return sessionmaker(bind=engine)
+
+
+def _app(session_factory) -> FastAPI:
+    app = FastAPI()
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def trip_rows(db: Session):
+        return [row._asdict() for row in db.query(*models.Trip.__table__.c)]
+
+    @app.get("/orm", response_model=List[schemas.Trip])
+    def orm(db: Session = Depends(get_db)):
+        return db.query(models.Trip).all()
+
+    @app.get("/dicts")
+    def dicts(db: Session = Depends(get_db)):
+        return trip_rows(db)
+
+    @app.get("/fast", response_model=List[schemas.Trip])
+    def fast(db: Session = Depends(get_db)):
+        return FastJSONResponse(trip_rows(db))
+
+    return app
+
+
+def run(rows: int, repeat: int):
+    print(f"{rows} рядків, найкращий з {repeat} запусків; JSON: {'orjson' if serialization.orjson else 'json'}")
+    client = TestClient(_app(_database(rows)))
+
+    print(f"{'шлях':<22}{'мс':>10}{'байт':>12}")
+    for name, path in (("orm+response_model", "/orm"), ("dicts+default", "/dicts"), ("dicts+fast", "/fast")):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = client.get(path)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        assert len(response.json()) == rows
+        print(f"{name:<22}{best * 1000:>10.0f}{len(response.content):>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
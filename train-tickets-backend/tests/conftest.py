@@ -0,0 +1,62 @@
+"""
+Тести працюють на тимчасовій базі з демонстраційним набором (app.seed_data.seed).
+
+Запуск (з каталогу train-tickets-backend):
+    python -m pytest
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# app.config читає шляхи до баз під час імпорту, тож оточення — до імпорту app
+_workdir = tempfile.mkdtemp(prefix="train-tickets-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(_workdir, "train_tickets.db")
+os.environ["ARCHIVE_DATABASE_PATH"] = os.path.join(_workdir, "train_tickets_archive.db")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app, on_startup
+from app.seed_data import seed
+
+
+@pytest.fixture(scope="session")
+def client():
+    # база наповнюється один раз: кеші процесу (seat_map, утримання) переживають
+    # очищення таблиць, а SQLite після нього видає ті самі id заново
+    on_startup()
+    seed()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_trip(client):
+    """
+    Створює новий рейс на першому маршруті й першому поїзді демонстраційного набору,
+    за замовчуванням через тиждень (від'ємне days — рейс, що вже відправився).
+    """
+    route = client.get("/routes/").json()[0]
+    train = client.get("/trains/").json()[0]
+
+    def make(days: float = 7):
+        departure = datetime.now().replace(microsecond=0) + timedelta(days=days)
+        response = client.post(
+            "/trips/",
+            json={
+                "route_id": route["id"],
+                "train_id": train["id"],
+                "departure_time": departure.isoformat(),
+                "arrival_time": (departure + timedelta(hours=8)).isoformat(),
+                "base_price": 500,
+            },
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    return make
+
+
+@pytest.fixture
+def trip(make_trip):
+    return make_trip()
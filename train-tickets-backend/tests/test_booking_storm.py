@@ -0,0 +1,65 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app import models
+from app.database import SessionLocal
+from app.routers import tickets
+from app.seat_map import seat_map
+
+BUYERS = 50
+
+
+def _storm(client, trip_id: int, seat_number: str) -> Counter:
+    def buy(i):
+        return client.post(
+            "/tickets/",
+            json={"trip_id": trip_id, "passenger_name": f"Покупець {i}", "seat_number": seat_number, "price": 500},
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=BUYERS) as pool:
+        return Counter(pool.map(buy, range(BUYERS)))
+
+
+def _paid_tickets(trip_id: int, seat_number: str) -> int:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(models.Ticket)
+            .filter(
+                models.Ticket.trip_id == trip_id,
+                models.Ticket.seat_number == seat_number,
+                models.Ticket.status == "paid",
+            )
+            .count()
+        )
+    finally:
+        db.close()
+
+
+def test_one_seat_is_sold_once(client, trip):
+    statuses = _storm(client, trip["id"], "1")
+
+    assert statuses == {200: 1, 409: BUYERS - 1}
+    assert _paid_tickets(trip["id"], "1") == 1
+
+
+def test_database_rejects_double_booking_without_seat_cache(client, trip, monkeypatch):
+    # без карти місць у пам'яті всі покупці доходять до INSERT,
+    # і подвійний продаж має зупинити унікальний індекс
+    monkeypatch.setattr(seat_map, "is_taken", lambda db, trip_id, seat_number: False)
+    monkeypatch.setattr(seat_map, "is_known_taken", lambda trip_id, seat_number: False)
+    monkeypatch.setattr(seat_map, "mark_taken", lambda trip_id, seat_numbers: None)
+    conflicts = Counter()
+    sale_conflict = tickets._sale_conflict
+
+    def count_conflict(exc, requested):
+        conflicts[requested[0]] += 1
+        return sale_conflict(exc, requested)
+
+    monkeypatch.setattr(tickets, "_sale_conflict", count_conflict)
+
+    statuses = _storm(client, trip["id"], "2")
+
+    assert statuses == {200: 1, 409: BUYERS - 1}
+    assert conflicts == {(trip["id"], "2"): BUYERS - 1}
+    assert _paid_tickets(trip["id"], "2") == 1
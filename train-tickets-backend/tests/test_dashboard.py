@@ -0,0 +1,23 @@
+from app.analytics_cache import analytics_cache
+
+
+def test_tickets_panel_is_first_keyset_page(client):
+    dashboard = client.get("/analytics/dashboard?tickets_limit=5").json()
+    everything = client.get("/analytics/tickets").json()
+
+    page = dashboard["tickets"]
+    items = list(page["items"])
+    while page["next_cursor"]:
+        page = client.get("/analytics/tickets", params={"cursor": page["next_cursor"], "limit": 5}).json()
+        items += page["items"]
+
+    assert len(dashboard["tickets"]["items"]) == 5
+    assert items == everything
+
+
+def test_tickets_are_not_cached(client):
+    analytics_cache.clear()
+    client.get("/analytics/dashboard")
+
+    cached = [value for _, _, value in analytics_cache._entries.values()]
+    assert cached and all("tickets" not in value for value in cached)
@@ -0,0 +1,17 @@
+def _ticket(trip_id: int, seat_number: str) -> dict:
+    return {"trip_id": trip_id, "passenger_name": "Пасажир", "seat_number": seat_number, "price": 500}
+
+
+def test_departed_trip_is_not_sold(client, make_trip):
+    trip = make_trip(days=-1)
+
+    single = client.post("/tickets/", json=_ticket(trip["id"], "1"))
+    batch = client.post("/tickets/batch", json=[_ticket(trip["id"], "2"), _ticket(trip["id"], "3")])
+    hold = client.post(f"/trips/{trip['id']}/holds", json={"seat_numbers": ["4"]})
+
+    for response in (single, batch, hold):
+        assert response.status_code == 409
+        assert response.json()["detail"] == f"Trip {trip['id']} has already departed"
+    seats = client.get(f"/trips/{trip['id']}/seats").json()
+    assert seats["occupied"] == []
+    assert seats["seats_remaining"] == seats["capacity"]
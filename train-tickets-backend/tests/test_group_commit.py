@@ -0,0 +1,97 @@
+"""
+Продажі в режимі TICKET_WRITE_MODE=group (app/group_commit.py): ті самі відповіді,
+що й у звичайному режимі, і кожен викликач отримує результат саме свого продажу.
+"""
+import asyncio
+import contextlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+
+from app import config, database, group_commit
+from tests.test_booking_storm import BUYERS, _paid_tickets, _storm
+
+
+@pytest.fixture
+def group_mode(monkeypatch):
+    monkeypatch.setattr(config, "TICKET_WRITE_MODE", "group")
+    yield
+    group_commit.writer.stop()
+
+
+def test_one_seat_is_sold_once(client, trip, group_mode):
+    statuses = _storm(client, trip["id"], "1")
+
+    assert statuses == {200: 1, 409: BUYERS - 1}
+    assert _paid_tickets(trip["id"], "1") == 1
+    assert group_commit.writer.batches > 0
+
+
+def test_batch_with_seat_conflict(client, trip, group_mode):
+    # кожна група купує своє місце і спільне "5" — пройти може лише одна
+    def buy(i):
+        return client.post(
+            "/tickets/batch",
+            json=[
+                {"trip_id": trip["id"], "passenger_name": f"Покупець {i}", "seat_number": seat, "price": 500}
+                for seat in (str(10 + i), "5")
+            ],
+        )
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(buy, range(20)))
+
+    statuses = Counter(r.status_code for r in responses)
+    assert statuses == {200: 1, 409: 19}
+    assert all("5" in r.json()["detail"] for r in responses if r.status_code == 409)
+    (sold,) = [r.json() for r in responses if r.status_code == 200]
+    stored = sum(_paid_tickets(trip["id"], t["seat_number"]) for t in sold)
+    assert stored == len(sold) == 2
+    assert _paid_tickets(trip["id"], "5") == 1
+
+
+class _BrokenSession:
+    """
+    Сесія, у якої не вдається ні commit, ні навіть rollback.
+    """
+
+    def begin_nested(self):
+        return contextlib.nullcontext()
+
+    def commit(self):
+        raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+    def rollback(self):
+        raise RuntimeError("rollback failed")
+
+    def close(self):
+        pass
+
+
+def test_failed_commit_keeps_own_errors(monkeypatch):
+    monkeypatch.setattr(database, "GroupSessionLocal", _BrokenSession)
+    writer = group_commit.GroupCommitWriter(max_batch=2, max_wait=1.0)
+
+    def conflict(db):
+        raise HTTPException(status_code=409, detail="Seat already booked for this trip")
+
+    def sold(db):
+        return ["ticket"]
+
+    async def sell(*sells):
+        results = asyncio.gather(*(writer.submit(s) for s in sells), return_exceptions=True)
+        return await asyncio.wait_for(results, timeout=5)
+
+    try:
+        own, failed = asyncio.run(sell(conflict, sold))
+        # потік запису пережив помилку rollback і відповідає далі
+        (again,) = asyncio.run(sell(sold))
+    finally:
+        writer.stop()
+
+    assert isinstance(own, HTTPException) and own.status_code == 409
+    assert isinstance(failed, OperationalError)
+    assert isinstance(again, OperationalError)
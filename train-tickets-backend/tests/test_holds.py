@@ -0,0 +1,79 @@
+"""
+Утримання місць до оплати (app/holds.py, app/routers/holds.py).
+"""
+import time
+from types import SimpleNamespace
+
+from app import config, holds, models
+from app.database import SessionLocal
+from tests.test_booking_storm import _paid_tickets
+
+
+def _ticket(trip_id: int, seat_number: str) -> dict:
+    return {"trip_id": trip_id, "passenger_name": "Пасажир", "seat_number": seat_number, "price": 500}
+
+
+def _hold(client, trip_id: int, *seats: str):
+    return client.post(f"/trips/{trip_id}/holds", json={"seat_numbers": list(seats)})
+
+
+def _set_seats_remaining(trip_id: int, value: int):
+    db = SessionLocal()
+    try:
+        db.query(models.Trip).filter(models.Trip.id == trip_id).update({"seats_remaining": value})
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_held_seat_is_not_sold_until_released(client, trip):
+    hold = _hold(client, trip["id"], "1").json()
+
+    single = client.post("/tickets/", json=_ticket(trip["id"], "1"))
+    batch = client.post("/tickets/batch", json=[_ticket(trip["id"], "2"), _ticket(trip["id"], "1")])
+    assert single.status_code == batch.status_code == 409
+    assert client.get(f"/trips/{trip['id']}/seats").json()["held"] == ["1"]
+
+    assert client.delete(f"/trips/{trip['id']}/holds/{hold['hold_id']}").status_code == 200
+    assert client.get(f"/trips/{trip['id']}/seats").json()["held"] == []
+    assert client.post("/tickets/", json=_ticket(trip["id"], "1")).status_code == 200
+
+
+def test_held_seats_are_not_counted_as_free(client, trip):
+    # на рейсі лишилось два місця (решту, скажімо, продав інший воркер)
+    _set_seats_remaining(trip["id"], 2)
+    hold = _hold(client, trip["id"], "1").json()
+
+    assert _hold(client, trip["id"], "2", "3").status_code == 409
+    assert client.post("/tickets/", json=_ticket(trip["id"], "2")).status_code == 200
+    # останнє вільне місце утримане — продати інше вже не можна
+    assert client.post("/tickets/", json=_ticket(trip["id"], "3")).status_code == 409
+
+    client.delete(f"/trips/{trip['id']}/holds/{hold['hold_id']}")
+    assert client.post("/tickets/", json=_ticket(trip["id"], "3")).status_code == 200
+
+
+def test_confirm_turns_hold_into_tickets(client, trip):
+    hold = _hold(client, trip["id"], "1", "2").json()
+    confirm = f"/trips/{trip['id']}/holds/{hold['hold_id']}/confirm"
+    body = [
+        {"passenger_name": "Пасажир", "seat_number": seat, "price": 500} for seat in ("2", "1")
+    ]
+
+    response = client.post(confirm, json=body)
+
+    assert response.status_code == 200
+    assert sorted(t["seat_number"] for t in response.json()) == ["1", "2"]
+    assert _paid_tickets(trip["id"], "1") == _paid_tickets(trip["id"], "2") == 1
+    assert client.post(confirm, json=body).status_code == 404
+    assert client.get(f"/trips/{trip['id']}/holds/{hold['hold_id']}").status_code == 404
+
+
+def test_hold_expires(client, trip, monkeypatch):
+    hold = _hold(client, trip["id"], "1").json()
+
+    later = time.monotonic() + config.HOLD_TTL_SECONDS + 1
+    monkeypatch.setattr(holds, "time", SimpleNamespace(monotonic=lambda: later))
+
+    assert client.get(f"/trips/{trip['id']}/holds/{hold['hold_id']}").status_code == 404
+    assert client.post("/tickets/", json=_ticket(trip["id"], "1")).status_code == 200
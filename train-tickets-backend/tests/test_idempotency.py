@@ -0,0 +1,92 @@
+"""
+Idempotency-Key на POST /tickets/ (app/idempotency.py).
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.routers import tickets
+from tests.test_booking_storm import _paid_tickets
+
+
+def _buy(client, trip_id: int, seat_number: str, key: str, name: str = "Пасажир"):
+    return client.post(
+        "/tickets/",
+        json={"trip_id": trip_id, "passenger_name": name, "seat_number": seat_number, "price": 500},
+        headers={"Idempotency-Key": key},
+    )
+
+
+def test_replay_returns_first_response(client, trip):
+    first = _buy(client, trip["id"], "1", f"replay-{trip['id']}")
+    again = _buy(client, trip["id"], "1", f"replay-{trip['id']}")
+
+    assert first.status_code == again.status_code == 200
+    assert again.content == first.content
+    assert "Idempotent-Replayed" not in first.headers
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert _paid_tickets(trip["id"], "1") == 1
+
+
+def test_key_reused_with_other_body(client, trip):
+    assert _buy(client, trip["id"], "1", f"reuse-{trip['id']}").status_code == 200
+
+    response = _buy(client, trip["id"], "2", f"reuse-{trip['id']}")
+
+    assert response.status_code == 422
+    assert _paid_tickets(trip["id"], "2") == 0
+
+
+def test_conflict_is_replayed(client, trip):
+    assert _buy(client, trip["id"], "1", f"other-{trip['id']}", name="Інший").status_code == 200
+
+    first = _buy(client, trip["id"], "1", f"conflict-{trip['id']}")
+    again = _buy(client, trip["id"], "1", f"conflict-{trip['id']}")
+
+    assert first.status_code == again.status_code == 409
+    assert again.content == first.content
+    assert again.headers["Idempotent-Replayed"] == "true"
+
+
+def test_server_error_is_not_stored(client, trip, monkeypatch):
+    sell = tickets._sell
+    calls = []
+
+    async def fail_once(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database is gone")
+        return await sell(*args, **kwargs)
+
+    monkeypatch.setattr(tickets, "_sell", fail_once)
+
+    with pytest.raises(RuntimeError):
+        _buy(client, trip["id"], "1", f"error-{trip['id']}")
+    retry = _buy(client, trip["id"], "1", f"error-{trip['id']}")
+
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
+    assert len(calls) == 2
+
+
+def test_concurrent_duplicates_run_once(client, trip, monkeypatch):
+    sell = tickets._sell
+    calls = []
+
+    async def slow_sell(*args, **kwargs):
+        # перший запит ще виконується, коли приходять повтори
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return await sell(*args, **kwargs)
+
+    monkeypatch.setattr(tickets, "_sell", slow_sell)
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        responses = list(pool.map(lambda _: _buy(client, trip["id"], "1", f"storm-{trip['id']}"), range(10)))
+
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    assert sum(r.headers.get("Idempotent-Replayed") == "true" for r in responses) == 9
+    assert len(calls) == 1
+    assert _paid_tickets(trip["id"], "1") == 1
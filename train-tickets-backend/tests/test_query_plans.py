@@ -0,0 +1,19 @@
+"""
+EXPLAIN QUERY PLAN для запитів ендпоінтів (app.migrations.check_plans): жодного
+повного перегляду tickets, trips чи route_calendar.
+"""
+from app.migrations import FULL_SCAN, GUARDED_TABLES, check_plans
+
+
+def test_no_full_scans_of_guarded_tables():
+    problems = check_plans()
+
+    assert not problems, "\n".join(
+        f"{scenario}: {detail}\n    {' '.join(statement.split())}" for scenario, statement, detail in problems
+    )
+
+
+def test_full_scan_pattern():
+    assert FULL_SCAN.match("SCAN tickets").group(1) in GUARDED_TABLES
+    assert not FULL_SCAN.match("SCAN tickets USING COVERING INDEX ix_tickets_created_at")
+    assert not FULL_SCAN.match("SEARCH trips USING INDEX ix_trips_departure_time (departure_time>?)")
@@ -0,0 +1,18 @@
+from app.database import SessionLocal
+from app.seat_map import SeatMap
+
+
+def test_seat_map_is_bounded(client, make_trip):
+    seat_map = SeatMap(maxsize=2)
+    first, second, third = (make_trip()["id"] for _ in range(3))
+    departed = make_trip(days=-1)["id"]
+
+    db = SessionLocal()
+    try:
+        for trip_id in (first, second, first, third, departed):
+            seat_map.occupied(db, trip_id)
+    finally:
+        db.close()
+
+    # second — найдавніше використаний; рейс, що відправився, не кешується зовсім
+    assert list(seat_map._trips) == [first, third]
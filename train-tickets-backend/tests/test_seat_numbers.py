@@ -0,0 +1,38 @@
+import pytest
+
+
+def _ticket(trip_id: int, seat_number: str) -> dict:
+    return {"trip_id": trip_id, "passenger_name": "Пасажир", "seat_number": seat_number, "price": 500}
+
+
+@pytest.mark.parametrize("seat_number", ["0", "-1", "12A", "007", "100000"])
+def test_seat_outside_train_is_rejected(client, trip, seat_number):
+    single = client.post("/tickets/", json=_ticket(trip["id"], seat_number))
+    batch = client.post("/tickets/batch", json=[_ticket(trip["id"], "1"), _ticket(trip["id"], seat_number)])
+    hold = client.post(f"/trips/{trip['id']}/holds", json={"seat_numbers": [seat_number]})
+
+    assert [r.status_code for r in (single, batch, hold)] == [422, 422, 422]
+    assert client.get(f"/trips/{trip['id']}/seats").json()["occupied"] == []
+
+
+def test_last_seat_of_train_is_sold(client, trip):
+    capacity = client.get(f"/trips/{trip['id']}/seats").json()["capacity"]
+
+    assert client.post("/tickets/", json=_ticket(trip["id"], str(capacity))).status_code == 200
+    assert client.post("/tickets/", json=_ticket(trip["id"], str(capacity + 1))).status_code == 422
+
+
+def test_calendar_counts_seats_remaining(client, trip):
+    route = client.get("/routes/").json()[0]
+    day = trip["departure_time"][:10]
+    params = {"start_station_id": route["start_station_id"], "end_station_id": route["end_station_id"], "month": day[:7]}
+
+    def seats_remaining():
+        days = client.get("/trips/calendar", params=params).json()["days"]
+        return next(d["seats_remaining"] for d in days if d["date"] == day)
+
+    before = seats_remaining()
+    response = client.post("/tickets/batch", json=[_ticket(trip["id"], "1"), _ticket(trip["id"], "2")])
+    assert response.status_code == 200
+
+    assert seats_remaining() == before - 2
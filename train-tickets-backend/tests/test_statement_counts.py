@@ -0,0 +1,77 @@
+"""
+Кількість SQL-запитів на виклик не залежить від кількості рядків: N+1 (запит на
+кожен рейс чи квиток) або повернення до кількох проходів одразу ламають ці тести.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import config
+from app.analytics_cache import analytics_cache
+
+LISTING_PATHS = (
+    "/trips/",
+    "/trips/?start_station_id={start}&end_station_id={end}",
+    "/analytics/tickets",
+    "/analytics/tickets?limit=20",
+    "/analytics/tickets?start_station_id={start}&end_station_id={end}",
+    "/analytics/summary",
+    "/analytics/summary?start_station_id={start}&end_station_id={end}",
+)
+
+
+@contextmanager
+def _recorded_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def _statements(client, path: str) -> list:
+    # кеш аналітики інакше відповів би без запитів до даних
+    analytics_cache.clear()
+    with _recorded_statements() as statements:
+        assert client.get(path).status_code == 200
+    return statements
+
+
+def _sell(client, trip_id: int, count: int):
+    for seat in range(1, count + 1):
+        response = client.post(
+            "/tickets/",
+            json={"trip_id": trip_id, "passenger_name": "Пасажир", "seat_number": str(seat), "price": 500},
+        )
+        assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", LISTING_PATHS)
+def test_statement_count_does_not_grow_with_rows(client, make_trip, path):
+    route = client.get("/routes/").json()[0]
+    path = path.format(start=route["start_station_id"], end=route["end_station_id"])
+
+    _statements(client, path)  # перший виклик підвантажує ліниві кеші процесу
+    before = _statements(client, path)
+
+    for _ in range(3):
+        _sell(client, make_trip()["id"], 5)
+    after = _statements(client, path)
+
+    assert len(after) == len(before), after
+
+
+def test_summary_is_one_aggregate_statement(client, monkeypatch):
+    # колонковий рушій (ANALYTICS_ENGINE=numpy) рахує в пам'яті, без SQL
+    monkeypatch.setattr(config, "ANALYTICS_ENGINE", "sql")
+    statements = _statements(client, "/analytics/summary")
+
+    aggregates = [s for s in statements if "sum(" in s.lower()]
+    assert len(aggregates) == 1, statements
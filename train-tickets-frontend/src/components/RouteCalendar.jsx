@@ -5,8 +5,9 @@ import { useMemo } from "react";
  * - показує всі дні місяця
  * - клікабельні тільки ті, що в availableDates
  * - обраний день підсвічується
+ * - під номером дня показується мінімальна ціна (якщо передано prices)
  */
-function RouteCalendar({ availableDates, selectedDate, onSelectDate }) {
+function RouteCalendar({ availableDates, selectedDate, onSelectDate, prices = {} }) {
   // availableDates: масив рядків 'YYYY-MM-DD'
 
   const availableSet = useMemo(() => new Set(availableDates), [availableDates]);
@@ -123,6 +124,7 @@ function RouteCalendar({ availableDates, selectedDate, onSelectDate }) {
 
             const isAvailable = availableSet.has(day.iso);
             const isSelected = selectedDate === day.iso;
+            const price = prices[day.iso];
 
             let bg = "transparent";
             let color = "var(--text-muted)";
@@ -154,20 +156,28 @@ function RouteCalendar({ availableDates, selectedDate, onSelectDate }) {
                   if (!isAvailable) return;
                   onSelectDate(day.iso);
                 }}
+                title={price != null ? `від ${price} грн` : undefined}
                 style={{
-                  height: 28,
+                  height: price != null ? 36 : 28,
                   borderRadius: 999,
                   border,
                   background: bg,
                   color,
                   fontSize: 12,
                   display: "flex",
+                  flexDirection: "column",
                   alignItems: "center",
                   justifyContent: "center",
+                  lineHeight: 1.1,
                   opacity,
                 }}
               >
                 {day.label}
+                {price != null && (
+                  <span style={{ fontSize: 9, opacity: 0.8 }}>
+                    {Math.round(price)}
+                  </span>
+                )}
               </button>
             );
           })
@@ -22,6 +22,9 @@ function AnalyticsPage() {
   const [byDay, setByDay] = useState([]);
   const [byRoute, setByRoute] = useState([]);
   const [tickets, setTickets] = useState([]);
+  const [ticketsCursor, setTicketsCursor] = useState(null);
+  const [ticketsParams, setTicketsParams] = useState({});
+  const [loadingMoreTickets, setLoadingMoreTickets] = useState(false);
 
   const [stations, setStations] = useState([]);
 
@@ -66,26 +69,24 @@ function AnalyticsPage() {
       setLoading(true);
       setError("");
 
-      const params = {};
-      if (filterFromDate) params.date_from = filterFromDate;
-      if (filterToDate) params.date_to = filterToDate;
-      if (filterFromStation) params.start_station_id = filterFromStation;
-      if (filterToStation) params.end_station_id = filterToStation;
-
-      const [summaryRes, byDayRes, byRouteRes, byDirectionRes, ticketsRes] =
-        await Promise.all([
-          api.get("/analytics/summary", { params }),
-          api.get("/analytics/by-day", { params }),
-          api.get("/analytics/by-route", { params }),
-          api.get("/analytics/by-direction", { params }),
-          api.get("/analytics/tickets", { params }),
-        ]);
-
-      setSummary(summaryRes.data);
-      setByDay(byDayRes.data);
-      setByRoute(byRouteRes.data);
-      setByDirection(byDirectionRes.data);
-      setTickets(ticketsRes.data);
+      const filters = {};
+      if (filterFromDate) filters.date_from = filterFromDate;
+      if (filterToDate) filters.date_to = filterToDate;
+      if (filterFromStation) filters.start_station_id = filterFromStation;
+      if (filterToStation) filters.end_station_id = filterToStation;
+
+      // усі панелі одним запитом замість п'яти окремих
+      const params = { ...filters, panels: "summary,by-day,by-route,by-direction,tickets" };
+      const res = await api.get("/analytics/dashboard", { params });
+
+      setSummary(res.data["summary"]);
+      setByDay(res.data["by-day"]);
+      setByRoute(res.data["by-route"]);
+      setByDirection(res.data["by-direction"]);
+      // перша сторінка квитків; наступні — за next_cursor з /analytics/tickets
+      setTickets(res.data["tickets"].items);
+      setTicketsCursor(res.data["tickets"].next_cursor);
+      setTicketsParams(filters);
     } catch (err) {
       console.error(err);
       setError("Не вдалося завантажити аналітику");
@@ -94,6 +95,22 @@ function AnalyticsPage() {
     }
   };
 
+  const fetchMoreTickets = async () => {
+    try {
+      setLoadingMoreTickets(true);
+      const res = await api.get("/analytics/tickets", {
+        params: { ...ticketsParams, cursor: ticketsCursor, limit: 100 },
+      });
+      setTickets((prev) => [...prev, ...res.data.items]);
+      setTicketsCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error(err);
+      setError("Не вдалося завантажити квитки");
+    } finally {
+      setLoadingMoreTickets(false);
+    }
+  };
+
 
   useEffect(() => {
     fetchAnalytics();
@@ -457,6 +474,17 @@ function AnalyticsPage() {
                 ))}
               </tbody>
             </table>
+            {ticketsCursor && (
+              <button
+                type="button"
+                className="btn btn-ghost"
+                onClick={fetchMoreTickets}
+                disabled={loadingMoreTickets}
+                style={{ marginTop: 8 }}
+              >
+                {loadingMoreTickets ? "Завантаження..." : "Показати ще"}
+              </button>
+            )}
           </div>
         )}
       </div>
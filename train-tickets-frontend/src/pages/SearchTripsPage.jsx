@@ -11,6 +11,7 @@ function SearchTripsPage() {
 
   const [availableDates, setAvailableDates] = useState([]);
   const [loadingAvailableDates, setLoadingAvailableDates] = useState(false);
+  const [calendarPrices, setCalendarPrices] = useState({}); // 'YYYY-MM-DD' -> мінімальна ціна
 
   const [trips, setTrips] = useState([]);
   const [loadingStations, setLoadingStations] = useState(false);
@@ -22,6 +23,7 @@ function SearchTripsPage() {
   const [seatNumber, setSeatNumber] = useState("");
   const [buying, setBuying] = useState(false);
   const [buyError, setBuyError] = useState("");
+  const [hold, setHold] = useState(null); // утримання місця до оплати
 
   const navigate = useNavigate();
 
@@ -50,6 +52,7 @@ function SearchTripsPage() {
       setTravelDate("");
       setTrips([]);
       setSelectedTripId(null);
+      setHold(null);
       setError("");
 
       if (!fromStationId || !toStationId) {
@@ -81,6 +84,37 @@ function SearchTripsPage() {
     fetchAvailableDates();
   }, [fromStationId, toStationId]);
 
+  // 2.1 Мінімальні ціни для місяця, який показує календар
+  const calendarMonth = (travelDate || availableDates[0] || "").substring(0, 7);
+  useEffect(() => {
+    const fetchCalendar = async () => {
+      setCalendarPrices({});
+      if (!fromStationId || !toStationId || !calendarMonth) {
+        return;
+      }
+
+      try {
+        const res = await api.get("/trips/calendar", {
+          params: {
+            start_station_id: fromStationId,
+            end_station_id: toStationId,
+            month: calendarMonth,
+          },
+        });
+        const prices = {};
+        for (const day of res.data.days || []) {
+          prices[day.date] = day.min_price;
+        }
+        setCalendarPrices(prices);
+      } catch (err) {
+        // без цін календар усе одно працює
+        console.error(err);
+      }
+    };
+
+    fetchCalendar();
+  }, [fromStationId, toStationId, calendarMonth]);
+
   // 3. Запит рейсів по обраному дню
   const loadTripsForSelectedDate = async (dateStr) => {
     if (!fromStationId || !toStationId || !dateStr) return;
@@ -89,6 +123,7 @@ function SearchTripsPage() {
       setError("");
       setTrips([]);
       setSelectedTripId(null);
+      setHold(null);
 
       const res = await api.get("/trips/", {
         params: {
@@ -110,13 +145,29 @@ function SearchTripsPage() {
     }
   };
 
+  const releaseHold = () => {
+    if (hold) {
+      // місце звільняється і саме після завершення терміну, тож помилку ігноруємо
+      api
+        .delete(`/trips/${hold.trip_id}/holds/${hold.hold_id}`)
+        .catch(() => {});
+      setHold(null);
+    }
+  };
+
   const handleSelectTrip = (tripId) => {
+    releaseHold();
     setSelectedTripId(tripId);
     setPassengerName("");
     setSeatNumber("");
     setBuyError("");
   };
 
+  const handleSeatChange = (value) => {
+    releaseHold();
+    setSeatNumber(value);
+  };
+
   const handleBuyTicket = async (e) => {
     e.preventDefault();
     if (!selectedTripId || !passengerName || !seatNumber) {
@@ -127,20 +178,34 @@ function SearchTripsPage() {
     setBuying(true);
 
     try {
+      // Крок 1: утримуємо місце, поки пасажир перевіряє дані
+      if (!hold) {
+        const res = await api.post(`/trips/${selectedTripId}/holds`, {
+          seat_numbers: [seatNumber],
+        });
+        setHold(res.data);
+        return;
+      }
+
+      // Крок 2: оплата — утримання перетворюється на квиток
       const trip = trips.find((t) => t.id === selectedTripId);
       const price = trip?.base_price ?? 0;
 
-      const res = await api.post("/tickets/", {
-        trip_id: selectedTripId,
-        passenger_name: passengerName,
-        seat_number: seatNumber,
-        price,
-      });
+      const res = await api.post(
+        `/trips/${hold.trip_id}/holds/${hold.hold_id}/confirm`,
+        [{ passenger_name: passengerName, seat_number: seatNumber, price }],
+        // повтор після обриву мережі поверне той самий квиток, а не помилку
+        { headers: { "Idempotency-Key": hold.hold_id } }
+      );
 
-      const ticket = res.data;
+      const ticket = res.data[0];
       navigate(`/ticket/${ticket.id}`);
     } catch (err) {
       console.error(err);
+      if (err.response?.status === 404 && hold) {
+        // термін утримання сплив — треба утримати місце ще раз
+        setHold(null);
+      }
       if (err.response?.data?.detail) {
         setBuyError(err.response.data.detail);
       } else {
@@ -240,6 +305,7 @@ function SearchTripsPage() {
                 ) : (
                   <RouteCalendar
                     availableDates={availableDates}
+                    prices={calendarPrices}
                     selectedDate={travelDate}
                     onSelectDate={(dateStr) => {
                       setTravelDate(dateStr);
@@ -282,6 +348,7 @@ function SearchTripsPage() {
                       <th>Відправлення</th>
                       <th>Прибуття</th>
                       <th>Базова ціна</th>
+                      <th>Вільних місць</th>
                       <th></th>
                     </tr>
                   </thead>
@@ -303,9 +370,14 @@ function SearchTripsPage() {
                           {new Date(trip.arrival_time).toLocaleString()}
                         </td>
                         <td>{trip.base_price}</td>
+                        <td>{trip.seats_remaining}</td>
                         <td>
                           <button
                             className="btn btn-outlined"
+                            disabled={
+                              trip.seats_remaining === 0 ||
+                              new Date(trip.departure_time) <= new Date()
+                            }
                             onClick={() => handleSelectTrip(trip.id)}
                           >
                             Обрати
@@ -388,13 +460,21 @@ function SearchTripsPage() {
                   <label className="form-label">
                     <span>Номер місця</span>
                     <input
-                      type="text"
+                      type="number"
+                      min="1"
                       value={seatNumber}
-                      onChange={(e) => setSeatNumber(e.target.value)}
-                      placeholder="Напр. 12A"
+                      onChange={(e) => handleSeatChange(e.target.value)}
+                      placeholder="Напр. 12"
                     />
                   </label>
 
+                  {hold && (
+                    <p className="text-muted" style={{ fontSize: 12 }}>
+                      Місце утримано до{" "}
+                      {new Date(hold.expires_at + "Z").toLocaleTimeString()}
+                    </p>
+                  )}
+
                   <div
                     style={{
                       display: "flex",
@@ -407,7 +487,11 @@ function SearchTripsPage() {
                       className="btn btn-primary"
                       disabled={buying}
                     >
-                      {buying ? "Оформлення..." : "Купити квиток"}
+                      {buying
+                        ? "Оформлення..."
+                        : hold
+                        ? "Оплатити квиток"
+                        : "Утримати місце"}
                     </button>
                   </div>
                 </form>